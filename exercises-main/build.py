@@ -0,0 +1,141 @@
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(ROOT, 'original_source_data')
+# Per-stage digests of inputs (including the stage's own script) and outputs from the last run.
+STATE_FILE = os.path.join(ROOT, '.build-state.json')
+
+
+def _load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _source(*parts):
+    return os.path.join(SOURCE_DIR, *parts)
+
+
+def _wger_sources():
+    source_dir = _source('wger', 'source_data')
+    return [os.path.join(source_dir, f) for f in sorted(os.listdir(source_dir)) if f.endswith('.json')]
+
+
+def build_exercises_json():
+    parser = _load_module('exercises_json_parser', _source('exercises_json', 'parser.py'))
+    parser.build(_source('exercises_json', 'exercises-original.json'), _source('exercises_json', 'exercises.json'))
+
+
+def build_wger():
+    parser = _load_module('wger_parser', _source('wger', 'parser.py'))
+    parser.build(_source('wger', 'source_data'), _source('wger'))
+
+
+def build_combined():
+    combine = _load_module('combine', _source('combine.py'))
+    combine.build(_source('exercises_json', 'exercises.json'), _source('wger', 'exercises.json'), _source('combined.json'))
+
+
+def build_catalog():
+    validator = _load_module('validate', os.path.join(ROOT, 'validate.py'))
+    errors = validator.validate(validator.read_data(os.path.join(ROOT, 'exercises.json')))
+    if errors:
+        sys.exit('\n'.join(errors + [f'exercises.json: {len(errors)} error(s), catalog not rebuilt']))
+    compiler = _load_module('compile', os.path.join(ROOT, 'compile.py'))
+    raw = compiler.read_bytes(os.path.join(ROOT, 'exercises.json'))
+    catalog, details = compiler.compile_catalog(json.loads(raw), hashlib.sha256(raw).hexdigest(), len(raw))
+    compiler.write_artifact(catalog, details, ROOT)
+
+
+# In dependency order: a stage's inputs may be an earlier stage's outputs, so one edit only
+# re-runs the stages downstream of it.
+STAGES = [
+    {
+        'name': 'exercises_json',
+        'inputs': lambda: [_source('exercises_json', 'exercises-original.json'), _source('exercises_json', 'parser.py')],
+        'outputs': [_source('exercises_json', 'exercises.json')],
+        'run': build_exercises_json,
+    },
+    {
+        'name': 'wger',
+        'inputs': lambda: _wger_sources() + [_source('wger', 'parser.py')],
+        'outputs': [_source('wger', 'all_data.json'), _source('wger', 'all_exercises.json'), _source('wger', 'exercises.json')],
+        'run': build_wger,
+    },
+    {
+        'name': 'combined',
+        'inputs': lambda: [_source('exercises_json', 'exercises.json'), _source('wger', 'exercises.json'), _source('combine.py')],
+        'outputs': [_source('combined.json')],
+        'run': build_combined,
+    },
+    {
+        'name': 'catalog',
+        'inputs': lambda: [os.path.join(ROOT, 'exercises.json'), os.path.join(ROOT, 'compile.py'), os.path.join(ROOT, 'validate.py')],
+        'outputs': [os.path.join(ROOT, 'exercises.catalog.json'), os.path.join(ROOT, 'exercises.details.jsonl')],
+        'run': build_catalog,
+    },
+]
+
+
+def file_digest(path):
+    try:
+        with open(path, 'rb') as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def digests(paths):
+    return {os.path.relpath(path, ROOT): file_digest(path) for path in paths}
+
+
+def read_state():
+    try:
+        with open(STATE_FILE, 'r') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def write_state(state):
+    with open(STATE_FILE, 'w') as file:
+        json.dump(state, file, indent=2, sort_keys=True)
+
+
+def run(selected=None, force=False):
+    state = read_state()
+    for stage in STAGES:
+        name = stage['name']
+        if selected and name not in selected:
+            continue
+        inputs = digests(stage['inputs']())
+        previous = state.get(name, {})
+        up_to_date = (
+            not force
+            and previous.get('inputs') == inputs
+            and previous.get('outputs') == digests(stage['outputs'])
+        )
+        if up_to_date:
+            print(f'{name}: up to date')
+            continue
+        start = time.perf_counter()
+        stage['run']()
+        state[name] = {'inputs': inputs, 'outputs': digests(stage['outputs'])}
+        write_state(state)
+        print(f'{name}: built in {(time.perf_counter() - start) * 1000:.0f} ms')
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    force = '--force' in args
+    selected = [a for a in args if a != '--force']
+    unknown = set(selected) - {stage['name'] for stage in STAGES}
+    if unknown:
+        sys.exit(f'Unknown stage(s): {", ".join(sorted(unknown))}')
+    run(selected, force)
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import sys
+
+# Bump when the layout of the compiled artifact changes; readers must check it.
+FORMAT_VERSION = 1
+CATALOG_FILE = 'exercises.catalog.json'
+DETAILS_FILE = 'exercises.details.jsonl'
+
+# Kept inline in the catalog: small, and needed for listing/searching.
+COLUMNS = [
+    'name', 'category', 'equipment', 'primary_muscles', 'secondary_muscles',
+    'description', 'aliases', 'details',
+]
+# Moved to the details file: one JSON object per line, loaded lazily by byte range.
+DETAIL_FIELDS = [
+    'instructions', 'tips', 'tempo', 'video', 'images', 'variation_on',
+    'variations_on', 'license', 'license_author',
+]
+
+
+def read_bytes(filename):
+    with open(filename, 'rb') as file:
+        return file.read()
+
+
+def new_vocabulary(declared):
+    """String -> integer code table, seeded with the declared order so codes stay stable."""
+    values = list(dict.fromkeys(declared))
+    return {'values': values, 'codes': {v: i for i, v in enumerate(values)}}
+
+
+def intern(vocabulary, value):
+    codes = vocabulary['codes']
+    if value not in codes:
+        codes[value] = len(vocabulary['values'])
+        vocabulary['values'].append(value)
+    return codes[value]
+
+
+def intern_all(vocabulary, values):
+    return [intern(vocabulary, value) for value in values or []]
+
+
+def compile_catalog(data, source_sha256, source_size):
+    categories = new_vocabulary(data['categories'])
+    equipment = new_vocabulary(data['equipment'])
+    muscles = new_vocabulary(data['muscles'])
+
+    rows = []
+    details = bytearray()
+    for exercise in sorted(data['exercises'], key=lambda e: e['name'].lower()):
+        detail = {k: exercise[k] for k in DETAIL_FIELDS if exercise.get(k)}
+        line = json.dumps(detail, separators=(',', ':'), ensure_ascii=False).encode('utf-8') + b'\n'
+        rows.append([
+            exercise['name'],
+            intern(categories, exercise['category']),
+            intern_all(equipment, exercise['equipment']),
+            intern_all(muscles, exercise['primary_muscles']),
+            intern_all(muscles, exercise['secondary_muscles']),
+            exercise.get('description') or None,
+            exercise.get('aliases') or None,
+            [len(details), len(line) - 1],
+        ])
+        details += line
+
+    catalog = {
+        'format': 'exercise-catalog',
+        'version': FORMAT_VERSION,
+        'source_sha256': source_sha256,
+        'source_size': source_size,
+        'details_sha256': hashlib.sha256(details).hexdigest(),
+        'details_size': len(details),
+        'categories': categories['values'],
+        'equipment': equipment['values'],
+        'muscles': muscles['values'],
+        'muscle_groups': data['muscle_groups'],
+        'columns': COLUMNS,
+        'exercises': rows,
+    }
+    return catalog, bytes(details)
+
+
+def write_artifact(catalog, details, out_dir='.'):
+    with open(f'{out_dir}/{DETAILS_FILE}', 'wb') as output:
+        output.write(details)
+    with open(f'{out_dir}/{CATALOG_FILE}', 'w', encoding='utf-8') as output:
+        output.write(json.dumps(catalog, separators=(',', ':'), ensure_ascii=False))
+
+
+if __name__ == '__main__':
+    out_dir = sys.argv[1] if len(sys.argv) > 1 else '.'
+    raw = read_bytes('exercises.json')
+    catalog, details = compile_catalog(json.loads(raw), hashlib.sha256(raw).hexdigest(), len(raw))
+    write_artifact(catalog, details, out_dir)
@@ -0,0 +1,167 @@
+import difflib
+import json
+import sys
+from collections import defaultdict
+
+from validate import normalized_key, read_data, validate
+
+REVIEW_FILE = 'merge-review.json'
+# Pairs scoring at least this are merged without review; below REVIEW_THRESHOLD they are left alone.
+AUTO_MERGE_THRESHOLD = 0.9
+REVIEW_THRESHOLD = 0.65
+# Blocks bigger than this ('dumbbell' + 'dumbbell', 'quads' + 'squat') say little about a match and are
+# skipped, which caps the candidates per exercise and keeps the whole run linear in catalog size.
+MAX_BLOCK_SIZE = 40
+REVIEW_CANDIDATES = 3
+STOP_WORDS = {'a', 'and', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'with', 'w'}
+# wger spellings of catalog words (after normalized_key), so 'Leg Curls (sitting)' == 'Seated Leg Curl'
+SYNONYMS = {'sitting': 'seated', 'laying': 'lying', 'db': 'dumbbell', 'bb': 'barbell', 'flye': 'fly'}
+# Body positions that make different exercises: names naming different ones never auto-merge, and the
+# pair's score is scaled by POSITION_CONFLICT_PENALTY so it ranks below candidates without a conflict.
+POSITIONS = {'seated', 'standing', 'lying', 'incline', 'decline', 'kneeling'}
+POSITION_CONFLICT_PENALTY = 0.8
+
+
+def name_tokens(name):
+    return [SYNONYMS.get(t, t) for t in normalized_key(name).split() if t not in STOP_WORDS]
+
+
+def compact_name(tokens):
+    """Sorted tokens run together, so 'Shoulder Press, Barbell' == 'Barbell Shoulder Press' and 'Pushups' == 'Push-Up'."""
+    return ''.join(sorted(tokens))
+
+
+def profile(exercise):
+    tokens = name_tokens(exercise['name'])
+    return {
+        'exercise': exercise,
+        'tokens': set(tokens),
+        'compact': compact_name(tokens),
+        'primary_muscles': set(exercise.get('primary_muscles') or []),
+        'equipment': set(exercise.get('equipment') or []),
+    }
+
+
+def blocking_keys(p):
+    keys = {('name', p['compact'])}
+    keys.update(('muscle', muscle, token) for muscle in p['primary_muscles'] for token in p['tokens'])
+    keys.update(('equipment', item, token) for item in p['equipment'] for token in p['tokens'])
+    return keys
+
+
+def build_blocks(profiles):
+    blocks = defaultdict(list)
+    for i, p in enumerate(profiles):
+        for key in blocking_keys(p):
+            blocks[key].append(i)
+    return blocks
+
+
+def candidates(p, blocks):
+    found = set()
+    for key in blocking_keys(p):
+        block = blocks.get(key, ())
+        if len(block) <= MAX_BLOCK_SIZE:
+            found.update(block)
+    return found
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return None
+    return len(a & b) / len(a | b)
+
+
+def name_similarity(a, b):
+    if a['compact'] == b['compact']:
+        return 1.0
+    ratio = difflib.SequenceMatcher(None, a['compact'], b['compact']).ratio()
+    return 0.7 * ratio + 0.3 * (jaccard(a['tokens'], b['tokens']) or 0.0)
+
+
+def similarity(a, b):
+    """Name similarity weighted with primary muscle/equipment overlap. Identical names always score 1:
+    wger tags muscles and equipment more coarsely than the catalog, so attributes only break ties.
+
+    In practice auto-merge is name identity (after normalization and SYNONYMS): on the current data the
+    best differently-named pair scores below 0.9, and the pairs just under it are different exercises
+    ('Barbell Triceps Extension' vs 'Incline Barbell Triceps Extension'), so AUTO_MERGE_THRESHOLD is
+    kept above them on purpose. The weighted score orders the review candidates."""
+    name = name_similarity(a, b)
+    if name == 1.0:
+        return 1.0, name
+    attributes = [s for s in (jaccard(a['primary_muscles'], b['primary_muscles']), jaccard(a['equipment'], b['equipment'])) if s is not None]
+    score = name if not attributes else 0.8 * name + 0.2 * sum(attributes) / len(attributes)
+    positions_a, positions_b = a['tokens'] & POSITIONS, b['tokens'] & POSITIONS
+    if positions_a and positions_b and not positions_a & positions_b:
+        score *= POSITION_CONFLICT_PENALTY
+    return score, name
+
+
+def match(data):
+    """Score each exercise in exercises_to_merge against its blocked candidates in exercises."""
+    profiles = [profile(e) for e in data['exercises']]
+    blocks = build_blocks(profiles)
+    matches = []
+    for incoming in data['exercises_to_merge']:
+        p = profile(incoming)
+        scored = sorted(
+            ((similarity(p, profiles[i]) + (i,)) for i in candidates(p, blocks)),
+            key=lambda s: (-s[0], -s[1], s[2]),
+        )
+        matches.append((incoming, [(score, name, profiles[i]['exercise']) for score, name, i in scored]))
+    return matches
+
+
+def apply_merges(data, matches):
+    """Fold auto-merged exercises into their match (as an alias when the name differs). Returns the review list."""
+    claimed = {}
+    for exercise in data['exercises']:
+        for name in [exercise['name']] + (exercise.get('aliases') or []):
+            claimed.setdefault(normalized_key(name), exercise['name'])
+
+    remaining = []
+    review = []
+    for incoming, scored in matches:
+        best = scored[0] if scored else None
+        if best and best[0] >= AUTO_MERGE_THRESHOLD:
+            target = best[2]
+            key = normalized_key(incoming['name'])
+            if key not in claimed:
+                target.setdefault('aliases', []).append(incoming['name'])
+                claimed[key] = target['name']
+            continue
+        remaining.append(incoming)
+        borderline = [s for s in scored[:REVIEW_CANDIDATES] if s[0] >= REVIEW_THRESHOLD]
+        if borderline:
+            review.append({
+                'name': incoming['name'],
+                'candidates': [
+                    {'name': e['name'], 'score': round(score, 3), 'name_score': round(name, 3)}
+                    for score, name, e in borderline
+                ],
+            })
+    data['exercises_to_merge'] = remaining
+    return review
+
+
+def write_pretty(filename, data):
+    with open(filename, 'w') as output:
+        output.write(json.dumps(data, sort_keys=True, indent=2) + '\n')
+
+
+# Writes merge-review.json; with --apply also rewrites exercises.json with the auto-merges folded in
+if __name__ == '__main__':
+    apply = '--apply' in sys.argv[1:]
+    data = read_data('exercises.json')
+    before = len(data['exercises_to_merge'])
+    review = apply_merges(data, match(data))
+    write_pretty(REVIEW_FILE, review)
+    merged = before - len(data['exercises_to_merge'])
+    print(f'{merged} auto-merged, {len(review)} to review in {REVIEW_FILE}, '
+          f'{len(data["exercises_to_merge"]) - len(review)} without a likely match')
+    if apply:
+        errors = validate(data)
+        if errors:
+            sys.exit('\n'.join(errors + ['exercises.json not written']))
+        write_pretty('exercises.json', data)
@@ -78,13 +78,17 @@ def write_pretty(filename, data):
         output.write(json.dumps(data, sort_keys=True, indent=2))
 
 
-if __name__ == '__main__':
+def build(exercises_source, to_merge_source, out_file):
     data = {
         'muscle_groups': muscle_groups,
         'categories': categories,
         'equipment': equipment,
         'muscles': muscles,
-        'exercises': read_exercises('exercises_json/exercises.json'),
-        'exercises_to_merge': read_exercises('wger/exercises.json'),
+        'exercises': read_exercises(exercises_source),
+        'exercises_to_merge': read_exercises(to_merge_source),
     }
-    write_pretty('combined.json', data)
+    write_pretty(out_file, data)
+
+
+if __name__ == '__main__':
+    build('exercises_json/exercises.json', 'wger/exercises.json', 'combined.json')
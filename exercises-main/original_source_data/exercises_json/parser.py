@@ -54,7 +54,11 @@ def write_pretty(filename, data):
         output.write(json.dumps(data, sort_keys=True, indent=2))
 
 
-if __name__ == "__main__":
-    exercises = init_data_from_source('exercises-original.json')
+def build(source_file, out_file):
+    exercises = init_data_from_source(source_file)
     transform_exercises(exercises)
-    write_pretty('exercises.json', exercises)
+    write_pretty(out_file, exercises)
+
+
+if __name__ == "__main__":
+    build('exercises-original.json', 'exercises.json')
@@ -1,6 +1,5 @@
 import os
 import json
-import copy
 
 
 def init_data_from_source(data_dir):
@@ -16,57 +15,60 @@ def init_data_from_source(data_dir):
     return return_data
 
 
+EQUIPMENT_RENAMES = {
+    'sz-bar': 'ez curl bar',
+    'swiss ball': 'exercise ball',
+    'none (bodyweight exercise)': 'none',
+}
+# Exercise fields that are joined/renamed below or not wanted in the output.
+FIELDS_TO_DROP = {'exercise_base', 'uuid', 'status', 'name_original', 'creation_date'}
+
+
+def _muscle_name(muscle):
+    muscle_name = muscle['name_en'] if 'name_en' in muscle else muscle['name']
+    return muscle_name.lower()
+
+
+def iter_exercises(parsed_data):
+    """Yield joined exercises one at a time. parsed_data's pk-indexed tables are only read, never mutated."""
+    bases = parsed_data['exercisebase']
+    licenses = parsed_data['license']
+    languages = parsed_data['language']
+    equipment_names = {
+        pk: EQUIPMENT_RENAMES.get(e['name'].lower(), e['name'].lower())
+        for pk, e in parsed_data['equipment'].items()
+    }
+    muscle_names = {pk: _muscle_name(m) for pk, m in parsed_data['muscle'].items()}
+
+    for exercise in parsed_data['exercise'].values():
+        base = bases[exercise['exercise_base']]
+        joined = {k: v for k, v in exercise.items() if k not in FIELDS_TO_DROP}
+        joined['license'] = licenses[exercise['license']]
+        joined['language'] = languages[exercise['language']]['short_name']
+        joined['equipment'] = [equipment_names[key] for key in base['equipment']]
+        joined['primary_muscles'] = [muscle_names[key] for key in base['muscles']]
+        joined['secondary_muscles'] = [muscle_names[key] for key in base['muscles_secondary']]
+        joined['variation_id'] = base['variations']
+        yield joined
+
+
 def join_to_exercises(parsed_data):
-    data = copy.deepcopy(parsed_data)
-    for exercise in data['exercise'].values():
-        exercise_base = data['exercisebase'][exercise['exercise_base']]
-        del exercise['exercise_base']
-        to_copy_from_base = [
-            'category', 'equipment', 'muscles', 'muscles_secondary', 'variations',
-        ]
-        for to_copy in to_copy_from_base:
-            exercise[to_copy] = exercise_base[to_copy]
-
-        exercise['license'] = data['license'][exercise['license']]
-        exercise['language'] = data['language'][exercise['language']]['short_name']
-        exercise['category'] = data['exercisecategory'][exercise['category']]['name']
-        exercise['equipment'] = list(map(
-            lambda key: data['equipment'][key]['name'].lower(),
-            exercise['equipment'],
-        ))
-
-        muscle_lists_to_join = ['muscles', 'muscles_secondary']
-        for list_to_join in muscle_lists_to_join:
-            def get_name(muscle):
-                muscle_name = muscle['name_en'] if 'name_en' in muscle else muscle['name']
-                return muscle_name.lower()
-            exercise[list_to_join] = list(map(
-                lambda key: get_name(data['muscle'][key]),
-                exercise[list_to_join],
-            ))
-
-        to_rename = {'variations': 'variation_id', 'muscles': 'primary_muscles',
-                     'muscles_secondary': 'secondary_muscles', }
-        for old, new in to_rename.items():
-            exercise[new] = exercise[old]
-            del exercise[old]
-
-        equipment_renames = {
-            'sz-bar': 'ez curl bar',
-            'swiss ball': 'exercise ball',
-            'none (bodyweight exercise)': 'none',
-        }
-        for old, new in equipment_renames.items():
-            for index, equipment in enumerate(exercise['equipment']):
-                if equipment == old:
-                    exercise['equipment'][index] = new
-
-        fields_to_delete = ['uuid', 'status',
-                            'name_original', 'creation_date', 'category']
-        for field in fields_to_delete:
-            del exercise[field]
-
-    return list(data['exercise'].values())
+    return list(iter_exercises(parsed_data))
+
+
+def build(source_dir, out_dir):
+    data = init_data_from_source(source_dir)
+    write_pretty(os.path.join(out_dir, 'all_data.json'), data)
+
+    exercises = join_to_exercises(data)
+    write_pretty(os.path.join(out_dir, 'all_exercises.json'), exercises)
+
+    filtered_exercises = [
+        {k: v for k, v in exercise.items() if k != 'language'}
+        for exercise in exercises
+        if exercise['language'] == 'en'
+    ]
+    write_pretty(os.path.join(out_dir, 'exercises.json'), filtered_exercises)
 
 
 def write_pretty(filename, data):
@@ -75,17 +77,4 @@ def write_pretty(filename, data):
 
 
 if __name__ == '__main__':
-    data = init_data_from_source('source_data')
-    write_pretty('all_data.json', data)
-
-    exercises = join_to_exercises(data)
-    write_pretty('all_exercises.json', exercises)
-
-    def _remove_lang(exercise):
-        del exercise['language']
-        return exercise
-    filtered_exercises = list(map(_remove_lang, filter(
-        lambda exercise: exercise['language'] == 'en',
-        exercises,
-    )))
-    write_pretty('exercises.json', filtered_exercises)
+    build('source_data', '.')
@@ -0,0 +1,54 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import build
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class BuildCatalogTest(unittest.TestCase):
+    """Runs the catalog stage end to end in a scratch copy, so a broken compile.py/build.py call fails here."""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        for name in ('exercises.json', 'compile.py', 'validate.py'):
+            shutil.copy(os.path.join(ROOT, name), self.root)
+        self._root, build.ROOT = build.ROOT, self.root
+        self.addCleanup(setattr, build, 'ROOT', self._root)
+
+    def read(self, name):
+        with open(os.path.join(self.root, name), 'rb') as file:
+            return file.read()
+
+    def test_build_catalog_writes_a_consistent_artifact(self):
+        build.build_catalog()
+        source = self.read('exercises.json')
+        details = self.read('exercises.details.jsonl')
+        catalog = json.loads(self.read('exercises.catalog.json'))
+
+        self.assertEqual(catalog['format'], 'exercise-catalog')
+        self.assertEqual(catalog['source_sha256'], hashlib.sha256(source).hexdigest())
+        self.assertEqual(catalog['source_size'], len(source))
+        self.assertEqual(catalog['details_sha256'], hashlib.sha256(details).hexdigest())
+        self.assertEqual(catalog['details_size'], len(details))
+        self.assertEqual(len(catalog['exercises']), len(json.loads(source)['exercises']))
+
+        details_col = catalog['columns'].index('details')
+        for row in catalog['exercises']:
+            offset, length = row[details_col]
+            json.loads(details[offset:offset + length])
+
+    def test_build_catalog_matches_the_committed_artifact(self):
+        build.build_catalog()
+        for name in ('exercises.catalog.json', 'exercises.details.jsonl'):
+            with open(os.path.join(ROOT, name), 'rb') as file:
+                self.assertEqual(self.read(name), file.read(), f'{name} is stale: run python3 build.py catalog')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,39 @@
 import json
+import re
+import sys
+
+# Exercise fields as documented in README.md: field -> (type, required).
+EXERCISE_SCHEMA = {
+    'name': ('string', True),
+    'category': ('string', True),
+    'aliases': ('list<string>', False),
+    'description': ('string', False),
+    'instructions': ('list<string>', True),
+    'tips': ('list<string>', False),
+    'equipment': ('list<string>', True),
+    'primary_muscles': ('list<string>', True),
+    'secondary_muscles': ('list<string>', True),
+    'tempo': ('string', False),
+    'images': ('list<string>', False),
+    'video': ('string', False),
+    'variation_on': ('list<string>', False),
+    # Older spelling of variation_on, still read by consumers.
+    'variations_on': ('list<string>', False),
+    'license_author': ('string', False),
+    'license': ('license', False),
+}
+# Fields whose values must come from one of the top-level vocabularies.
+VOCABULARY_FIELDS = {
+    'category': 'categories',
+    'equipment': 'equipment',
+    'primary_muscles': 'muscles',
+    'secondary_muscles': 'muscles',
+}
+LICENSE_FIELDS = ['full_name', 'short_name', 'url']
+# Name pairs that normalize to the same key but are genuinely different exercises.
+ALLOWED_NEAR_DUPLICATES = {
+    frozenset(['Squat with Bands', 'Squats - With Bands']),
+}
 
 
 def read_data(filename):
@@ -6,7 +41,137 @@ def read_data(filename):
         return json.load(file)
 
 
-# Throw an exception if the new exercises.json file is invalid
+def normalized_key(name):
+    """Lowercase alphanumeric words with plural 's' dropped, so 'Squats - With Bands' == 'squat with band'."""
+    words = re.findall(r'[a-z0-9]+', name.lower())
+    return ' '.join(w[:-1] if len(w) > 3 and w.endswith('s') and not w.endswith('ss') else w for w in words)
+
+
+def is_string_list(value):
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+def compile_schema(data):
+    """Turn EXERCISE_SCHEMA and the vocabularies into one check function per field."""
+    vocabularies = {key: set(data.get(key) or []) for key in set(VOCABULARY_FIELDS.values())}
+
+    def type_check(type_name):
+        if type_name == 'string':
+            return lambda value: None if isinstance(value, str) else 'must be a string'
+        if type_name == 'list<string>':
+            return lambda value: None if is_string_list(value) else 'must be a list of strings'
+
+        def check_license(value):
+            if not isinstance(value, dict) or any(not isinstance(value.get(k), str) for k in LICENSE_FIELDS):
+                return f'must be a map with string {", ".join(LICENSE_FIELDS)}'
+        return check_license
+
+    def vocabulary_check(base, vocabulary_name):
+        vocabulary = vocabularies[vocabulary_name]
+
+        def check(value):
+            error = base(value)
+            if error:
+                return error
+            unknown = [v for v in ([value] if isinstance(value, str) else value) if v not in vocabulary]
+            if unknown:
+                return f'{", ".join(map(repr, unknown))} not in {vocabulary_name}'
+        return check
+
+    checks = {}
+    for field, (type_name, required) in EXERCISE_SCHEMA.items():
+        check = type_check(type_name)
+        if field in VOCABULARY_FIELDS:
+            check = vocabulary_check(check, VOCABULARY_FIELDS[field])
+        checks[field] = (required, check)
+    return checks
+
+
+def validate_vocabularies(data, errors):
+    for key in ['categories', 'equipment', 'muscles']:
+        values = data.get(key)
+        if not is_string_list(values):
+            errors.append(f'{key}: must be a list of strings')
+        elif len(set(values)) != len(values):
+            errors.append(f'{key}: contains duplicate values')
+    muscles = set(data.get('muscles') or [])
+    muscle_groups = data.get('muscle_groups')
+    if not isinstance(muscle_groups, dict):
+        errors.append('muscle_groups: must be a map of muscle group to muscles')
+        return
+    for group, group_muscles in muscle_groups.items():
+        if not is_string_list(group_muscles):
+            errors.append(f'muscle_groups.{group}: must be a list of strings')
+            continue
+        unknown = [m for m in group_muscles if m not in muscles]
+        if unknown:
+            errors.append(f'muscle_groups.{group}: {", ".join(map(repr, unknown))} not in muscles')
+
+
+def validate_exercises(data, errors):
+    checks = compile_schema(data)
+    seen = {}  # normalized key -> (name of the exercise that claimed it first, via an alias)
+
+    def claim(key, name, label, alias=False):
+        other, other_alias = seen.setdefault(key, (name, alias))
+        if other == name or frozenset([other, name]) in ALLOWED_NEAR_DUPLICATES:
+            return
+        if other_alias:
+            errors.append(f'{label}: matches an alias of {other!r}')
+        else:
+            errors.append(f'{label}: {"duplicate of" if other.lower() == name.lower() else "near-duplicate of"} {other!r}')
+
+    exercises = data.get('exercises')
+    if not isinstance(exercises, list):
+        errors.append('exercises: must be a list')
+        return
+    for i, exercise in enumerate(exercises):
+        if not isinstance(exercise, dict):
+            errors.append(f'exercises[{i}]: must be a map')
+            continue
+        name = exercise.get('name')
+        label = f'exercises[{i}] ({name})' if isinstance(name, str) else f'exercises[{i}]'
+        for field in exercise.keys() - checks.keys():
+            errors.append(f'{label}: unknown field {field!r}')
+        for field, (required, check) in checks.items():
+            if field not in exercise:
+                if required:
+                    errors.append(f'{label}: missing {field}')
+                continue
+            error = check(exercise[field])
+            if error:
+                errors.append(f'{label}: {field} {error}')
+
+        if not isinstance(name, str):
+            continue
+        if not name.strip() or name != name.strip() or '_' in name:
+            errors.append(f'{label}: name must be non-empty, trimmed and have no underscores')
+        key = normalized_key(name)
+        if seen.get(key, (None,))[0] == name:
+            errors.append(f'{label}: duplicate name')
+        claim(key, name, label)
+        if is_string_list(exercise.get('aliases')):
+            for alias in exercise['aliases']:
+                alias_key = normalized_key(alias)
+                if alias_key != key:
+                    claim(alias_key, name, f'{label}: alias {alias!r}', alias=True)
+
+
+def validate(data):
+    """Return every schema, vocabulary and duplicate-name error in data (empty when valid)."""
+    errors = []
+    if not isinstance(data, dict):
+        return ['top level must be a map']
+    validate_vocabularies(data, errors)
+    validate_exercises(data, errors)
+    return errors
+
+
+# Exit non-zero with every error listed if the exercises.json file is invalid
 if __name__ == '__main__':
-    data = read_data('exercises.json')
-    # TODO use schema library to validate format as well
+    filename = sys.argv[1] if len(sys.argv) > 1 else 'exercises.json'
+    errors = validate(read_data(filename))
+    for error in errors:
+        print(error)
+    if errors:
+        sys.exit(f'{filename}: {len(errors)} error(s)')
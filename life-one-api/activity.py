@@ -0,0 +1,81 @@
+"""
+Training calendar: per-day sessions, sets, reps and volume for one year of workout logs, from a single
+GROUP BY over exercise_history × workout_sets. Results are cached per (profile, year); workout-log writes
+call invalidate() after committing, for the year of the date they touched.
+"""
+from __future__ import annotations
+
+import threading
+
+_lock = threading.Lock()
+_cache: dict[tuple[str, int], tuple[tuple, dict]] = {}
+# Bumped by invalidate(); a result computed under an older version is not stored.
+_year_versions: dict[tuple[str, int], int] = {}
+_profile_versions: dict[str, int] = {}
+
+
+def _version(profile_id: str, year: int) -> tuple:
+    return _profile_versions.get(profile_id, 0), _year_versions.get((profile_id, year), 0)
+
+
+def invalidate(profile_id: str, date: str | None = None) -> None:
+    """Drop the cached calendar for the year of date (YYYY-MM-DD), or every year of the profile if None."""
+    with _lock:
+        if date is None:
+            _profile_versions[profile_id] = _profile_versions.get(profile_id, 0) + 1
+            for key in [k for k in _cache if k[0] == profile_id]:
+                del _cache[key]
+            return
+        try:
+            key = (profile_id, int(date[:4]))
+        except ValueError:
+            return
+        _year_versions[key] = _year_versions.get(key, 0) + 1
+        _cache.pop(key, None)
+
+
+def _compute(conn, profile_id: str, year: int) -> dict:
+    rows = conn.execute(
+        """SELECT h.date, COUNT(DISTINCT h.id) AS sessions, COUNT(*) AS sets, SUM(s.reps) AS reps,
+                  COALESCE(SUM(s.reps * s.weight_kg), 0) AS volume
+         FROM exercise_history h
+         JOIN workout_sets s ON s.exercise_history_id = h.id
+         WHERE h.profile_id = ? AND h.date >= ? AND h.date <= ?
+         GROUP BY h.date ORDER BY h.date""",
+        (profile_id, f"{year:04d}-01-01", f"{year:04d}-12-31"),
+    ).fetchall()
+    days = [
+        {
+            "date": r["date"],
+            "sessions": r["sessions"],
+            "sets": r["sets"],
+            "reps": r["reps"] or 0,
+            "volumeKg": round(r["volume"], 1),
+        }
+        for r in rows
+    ]
+    return {
+        "year": year,
+        "days": days,
+        "totals": {
+            "activeDays": len(days),
+            "sessions": sum(d["sessions"] for d in days),
+            "sets": sum(d["sets"] for d in days),
+            "volumeKg": round(sum(d["volumeKg"] for d in days), 1),
+        },
+    }
+
+
+def calendar(conn, profile_id: str, year: int) -> dict:
+    """Days with at least one logged set in the year, oldest first, plus year totals (cached)."""
+    key = (profile_id, year)
+    with _lock:
+        version = _version(profile_id, year)
+        hit = _cache.get(key)
+    if hit is not None and hit[0] == version:
+        return hit[1]
+    result = _compute(conn, profile_id, year)
+    with _lock:
+        if _version(profile_id, year) == version:
+            _cache[key] = (version, result)
+    return result
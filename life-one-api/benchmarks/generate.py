@@ -0,0 +1,233 @@
+"""
+Seeded synthetic data for benchmarks: N profiles with years of workout sets, daily meal logs, chat
+history, program/diet blueprints, coach context files and a handoff sheet, plus a foods table to search.
+The same seed and sizes always produce the same rows.
+
+App modules read LIFE_ONE_DB / LIFE_ONE_PROGRAMS_DIR / LIFE_ONE_DIETS_DIR when imported, so they are
+imported inside generate(): set those before calling it (benchmarks.run does).
+
+Usage (from life-one-api directory):
+  python -m benchmarks.generate --dir /tmp/bench --profiles 3 --years 2 --seed 1
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+# (section name, exercises) for a four-day split; weights are starting kg, progressed over time.
+SPLIT = [
+    ("Upper A", [("Barbell Bench Press", 60), ("Bent Over Barbell Row", 55), ("Dumbbell Shoulder Press", 20), ("Pull-Up", 0), ("Barbell Curl", 25)]),
+    ("Lower A", [("Barbell Squat", 80), ("Romanian Deadlift", 70), ("Leg Press", 120), ("Standing Calf Raises", 60), ("Plank", 0)]),
+    ("Upper B", [("Incline Dumbbell Press", 24), ("Wide-Grip Lat Pulldown", 55), ("Side Lateral Raise", 8), ("Seated Cable Rows", 50), ("Triceps Pushdown", 25)]),
+    ("Lower B", [("Barbell Deadlift", 100), ("Barbell Lunge", 40), ("Lying Leg Curls", 35), ("Leg Extensions", 40), ("Hanging Leg Raise", 0)]),
+]
+SPLIT_DAYS = ["Mon", "Tue", "Thu", "Fri"]
+FOOD_WORDS = [
+    "chicken", "beef", "salmon", "tuna", "egg", "rice", "oats", "bread", "pasta", "potato", "apple",
+    "banana", "berries", "yogurt", "milk", "cheese", "almonds", "peanut", "broccoli", "spinach",
+    "carrot", "tomato", "lentils", "beans", "tofu", "avocado", "olive", "honey", "quinoa", "turkey",
+]
+FOOD_STYLES = ["raw", "cooked", "grilled", "baked", "boiled", "roasted", "canned", "frozen", "dried", "fresh"]
+CHAT_TOPICS = [
+    "How should I progress my squat?", "I slept badly, should I still train?", "Is my protein intake enough?",
+    "My shoulder feels tight after bench.", "Can I swap deadlifts for rack pulls this week?",
+    "What should I eat before an evening session?", "I missed two sessions, how do I get back on track?",
+]
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _paragraphs(rng: random.Random, count: int) -> str:
+    words = FOOD_WORDS + [name.lower() for _, exercises in SPLIT for name, _ in exercises]
+    return "\n\n".join(
+        " ".join(rng.choice(words) for _ in range(rng.randint(40, 90))).capitalize() + "."
+        for _ in range(count)
+    )
+
+
+def _seed_foods(conn, rng: random.Random, count: int) -> list[int]:
+    nutrient_names = [r["name"] for r in conn.execute("SELECT name FROM nutrients ORDER BY id").fetchall()]
+    rows = []
+    for i in range(count):
+        name = f"{rng.choice(FOOD_WORDS).title()}, {rng.choice(FOOD_STYLES)} #{i}"
+        nutrients = {n: round(rng.uniform(0, 500), 1) for n in rng.sample(nutrient_names, min(len(nutrient_names), 12))}
+        rows.append((
+            name, str(100000 + i), rng.randint(0, 30), round(rng.uniform(20, 600), 1),
+            rng.randint(0, 35), rng.randint(0, 80), 100, json.dumps(nutrients),
+        ))
+    conn.executemany(
+        "INSERT INTO foods (name, usda_id, fat, calories, proteins, carbohydrates, serving, nutrients) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    return [r["id"] for r in conn.execute("SELECT id FROM foods ORDER BY id").fetchall()]
+
+
+def _seed_workouts(conn, rng: random.Random, profile_id: str, start: date, end: date) -> int:
+    history, sets = [], []
+    day, week = start, 0
+    while day <= end:
+        abbrev = DAYS[day.weekday()]
+        if abbrev in SPLIT_DAYS and rng.random() < 0.9:  # ~10% of sessions skipped
+            _, exercises = SPLIT[SPLIT_DAYS.index(abbrev)]
+            for name, base_weight in exercises:
+                history_id = _uuid(rng)
+                history.append((history_id, profile_id, name, day.isoformat()))
+                weight = round(base_weight * (1 + 0.004 * week), 1) if base_weight else None
+                for set_index in range(rng.randint(3, 5)):
+                    note = rng.choice(["felt strong", "grindy last rep", "paused reps"]) if rng.random() < 0.05 else None
+                    sets.append((_uuid(rng), history_id, set_index, rng.randint(5, 12), weight, note))
+        day += timedelta(days=1)
+        if day.weekday() == 0:
+            week += 1
+    conn.executemany("INSERT INTO exercise_history (id, profile_id, exercise_name, date) VALUES (?, ?, ?, ?)", history)
+    conn.executemany(
+        "INSERT INTO workout_sets (id, exercise_history_id, set_index, reps, weight_kg, note) VALUES (?, ?, ?, ?, ?, ?)",
+        sets,
+    )
+    return len(sets)
+
+
+def _seed_meals(conn, rng: random.Random, profile_id: str, start: date, end: date, food_ids: list[int]) -> int:
+    meals, foods = [], []
+    day = start
+    while day <= end:
+        meal_id = _uuid(rng)
+        meals.append((meal_id, profile_id, day.isoformat()))
+        for order in range(rng.randint(4, 9)):
+            foods.append((_uuid(rng), meal_id, rng.choice(food_ids), round(rng.uniform(30, 350)), None, order))
+        day += timedelta(days=1)
+    conn.executemany("INSERT INTO meal_history (id, profile_id, date) VALUES (?, ?, ?)", meals)
+    conn.executemany(
+        "INSERT INTO meal_foods (id, meal_history_id, food_id, amount_grams, note, display_order) VALUES (?, ?, ?, ?, ?, ?)",
+        foods,
+    )
+    return len(foods)
+
+
+def _seed_coach(conn, rng: random.Random, profile_id: str, start: date, messages: int) -> None:
+    rows = []
+    for i in range(messages):
+        created = f"{(start + timedelta(days=i // 4)).isoformat()} {8 + i % 12:02d}:00:00"
+        role = "user" if i % 2 == 0 else "assistant"
+        content = rng.choice(CHAT_TOPICS) if role == "user" else _paragraphs(rng, 1)
+        rows.append((_uuid(rng), profile_id, role, content, created))
+    conn.executemany("INSERT INTO chat_messages (id, profile_id, role, content, created_at) VALUES (?, ?, ?, ?, ?)", rows)
+    for i, source_type in enumerate(["transcript", "blog", "general"]):
+        conn.execute(
+            "INSERT INTO coach_context_files (id, profile_id, name, content, source_type) VALUES (?, ?, ?, ?, ?)",
+            (_uuid(rng), profile_id, f"{source_type}-{i}.md", _paragraphs(rng, 8), source_type),
+        )
+    conn.execute(
+        "INSERT INTO profile_handoff_sheet (profile_id, content) VALUES (?, ?)",
+        (profile_id, "# Client Handoff Sheet\n\n" + _paragraphs(rng, 5)),
+    )
+    preset = conn.execute("SELECT id FROM coach_personality_presets ORDER BY id LIMIT 1").fetchone()
+    conn.execute(
+        "INSERT INTO coach_settings (profile_id, personality_preset_id, sport) VALUES (?, ?, ?)",
+        (profile_id, preset["id"] if preset else None, "powerlifting"),
+    )
+
+
+def _program_blueprint(rng: random.Random, name: str) -> dict:
+    return {
+        "id": _uuid(rng),
+        "name": name,
+        "sections": [
+            {
+                "id": _uuid(rng),
+                "name": section,
+                "description": f"{section} day",
+                "days": [day],
+                "exerciseNames": [n for n, _ in rng.sample(exercises, len(exercises))],
+            }
+            for (section, exercises), day in zip(SPLIT, SPLIT_DAYS)
+        ],
+    }
+
+
+def _diet_blueprint(rng: random.Random, food_names: list[str]) -> dict:
+    return {
+        "id": _uuid(rng),
+        "name": "Cut",
+        "sections": [
+            {
+                "id": _uuid(rng),
+                "name": meal,
+                "description": "",
+                "days": list(DAYS),
+                "foodNames": rng.sample(food_names, 5),
+            }
+            for meal in ["Breakfast", "Lunch", "Dinner", "Snacks"]
+        ],
+    }
+
+
+def generate(profiles: int = 3, years: float = 2.0, seed: int = 1, foods: int = 5000, messages: int = 400, end: date | None = None) -> list[dict]:
+    """Create a fresh dataset in the configured DB and blueprint dirs. Returns [{id, name}] of the profiles."""
+    from database import get_connection, init_db
+    import diet_storage
+    import program_storage
+    from scripts import seed_nutrients
+
+    rng = random.Random(seed)
+    end = end or date(2026, 6, 30)
+    start = end - timedelta(days=int(365 * years))
+    init_db()
+    conn = get_connection()
+    try:
+        seed_nutrients.seed(conn, seed_nutrients.load_nutrients(ROOT / "data" / "nutrients.json"))
+        food_ids = _seed_foods(conn, rng, foods)
+        food_names = [r["name"] for r in conn.execute("SELECT name FROM foods ORDER BY id LIMIT 200").fetchall()]
+        created = []
+        for i in range(profiles):
+            profile_id = _uuid(rng)
+            name = f"bench-{i}"
+            conn.execute("INSERT INTO profiles (id, name, password_hash) VALUES (?, ?, ?)", (profile_id, name, None))
+            _seed_workouts(conn, rng, profile_id, start, end)
+            _seed_meals(conn, rng, profile_id, start, end, food_ids)
+            _seed_coach(conn, rng, profile_id, start, messages)
+            program_storage.save_program(profile_id, _program_blueprint(rng, "Upper/Lower"))
+            program_storage.save_program(profile_id, _program_blueprint(rng, "Deload"))
+            diet_storage.save_diet(profile_id, _diet_blueprint(rng, food_names))
+            created.append({"id": profile_id, "name": name})
+        conn.commit()
+        return created
+    finally:
+        conn.close()
+
+
+def configure_environment(data_dir: Path) -> None:
+    """Point the app's DB and blueprint dirs at data_dir (call before importing app modules)."""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    os.environ["LIFE_ONE_DB"] = str(data_dir / "life_one.db")
+    os.environ["LIFE_ONE_PROGRAMS_DIR"] = str(data_dir / "programs")
+    os.environ["LIFE_ONE_DIETS_DIR"] = str(data_dir / "diets")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dir", type=Path, required=True, help="Directory for the DB and blueprints (must not exist)")
+    parser.add_argument("--profiles", type=int, default=3)
+    parser.add_argument("--years", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    if args.dir.exists():
+        sys.exit(f"{args.dir} already exists")
+    configure_environment(args.dir)
+    for p in generate(args.profiles, args.years, args.seed):
+        print(f"{p['name']} {p['id']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Latency benchmarks for the API hot paths. Requests go in-process through an ASGI client (no server,
+no network) against a seeded synthetic dataset from benchmarks.generate. Prints p50/p95/p99 per
+scenario and saves them as JSON so runs can be compared.
+
+Usage (from life-one-api directory):
+  python -m benchmarks.run --iterations 200 --out benchmarks/results/baseline.json
+  python -m benchmarks.run --compare benchmarks/results/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.generate import configure_environment, generate
+
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+DATASET_END = date(2026, 6, 30)
+FOOD_QUERIES = ["chicken", "rice", "oats", "salmon", "yog", "bean", "grilled", "apple"]
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(timings: list[float]) -> dict:
+    values = sorted(t * 1000 for t in timings)
+    return {
+        "n": len(values),
+        "mean_ms": round(sum(values) / len(values), 3),
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(values[-1], 3),
+    }
+
+
+def _scenarios(profiles: list[dict]):
+    """(name, async step(client, i)) pairs; step i uses profile i % len(profiles)."""
+    from routers.chat import _build_system_prompt
+    from routers.context import build_context_dict
+    import program_storage
+
+    programs = {p["id"]: program_storage.list_programs(p["id"])[0]["id"] for p in profiles}
+    section_exercises = {
+        p["id"]: program_storage.list_programs(p["id"])[0]["sections"][0]["exerciseNames"] for p in profiles
+    }
+    month_from = (DATASET_END - timedelta(days=30)).isoformat()
+    year_from = (DATASET_END - timedelta(days=365)).isoformat()
+
+    def pick(i):
+        p = profiles[i % len(profiles)]
+        return p, f"/api/profiles/{p['name']}", {"Authorization": f"Bearer {p['token']}"}
+
+    async def get(client, url, headers, **params):
+        resp = await client.get(url, headers=headers, params=params)
+        if resp.status_code != 200:
+            raise RuntimeError(f"GET {url} -> {resp.status_code}: {resp.text[:200]}")
+
+    async def workout_logs_list(client, i):
+        _, base, headers = pick(i)
+        await get(client, f"{base}/workout-logs", headers)
+
+    async def meal_logs_range(client, i):
+        _, base, headers = pick(i)
+        await get(client, f"{base}/meal-logs", headers, dateFrom=month_from, dateTo=DATASET_END.isoformat())
+
+    async def context(client, i):
+        _, base, headers = pick(i)
+        await get(client, f"{base}/context", headers)
+
+    async def system_prompt_build(client, i):
+        p, _, _ = pick(i)
+        _build_system_prompt(build_context_dict(p["id"]), p["id"])
+
+    async def foods_search(client, i):
+        _, _, headers = pick(i)
+        await get(client, "/api/foods", headers, q=FOOD_QUERIES[i % len(FOOD_QUERIES)], limit=50)
+
+    async def last_date_per_exercise(client, i):
+        p, base, headers = pick(i)
+        for name in section_exercises[p["id"]]:
+            await get(client, f"{base}/workout-logs/last-date", headers, exerciseName=name)
+
+    async def last_sessions_batch(client, i):
+        p, base, headers = pick(i)
+        await get(client, f"{base}/workout-logs/last-sessions", headers, exerciseName=section_exercises[p["id"]])
+
+    async def muscle_volume_year(client, i):
+        _, base, headers = pick(i)
+        await get(client, f"{base}/training/muscle-volume", headers, dateFrom=year_from, dateTo=DATASET_END.isoformat())
+
+    async def program_rename(client, i):
+        p, base, headers = pick(i)
+        resp = await client.put(f"{base}/programs/{programs[p['id']]}", headers=headers, json={"name": f"Upper/Lower {i}"})
+        if resp.status_code != 200:
+            raise RuntimeError(f"rename -> {resp.status_code}")
+
+    async def program_section_add_remove(client, i):
+        p, base, headers = pick(i)
+        url = f"{base}/programs/{programs[p['id']]}/sections"
+        resp = await client.post(url, headers=headers, json={"name": f"Extra {i}", "days": ["Sat"]})
+        if resp.status_code != 200:
+            raise RuntimeError(f"add section -> {resp.status_code}")
+        section_id = resp.json()["sections"][-1]["id"]
+        resp = await client.delete(f"{url}/{section_id}", headers=headers)
+        if resp.status_code != 200:
+            raise RuntimeError(f"delete section -> {resp.status_code}")
+
+    return [
+        ("workout_logs_list", workout_logs_list),
+        ("meal_logs_range", meal_logs_range),
+        ("context", context),
+        ("system_prompt_build", system_prompt_build),
+        ("foods_search", foods_search),
+        ("last_date_per_exercise", last_date_per_exercise),
+        ("last_sessions_batch", last_sessions_batch),
+        ("muscle_volume_year", muscle_volume_year),
+        ("program_rename", program_rename),
+        ("program_section_add_remove", program_section_add_remove),
+    ]
+
+
+async def run_scenarios(profiles: list[dict], iterations: int, warmup: int, only: set[str] | None = None) -> dict:
+    import httpx
+
+    import main
+
+    results = {}
+    async with main.lifespan(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, step in _scenarios(profiles):
+                if only and name not in only:
+                    continue
+                timings = []
+                for i in range(warmup + iterations):
+                    start = time.perf_counter()
+                    await step(client, i)
+                    if i >= warmup:
+                        timings.append(time.perf_counter() - start)
+                results[name] = summarize(timings)
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_table(results: dict, baseline: dict | None = None) -> None:
+    print(f"{'scenario':30} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}" + ("   p50 vs baseline" if baseline else ""))
+    for name, r in results.items():
+        line = f"{name:30} {r['p50_ms']:9.2f} {r['p95_ms']:9.2f} {r['p99_ms']:9.2f}"
+        old = (baseline or {}).get(name)
+        if old:
+            line += f"   {(r['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100:+6.1f}%"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark API hot paths in-process.")
+    parser.add_argument("--profiles", type=int, default=3)
+    parser.add_argument("--years", type=float, default=2.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--only", nargs="*", help="Scenario names to run (default: all)")
+    parser.add_argument("--out", type=Path, help="Results JSON (default: benchmarks/results/<UTC timestamp>.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier results JSON to compare p50 against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="life-one-bench-") as data_dir:
+        configure_environment(Path(data_dir))
+        from routers.auth import _create_token
+
+        start = time.perf_counter()
+        profiles = generate(args.profiles, args.years, args.seed, end=DATASET_END)
+        generated_seconds = time.perf_counter() - start
+        for p in profiles:
+            p["token"] = _create_token(p["id"], p["name"])
+        results = asyncio.run(run_scenarios(profiles, args.iterations, args.warmup, set(args.only or []) or None))
+
+    now = datetime.now(timezone.utc)
+    report = {
+        "meta": {
+            "timestamp": now.isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "profiles": args.profiles,
+            "years": args.years,
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "generate_seconds": round(generated_seconds, 2),
+        },
+        "scenarios": results,
+    }
+    out = args.out or RESULTS_DIR / f"{now.strftime('%Y%m%dT%H%M%SZ')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    baseline = json.loads(args.compare.read_text(encoding="utf-8"))["scenarios"] if args.compare else None
+    print_table(results, baseline)
+    print(f"Saved {out}")
+
+
+if __name__ == "__main__":
+    main()
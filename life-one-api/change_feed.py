@@ -0,0 +1,81 @@
+"""
+Per-profile change feed: routers publish a small event after committing a write (entity type, id,
+op, revision) and every open stream for that profile receives it, so other devices refetch only what
+changed. The revision is the write's change_log seq, usable as a /sync cursor. In-process pub/sub (one
+API process, as deployed); each subscriber has a bounded queue and a subscriber that falls behind gets
+a single "resync" event instead of an unbounded backlog.
+"""
+import asyncio
+import os
+import threading
+
+QUEUE_SIZE = int(os.environ.get("LIFE_ONE_CHANGE_QUEUE_SIZE", "100"))
+MAX_SUBSCRIBERS_PER_PROFILE = 10
+
+_lock = threading.Lock()
+_subscribers: dict[str, set["Subscriber"]] = {}
+
+
+class TooManySubscribers(Exception):
+    pass
+
+
+class Subscriber:
+    """One open stream. Events are handed over on the subscriber's own event loop."""
+
+    __slots__ = ("profile_id", "loop", "queue")
+
+    def __init__(self, profile_id: str, loop: asyncio.AbstractEventLoop):
+        self.profile_id = profile_id
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(QUEUE_SIZE)
+
+    def _deliver(self, event: dict) -> None:
+        if self.queue.full():
+            # Too far behind to catch up event by event: drop the backlog and tell it to refetch.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = {"entity": "resync", "revision": event["revision"]}
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float) -> dict | None:
+        """Next event, or None after timeout seconds without one."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+def subscribe(profile_id: str) -> Subscriber:
+    """Register a stream for the profile (call on the event loop). Raises TooManySubscribers."""
+    sub = Subscriber(profile_id, asyncio.get_running_loop())
+    with _lock:
+        subs = _subscribers.setdefault(profile_id, set())
+        if len(subs) >= MAX_SUBSCRIBERS_PER_PROFILE:
+            raise TooManySubscribers(profile_id)
+        subs.add(sub)
+    return sub
+
+
+def unsubscribe(sub: Subscriber) -> None:
+    with _lock:
+        subs = _subscribers.get(sub.profile_id)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del _subscribers[sub.profile_id]
+
+
+def subscriber_count(profile_id: str) -> int:
+    return len(_subscribers.get(profile_id, ()))
+
+
+def publish(profile_id: str, event: dict) -> None:
+    """Announce a committed write (event from change_log.record). Safe from threadpool workers."""
+    with _lock:
+        subs = list(_subscribers.get(profile_id, ()))
+    for sub in subs:
+        try:
+            sub.loop.call_soon_threadsafe(sub._deliver, event)
+        except RuntimeError:
+            pass  # subscriber's loop already closed; it unsubscribes on its way out
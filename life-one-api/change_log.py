@@ -0,0 +1,61 @@
+"""
+Per-profile change log (schema/18_change_log.sql): every write to synced data records its entity here,
+in the same transaction as the write, under a new monotonic seq. The seq is the cursor for
+GET /api/profiles/{name}/sync and the revision carried by change-feed events.
+
+Usage in a router:
+    event = change_log.record(conn, profile_id, "meal_log", history_id, date=date)
+    conn.commit()
+    change_feed.publish(profile_id, event)
+"""
+from database import get_connection
+
+
+def record(conn, profile_id: str, entity: str, entity_id: str, op: str = "upsert", **extra) -> dict:
+    """Log a write in the caller's transaction (caller commits). Returns the change-feed event for it."""
+    cur = conn.execute(
+        "INSERT OR REPLACE INTO change_log (profile_id, entity, entity_id, op) VALUES (?, ?, ?, ?)",
+        (profile_id, entity, entity_id, op),
+    )
+    return {"entity": entity, "id": entity_id, "op": op, "revision": cur.lastrowid, **extra}
+
+
+def record_now(profile_id: str, entity: str, entity_id: str, op: str = "upsert", **extra) -> dict:
+    """record() in its own transaction, for writes outside the DB (program/diet blueprint files)."""
+    conn = get_connection()
+    try:
+        event = record(conn, profile_id, entity, entity_id, op, **extra)
+        conn.commit()
+        return event
+    finally:
+        conn.close()
+
+
+def latest_seq(conn) -> int:
+    """Highest seq handed out so far (0 on an empty log)."""
+    row = conn.execute("SELECT MAX(seq) AS seq FROM change_log").fetchone()
+    return row["seq"] or 0
+
+
+def changes_since(conn, profile_id: str, since: int, until: int) -> list:
+    """Rows (seq, entity, entity_id, op) for the profile with since < seq <= until, oldest first."""
+    return conn.execute(
+        """SELECT seq, entity, entity_id, op FROM change_log
+         WHERE profile_id = ? AND seq > ? AND seq <= ? ORDER BY seq""",
+        (profile_id, since, until),
+    ).fetchall()
+
+
+def revision(conn, profile_id: str, entity: str, entity_id: str | None = None) -> int:
+    """Latest seq of one entity, or of any entity of that kind when entity_id is None (0 if never logged)."""
+    if entity_id is None:
+        row = conn.execute(
+            "SELECT MAX(seq) AS seq FROM change_log WHERE profile_id = ? AND entity = ?",
+            (profile_id, entity),
+        ).fetchone()
+    else:
+        row = conn.execute(
+            "SELECT seq FROM change_log WHERE profile_id = ? AND entity = ? AND entity_id = ?",
+            (profile_id, entity, entity_id),
+        ).fetchone()
+    return (row["seq"] if row else None) or 0
@@ -0,0 +1,123 @@
+"""
+Response compression: brotli (when the optional `brotli` package is installed) or gzip, chosen from
+Accept-Encoding, for complete JSON/text bodies of at least LIFE_ONE_COMPRESS_MIN_BYTES. Streaming
+responses (more_body, e.g. server-sent events) pass through untouched so nothing is buffered.
+"""
+import gzip
+import os
+
+from starlette.concurrency import run_in_threadpool
+
+import metrics
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+MIN_BYTES = int(os.environ.get("LIFE_ONE_COMPRESS_MIN_BYTES", "1024"))
+# Bodies above this are compressed in a worker thread so large payloads don't stall the event loop.
+THREAD_MIN_BYTES = 256 * 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4  # fast setting; still smaller than gzip -6 on JSON
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Pick "br" or "gzip" from an Accept-Encoding header (q=0 means refused)."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _header(headers: list, name: bytes) -> bytes | None:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware; compresses single-message bodies and adds Vary: Accept-Encoding."""
+
+    def __init__(self, app, minimum_size: int = MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for key, value in scope.get("headers", []):
+            if key == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message  # held until we know the body
+                return
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+            start, start_message = start_message, None
+            headers = list(start.get("headers", []))
+            body = message.get("body", b"")
+            content_type = (_header(headers, b"content-type") or b"").decode("latin-1")
+            if (
+                message.get("more_body", False)
+                or len(body) < self.minimum_size
+                or _header(headers, b"content-encoding") is not None
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            ):
+                await send(start)
+                await send(message)
+                return
+            with metrics.phase("compress"):
+                if len(body) >= THREAD_MIN_BYTES:
+                    compressed = await run_in_threadpool(_compress, body, encoding)
+                else:
+                    compressed = _compress(body, encoding)
+            new_headers = []
+            vary = b"Accept-Encoding"
+            for key, value in headers:
+                lower = key.lower()
+                if lower == b"content-length":
+                    continue
+                if lower == b"vary":
+                    vary = value + b", " + vary
+                    continue
+                if lower == b"etag" and not value.startswith(b"W/"):
+                    value = b"W/" + value  # the bytes differ from the identity encoding
+                new_headers.append((key, value))
+            new_headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(compressed)).encode("latin-1")),
+                (b"vary", vary),
+            ]
+            await send({**start, "headers": new_headers})
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,35 +1,178 @@
 """
-Database init: run schema files in order and provide get_connection.
+Database init: apply versioned schema migrations and provide get_connection.
 """
+import hashlib
+import logging
 import os
 import sqlite3
+import time
 from pathlib import Path
 
+import metrics
+import sql_profiler
+
 DB_PATH = os.environ.get("LIFE_ONE_DB", "life_one.db")
 SCHEMA_DIR = Path(__file__).resolve().parent / "schema"
 
+logger = logging.getLogger("life_one.db")
+
+
+def _record(sql: str | None, start: float) -> None:
+    elapsed = time.perf_counter() - start
+    metrics.add_phase("db", elapsed)
+    sql_profiler.record(sql, elapsed)
+
+
+class _TimedCursor(sqlite3.Cursor):
+    """Reports statements and time spent executing/fetching to the request's db phase and the SQL profiler."""
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _record(sql, start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            _record(sql, start)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            _record(None, start)
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            _record(None, start)
+
+    def fetchall(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            _record(None, start)
+
+
+class _TimedConnection(sqlite3.Connection):
+    def cursor(self, factory=_TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        start = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            _record(None, start)
+
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            _record(None, start)
+
 
 def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, factory=_TimedConnection)
     conn.row_factory = sqlite3.Row
     return conn
 
 
-def init_db() -> None:
-    """Run all schema/*.sql files in order (01_ ... 16_ etc.)."""
-    conn = get_connection()
+def _migration_files() -> list[tuple[int, Path]]:
+    """(version, path) for schema/NN_*.sql, ordered by version."""
+    migrations = {}
+    for path in Path(SCHEMA_DIR).glob("*.sql"):
+        prefix = path.name.split("_", 1)[0]
+        if not prefix.isdigit():
+            continue
+        version = int(prefix)
+        if version in migrations:
+            raise RuntimeError(f"Duplicate migration version {version}: {migrations[version].name}, {path.name}")
+        migrations[version] = path
+    return sorted(migrations.items())
+
+
+def _checksum(sql: str) -> str:
+    # Line endings normalised so a Windows checkout (autocrlf) does not count as drift.
+    return hashlib.sha256(sql.replace("\r\n", "\n").encode("utf-8")).hexdigest()
+
+
+def _applied_migrations(conn: sqlite3.Connection) -> dict[int, str]:
     try:
-        schema_files = sorted(Path(SCHEMA_DIR).glob("*.sql"))
-        for path in schema_files:
-            if path.suffix == ".sql" and path.name[0:1].isdigit():
-                sql = path.read_text(encoding="utf-8")
-                try:
-                    conn.executescript(sql)
-                except sqlite3.OperationalError as e:
-                    if "duplicate column" in str(e).lower():
-                        pass  # migration already applied
-                    else:
-                        raise
+        rows = conn.execute("SELECT version, checksum FROM schema_migrations").fetchall()
+    except sqlite3.OperationalError as e:
+        if "no such table" not in str(e).lower():
+            raise
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS schema_migrations (
+                 version INTEGER PRIMARY KEY,
+                 name TEXT NOT NULL,
+                 checksum TEXT NOT NULL,
+                 applied_at TEXT NOT NULL DEFAULT (datetime('now'))
+               )"""
+        )
         conn.commit()
+        return {}
+    return {r["version"]: r["checksum"] for r in rows}
+
+
+def _apply_migration(conn: sqlite3.Connection, version: int, path: Path, sql: str) -> None:
+    """Run one migration file and record it, in a single transaction."""
+    try:
+        # executescript commits anything pending first, then leaves our BEGIN open.
+        conn.executescript("BEGIN;\n" + sql)
+    except sqlite3.OperationalError as e:
+        conn.rollback()
+        # Databases created before schema_migrations existed already have the column.
+        if "duplicate column" not in str(e).lower():
+            raise
+        logger.info("Migration %s already present in schema, recording it as applied", path.name)
+    conn.execute(
+        "INSERT INTO schema_migrations (version, name, checksum) VALUES (?, ?, ?)",
+        (version, path.name, _checksum(sql)),
+    )
+    conn.commit()
+
+
+def init_db() -> dict:
+    """
+    Apply schema/NN_*.sql migrations not yet recorded in schema_migrations, each in its own transaction.
+    Already-applied files are not re-run; if one was edited since, it is reported as drift (logged, not re-applied).
+    Returns {"applied": [names], "drift": [names]}.
+    """
+    conn = get_connection()
+    try:
+        applied = _applied_migrations(conn)
+        report = {"applied": [], "drift": []}
+        for version, path in _migration_files():
+            sql = path.read_text(encoding="utf-8")
+            if version not in applied:
+                _apply_migration(conn, version, path, sql)
+                report["applied"].append(path.name)
+            elif applied[version] != _checksum(sql):
+                report["drift"].append(path.name)
+        if report["applied"]:
+            logger.info("Applied migrations: %s", ", ".join(report["applied"]))
+        if report["drift"]:
+            logger.warning(
+                "Migrations changed after being applied (not re-run; add a new migration instead): %s",
+                ", ".join(report["drift"]),
+            )
+        return report
     finally:
         conn.close()
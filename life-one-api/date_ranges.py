@@ -0,0 +1,28 @@
+"""
+Date-range query parameters (dateFrom/dateTo) shared by the rollup routes: nutrition totals and
+micronutrients, diet adherence and training volume.
+"""
+from datetime import date as date_cls, timedelta
+
+from fastapi import HTTPException
+
+DEFAULT_RANGE_DAYS = 30
+MAX_RANGE_DAYS = 366
+
+
+def parse_range(date_from: str | None, date_to: str | None, default_days: int = DEFAULT_RANGE_DAYS) -> tuple[str, str]:
+    """Validate YYYY-MM-DD bounds; default to the last default_days days ending today."""
+    try:
+        end = date_cls.fromisoformat(date_to.strip()) if date_to else date_cls.today()
+        start = (
+            date_cls.fromisoformat(date_from.strip())
+            if date_from
+            else end - timedelta(days=default_days - 1)
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="dateFrom and dateTo must be YYYY-MM-DD")
+    if start > end:
+        raise HTTPException(status_code=400, detail="dateFrom must be on or before dateTo")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range must be at most {MAX_RANGE_DAYS} days")
+    return start.isoformat(), end.isoformat()
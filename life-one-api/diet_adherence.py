@@ -0,0 +1,208 @@
+"""
+Diet adherence: a diet blueprint (diet_storage) compared with logged meals (meal_history / meal_foods).
+Planned food names are resolved to food ids once per blueprint revision (its change_log seq) and foods
+table version; each logged day is then set arithmetic on food ids: planned ∩ eaten, planned − eaten,
+eaten − planned. Blueprints carry no amounts, so the plan counts one serving (foods.serving grams) of each
+planned food. Results are cached by blueprint revision and meal data version (latest meal_log seq).
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from datetime import date as date_cls
+from urllib.parse import unquote
+
+import change_log
+import diet_storage
+from nutrition_totals import MACRO_FIELDS
+
+DAY_ABBREVS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")  # section day labels, as in the app's section editor
+MAX_CACHED_RESULTS = 256
+
+_lock = threading.Lock()
+_foods: dict | None = None
+_plans: dict[tuple, dict] = {}
+_results: OrderedDict[tuple, dict] = OrderedDict()
+
+
+def _foods_signature(conn) -> tuple:
+    return tuple(conn.execute("SELECT COUNT(*), MAX(id), MAX(updated_at) FROM foods").fetchone())
+
+
+def _food_index(conn) -> dict:
+    """Food names/macros by id and lowercase name -> id, rebuilt only when the foods table changed."""
+    global _foods
+    sig = _foods_signature(conn)
+    cached = _foods
+    if cached is not None and cached["signature"] == sig:
+        return cached
+    by_id, by_name = {}, {}
+    for r in conn.execute("SELECT id, name, calories, proteins, fat, carbohydrates, serving FROM foods ORDER BY id"):
+        by_id[r["id"]] = {
+            "name": r["name"],
+            "serving": r["serving"] or 100,
+            **{f: r[f] or 0.0 for f in MACRO_FIELDS},
+        }
+        by_name.setdefault(r["name"].strip().lower(), r["id"])
+    with _lock:
+        _foods = {"signature": sig, "by_id": by_id, "by_name": by_name}
+        return _foods
+
+
+def _macros(foods: dict, grams_by_id: dict[int, float]) -> dict:
+    by_id = foods["by_id"]
+    return {
+        f: round(sum((by_id[i][f] * grams / 100.0 for i, grams in grams_by_id.items()), 0.0), 1)
+        for f in MACRO_FIELDS
+    }
+
+
+def _build_plan(blueprint: dict, foods: dict) -> dict:
+    """Per weekday: planned food ids (with the section each comes from) and plan macros."""
+    by_name = foods["by_name"]
+    sections, unresolved = [], set()
+    for s in blueprint.get("sections") or []:
+        if not isinstance(s, dict):
+            continue
+        ids = set()
+        for name in s.get("foodNames") or s.get("food_names") or []:
+            if not isinstance(name, str) or not name.strip():
+                continue
+            i = by_name.get(name.strip().lower())
+            if i is None:
+                unresolved.add(name.strip())
+            else:
+                ids.add(i)
+        days = {unquote(str(d)).strip() for d in (s.get("days") or [])}
+        sections.append({"id": s.get("id"), "name": (s.get("name") or "").strip(), "days": days, "foods": frozenset(ids)})
+    weekdays = {}
+    for day in DAY_ABBREVS:
+        todays = [s for s in sections if day in s["days"]]
+        planned = frozenset().union(*(s["foods"] for s in todays))
+        weekdays[day] = {
+            "sections": todays,
+            "foods": planned,
+            "macros": _macros(foods, {i: foods["by_id"][i]["serving"] for i in planned}),
+        }
+    return {"weekdays": weekdays, "unresolved": sorted(unresolved)}
+
+
+def _plan(profile_id: str, diet_id: str, diet_revision: int, foods: dict) -> dict | None:
+    key = (profile_id, diet_id, diet_revision, foods["signature"])
+    plan = _plans.get(key)
+    if plan is None:
+        blueprint = diet_storage.get_diet(profile_id, diet_id)
+        if blueprint is None:
+            return None
+        plan = _build_plan(blueprint, foods)
+        with _lock:
+            for stale in [k for k in _plans if k[:2] == key[:2]]:
+                del _plans[stale]
+            _plans[key] = plan
+    return plan
+
+
+def _names(foods: dict, ids) -> list[str]:
+    return sorted(foods["by_id"][i]["name"] for i in ids)
+
+
+def _compute(conn, profile_id: str, plan: dict, foods: dict, date_from: str, date_to: str) -> dict:
+    rows = conn.execute(
+        """SELECT mh.date, mf.food_id, mf.food_name, mf.amount_grams
+         FROM meal_history mh
+         JOIN meal_foods mf ON mf.meal_history_id = mh.id
+         WHERE mh.profile_id = ? AND mh.date >= ? AND mh.date <= ?
+         ORDER BY mh.date""",
+        (profile_id, date_from, date_to),
+    ).fetchall()
+    logged: dict[str, dict] = {}
+    by_id, by_name = foods["by_id"], foods["by_name"]
+    for r in rows:
+        day = logged.setdefault(r["date"], {"grams": {}, "unmatched": set()})
+        i = r["food_id"] if r["food_id"] in by_id else by_name.get((r["food_name"] or "").strip().lower())
+        if i is None:
+            day["unmatched"].add((r["food_name"] or "").strip() or f"food #{r['food_id']}")
+            continue
+        day["grams"][i] = day["grams"].get(i, 0.0) + (r["amount_grams"] or 0.0)
+
+    days, by_weekday, invalid_dates = [], {}, []
+    for d, day in logged.items():
+        try:
+            weekday = DAY_ABBREVS[date_cls.fromisoformat(d).weekday()]
+        except ValueError:  # stored date not YYYY-MM-DD: no weekday to compare against
+            invalid_dates.append(d)
+            continue
+        target = plan["weekdays"][weekday]
+        eaten = frozenset(day["grams"])
+        planned = target["foods"]
+        actual = _macros(foods, day["grams"])
+        delta = {f: round(actual[f] - target["macros"][f], 1) for f in MACRO_FIELDS}
+        adherence = round(len(planned & eaten) / len(planned), 3) if planned else None
+        days.append({
+            "date": d,
+            "weekday": weekday,
+            "adherence": adherence,
+            "eatenPlanned": _names(foods, planned & eaten),
+            "missed": _names(foods, planned - eaten),
+            "unplanned": _names(foods, eaten - planned),
+            "unmatched": sorted(day["unmatched"]),  # logged foods not in the foods table
+            "sections": [
+                {
+                    "id": s["id"],
+                    "name": s["name"],
+                    "planned": len(s["foods"]),
+                    "eaten": len(s["foods"] & eaten),
+                    "missed": _names(foods, s["foods"] - eaten),
+                }
+                for s in target["sections"]
+            ],
+            "plan": target["macros"],
+            "actual": actual,
+            "delta": delta,
+        })
+        by_weekday.setdefault(weekday, []).append(days[-1])
+
+    weekdays = []
+    for weekday in DAY_ABBREVS:
+        group = by_weekday.get(weekday)
+        if not group:
+            continue
+        scored = [d["adherence"] for d in group if d["adherence"] is not None]
+        weekdays.append({
+            "weekday": weekday,
+            "daysLogged": len(group),
+            "plannedFoods": len(plan["weekdays"][weekday]["foods"]),
+            "averageAdherence": round(sum(scored) / len(scored), 3) if scored else None,
+            "averageDelta": {f: round(sum(d["delta"][f] for d in group) / len(group), 1) for f in MACRO_FIELDS},
+        })
+    return {
+        "days": days,
+        "weekdays": weekdays,
+        "unresolvedPlannedFoods": plan["unresolved"],
+        "invalidDates": invalid_dates,
+    }
+
+
+def adherence(conn, profile_id: str, diet_id: str, date_from: str, date_to: str) -> dict | None:
+    """Per logged day and per weekday: planned foods eaten/missed, unplanned foods, macros vs plan. None if no such diet."""
+    foods = _food_index(conn)
+    diet_revision = change_log.revision(conn, profile_id, "diet", diet_id)
+    plan = _plan(profile_id, diet_id, diet_revision, foods)
+    if plan is None:
+        return None
+    key = (
+        profile_id, diet_id, date_from, date_to, diet_revision,
+        change_log.revision(conn, profile_id, "meal_log"),
+        foods["signature"],
+    )
+    with _lock:
+        hit = _results.get(key)
+        if hit is not None:
+            _results.move_to_end(key)
+            return hit
+    result = _compute(conn, profile_id, plan, foods, date_from, date_to)
+    with _lock:
+        _results[key] = result
+        while len(_results) > MAX_CACHED_RESULTS:
+            _results.popitem(last=False)
+    return result
@@ -9,6 +9,8 @@ import os
 import uuid
 from pathlib import Path
 
+import etags
+
 API_ROOT = Path(__file__).resolve().parent
 DIETS_DIR = Path(os.environ.get("LIFE_ONE_DIETS_DIR", str(API_ROOT / "data" / "diets")))
 
@@ -62,6 +64,7 @@ def save_diet(profile_id: str, blueprint: dict) -> None:
     path = base / f"{did}.json"
     raw = json.dumps(blueprint, indent=2, ensure_ascii=False)
     path.write_text(raw, encoding="utf-8")
+    etags.bump("diets", profile_id)
 
 
 def delete_diet(profile_id: str, diet_id: str) -> bool:
@@ -70,6 +73,7 @@ def delete_diet(profile_id: str, diet_id: str) -> bool:
     if not path.exists():
         return False
     path.unlink()
+    etags.bump("diets", profile_id)
     return True
 
 
@@ -0,0 +1,60 @@
+"""
+Conditional GET: ETags from cheap data versions so a matching If-None-Match is answered 304 before any
+DB query or blueprint file read.
+
+Per-profile data (programs, diets, workout logs) is versioned with in-process counters that every write
+bumps; the tag also carries a hash of the profile id, so two profiles at the same version never share a
+tag, and a per-boot id, so a restart (or writes made by scripts, picked up on restart) never matches an
+old tag. This assumes one API process, as deployed (uvicorn without --workers).
+"""
+import hashlib
+import threading
+import uuid
+
+from fastapi import Request, Response
+
+BOOT_ID = uuid.uuid4().hex[:8]
+# Per-profile data: clients must revalidate, but a 304 costs no body.
+PRIVATE = "private, no-cache"
+
+_lock = threading.Lock()
+_versions: dict[tuple[str, str], int] = {}
+
+
+def bump(kind: str, profile_id: str) -> None:
+    """Record a write to a profile's data of this kind (e.g. "programs", "workout_logs")."""
+    key = (kind, profile_id)
+    with _lock:
+        _versions[key] = _versions.get(key, 0) + 1
+
+
+def version_tag(kind: str, profile_id: str) -> str:
+    """Strong ETag for the current version of a profile's data of this kind."""
+    profile = hashlib.sha256(profile_id.encode("utf-8")).hexdigest()[:12]
+    return f'"{kind}-{profile}-{BOOT_ID}-{_versions.get((kind, profile_id), 0)}"'
+
+
+def content_tag(*parts) -> str:
+    """Strong ETag from a hash of the given values (for global data with no write path in the API)."""
+    return '"' + hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()[:24] + '"'
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 13.1.2): W/ prefixes are ignored.
+    return any(t.strip().removeprefix("W/") == etag for t in if_none_match.split(","))
+
+
+def check(request: Request, response: Response, etag: str, cache_control: str = PRIVATE) -> Response | None:
+    """
+    Return a 304 response if the client already has this version; otherwise set ETag and Cache-Control on
+    the route's response and return None so the handler builds the body.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,318 @@
+"""
+In-memory exercise catalog built once at startup from the compiled artifact
+(exercises-main/compile.py: exercises.catalog.json + exercises.details.jsonl), falling back
+to exercises-main/exercises.json when the artifact is missing, stale or a different version.
+Exercises are compact records; facets (category, equipment, primary/secondary muscle,
+muscle group) are inverted indexes of int bitmasks over record ids, so filtering is
+bitwise AND/OR and facet counts are popcounts. Instructions and other long fields stay in
+the memory-mapped details file until an exercise is requested.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+import name_index
+
+API_ROOT = Path(__file__).resolve().parent
+CATALOG_PATH = Path(
+    os.environ.get("LIFE_ONE_EXERCISES_JSON", str(API_ROOT.parent / "exercises-main" / "exercises.json"))
+)
+
+ARTIFACT_PATH = Path(
+    os.environ.get("LIFE_ONE_EXERCISES_CATALOG", str(CATALOG_PATH.with_name("exercises.catalog.json")))
+)
+DETAILS_PATH = ARTIFACT_PATH.with_name("exercises.details.jsonl")
+ARTIFACT_VERSION = 1
+DETAIL_FIELDS = (
+    "description", "instructions", "tips", "aliases", "tempo", "video", "images",
+    "variation_on", "variations_on", "license", "license_author",
+)
+
+FACETS = ("category", "equipment", "primaryMuscle", "secondaryMuscle", "muscle", "muscleGroup")
+
+
+class Exercise(NamedTuple):
+    id: int
+    name: str
+    category: str
+    equipment: tuple[str, ...]
+    primary_muscles: tuple[str, ...]
+    secondary_muscles: tuple[str, ...]
+
+
+_lock = threading.Lock()
+_catalog: dict | None = None
+
+
+def _term(s: str) -> str:
+    """Normalize and intern a vocabulary term so every record shares one string object."""
+    return sys.intern(s.strip().lower())
+
+
+def _terms(values) -> tuple[str, ...]:
+    return tuple(_term(v) for v in (values or []) if isinstance(v, str) and v.strip())
+
+
+def _entries_from_json(data: dict) -> list[dict]:
+    """Source exercises.json -> entries with every long field held in memory."""
+    return [
+        {**e, "extra": {k: e[k] for k in DETAIL_FIELDS if e.get(k)}, "locator": None}
+        for e in data.get("exercises") or []
+        if isinstance(e, dict) and e.get("name")
+    ]
+
+
+def _entries_from_artifact(art: dict) -> list[dict]:
+    """Compiled catalog rows (vocabulary codes) -> entries; long fields stay in the details file."""
+    cols = {c: i for i, c in enumerate(art["columns"])}
+    categories, equipment, muscles = ([_term(v) for v in art[k]] for k in ("categories", "equipment", "muscles"))
+    out = []
+    for row in art["exercises"]:
+        extra = {}
+        for k in ("description", "aliases"):
+            if k in cols and row[cols[k]]:
+                extra[k] = row[cols[k]]
+        out.append({
+            "name": row[cols["name"]],
+            "category": categories[row[cols["category"]]],
+            "equipment": tuple(equipment[c] for c in row[cols["equipment"]]),
+            "primary_muscles": tuple(muscles[c] for c in row[cols["primary_muscles"]]),
+            "secondary_muscles": tuple(muscles[c] for c in row[cols["secondary_muscles"]]),
+            "extra": extra,
+            "locator": tuple(row[cols["details"]]),
+        })
+    return out
+
+
+def _build(entries: list[dict], muscle_groups: dict) -> dict:
+    raw = sorted(entries, key=lambda e: e["name"].lower())
+    records: list[Exercise] = []
+    extras: list[dict] = []
+    locators: list[tuple[int, int] | None] = []
+    muscle_groups = {g: [m.lower() for m in ms] for g, ms in (muscle_groups or {}).items()}
+    group_of: dict[str, list[str]] = {}
+    for g, ms in muscle_groups.items():
+        for m in ms:
+            group_of.setdefault(m, []).append(g)
+
+    n = len(raw)
+    bitmaps: dict[str, dict[str, bytearray]] = {f: {} for f in FACETS}
+
+    def add(facet: str, value: str, i: int) -> None:
+        bm = bitmaps[facet].get(value)
+        if bm is None:
+            bm = bitmaps[facet][value] = bytearray((n + 7) // 8)
+        bm[i >> 3] |= 1 << (i & 7)
+
+    for i, e in enumerate(raw):
+        # Artifact entries arrive with shared, pre-normalized terms; JSON entries are normalized here.
+        norm = _terms if e["locator"] is None else tuple
+        rec = Exercise(
+            id=i,
+            name=e["name"].strip(),
+            category=_term(e.get("category") or "strength") if e["locator"] is None else e["category"],
+            equipment=norm(e.get("equipment")) or ("none",),
+            primary_muscles=norm(e.get("primary_muscles")),
+            secondary_muscles=norm(e.get("secondary_muscles")),
+        )
+        records.append(rec)
+        extras.append(e["extra"])
+        locators.append(e["locator"])
+        add("category", rec.category, i)
+        for v in rec.equipment:
+            add("equipment", v, i)
+        for v in rec.primary_muscles:
+            add("primaryMuscle", v, i)
+            add("muscle", v, i)
+        for v in rec.secondary_muscles:
+            add("secondaryMuscle", v, i)
+            add("muscle", v, i)
+        for m in rec.primary_muscles + rec.secondary_muscles:
+            for g in group_of.get(m, ()):
+                add("muscleGroup", g, i)
+
+    index = {
+        f: {v: int.from_bytes(bm, "little") for v, bm in values.items()}
+        for f, values in bitmaps.items()
+    }
+    return {
+        "records": records,
+        "extras": extras,
+        "locators": locators,
+        "details_map": None,
+        "by_name": {r.name.lower(): r.id for r in records},
+        "names": name_index.build(r.name for r in records),
+        "index": index,
+        "all": (1 << n) - 1,
+        "muscle_groups": muscle_groups,
+    }
+
+
+def _parse(raw: bytes | None) -> dict:
+    try:
+        data = json.loads(raw) if raw else {}
+    except json.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _newer(path: Path, than: Path) -> bool:
+    """True if path was modified after than (or either cannot be stat'ed)."""
+    try:
+        return path.stat().st_mtime_ns > than.stat().st_mtime_ns
+    except OSError:
+        return True
+
+
+def _load_artifact(source: Path) -> dict | None:
+    """
+    Compiled catalog, or None if missing, another format version, or built from a different exercises.json.
+    A source whose size differs is stale without reading it; the source is hashed only when it has been
+    modified since the artifact was written (or the artifact predates source_size).
+    """
+    try:
+        art = _parse(ARTIFACT_PATH.read_bytes())
+    except OSError:
+        return None
+    if art.get("format") != "exercise-catalog" or art.get("version") != ARTIFACT_VERSION:
+        return None
+    try:
+        size = source.stat().st_size
+    except OSError:
+        return art  # no source to compare against (e.g. API deployed with the artifact only)
+    if art.get("source_size") is not None and art["source_size"] != size:
+        return None
+    if art.get("source_size") is None or _newer(source, ARTIFACT_PATH):
+        try:
+            source_raw = source.read_bytes()
+        except OSError:
+            return art
+        if art.get("source_sha256") != hashlib.sha256(source_raw).hexdigest():
+            return None
+    return art
+
+
+def _map_details(art: dict) -> mmap.mmap | None:
+    """
+    Memory-map the details file if it is the one the artifact was compiled with: its size must equal
+    details_size, and its hash is checked against details_sha256 when it was modified after the artifact.
+    """
+    details_col = art["columns"].index("details")
+    end = max((r[details_col][0] + r[details_col][1] for r in art["exercises"]), default=0)
+    try:
+        with open(DETAILS_PATH, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    expected = art.get("details_size")
+    ok = len(mapped) == expected if expected is not None else len(mapped) >= end
+    if ok and "details_sha256" in art and (expected is None or _newer(DETAILS_PATH, ARTIFACT_PATH)):
+        ok = hashlib.sha256(mapped).hexdigest() == art["details_sha256"]
+    if not ok:
+        mapped.close()
+        return None
+    return mapped
+
+
+def load(path: Path | None = None) -> dict:
+    """
+    (Re)load the catalog. Prefers the compiled artifact; passing a source path forces exercises.json.
+    Missing files yield an empty catalog (e.g. API deployed alone).
+    """
+    global _catalog
+    source = Path(path) if path else CATALOG_PATH
+    art = None if path else _load_artifact(source)
+    details_map = _map_details(art) if art else None
+    if art and details_map is not None:
+        built = _build(_entries_from_artifact(art), art.get("muscle_groups"))
+        built["details_map"] = details_map
+        built["source"] = "artifact"
+    else:
+        try:
+            source_raw = source.read_bytes()
+        except OSError:
+            source_raw = None
+        data = _parse(source_raw)
+        built = _build(_entries_from_json(data), data.get("muscle_groups"))
+        built["source"] = "json"
+    with _lock:
+        _catalog = built
+    return built
+
+
+def get_catalog() -> dict:
+    """Return the loaded catalog, loading it on first use."""
+    cat = _catalog
+    return cat if cat is not None else load()
+
+
+def ids_of(mask: int) -> list[int]:
+    """Record ids set in a bitmask, ascending (= name order)."""
+    out = []
+    while mask:
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+    return out
+
+
+def filter_mask(cat: dict, filters: dict[str, list[str]]) -> int:
+    """AND across facets, OR within a facet. Unknown facet values match nothing."""
+    mask = cat["all"]
+    for facet, values in filters.items():
+        if not values:
+            continue
+        idx = cat["index"][facet]
+        facet_mask = 0
+        for v in values:
+            facet_mask |= idx.get(v.strip().lower(), 0)
+        mask &= facet_mask
+    return mask
+
+
+def facet_counts(cat: dict, filters: dict[str, list[str]], base: int) -> dict[str, dict[str, int]]:
+    """
+    Per-facet value counts. Each facet is counted against the other facets' filters
+    (so selecting one equipment still shows counts for the alternatives).
+    """
+    out = {}
+    for facet in FACETS:
+        others = {f: v for f, v in filters.items() if f != facet}
+        scope = filter_mask(cat, others) & base
+        counts = {
+            value: (bits & scope).bit_count()
+            for value, bits in cat["index"][facet].items()
+        }
+        out[facet] = {k: n for k, n in sorted(counts.items()) if n}
+    return out
+
+
+def to_summary(rec: Exercise) -> dict:
+    return {
+        "name": rec.name,
+        "category": rec.category,
+        "equipment": list(rec.equipment),
+        "primary_muscles": list(rec.primary_muscles),
+        "secondary_muscles": list(rec.secondary_muscles),
+    }
+
+
+def get_exercise(name: str) -> dict | None:
+    """Full exercise (summary + instructions/description/etc.) by case-insensitive name."""
+    cat = get_catalog()
+    i = cat["by_name"].get(name.strip().lower())
+    if i is None:
+        return None
+    out = {**to_summary(cat["records"][i]), **cat["extras"][i]}
+    loc = cat["locators"][i]
+    if loc is not None:
+        offset, length = loc
+        out.update(json.loads(cat["details_map"][offset:offset + length]))
+    return out
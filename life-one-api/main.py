@@ -5,9 +5,13 @@ import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 
-from database import init_db
-from routers import auth, profiles, programs, exercise_history, context, ai_settings, chat, coach, foods, diets, meals
+import compression
+import metrics
+import sql_profiler
+import startup
+from routers import auth, profiles, programs, exercise_history, context, ai_settings, chat, coach, foods, diets, meals, nutrition, exercises, changes, sync, today, training
 
 
 def _cors_origins() -> list[str]:
@@ -18,14 +22,17 @@ def _cors_origins() -> list[str]:
     return default + [s.strip() for s in extra.split(",") if s.strip()]
 
 
+startup.configure_logging()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    init_db()
+    await startup.start()
     yield
-    # shutdown if needed
+    await startup.stop()
 
 
-app = FastAPI(title="Life One API", lifespan=lifespan)
+app = FastAPI(title="Life One API", lifespan=lifespan, default_response_class=metrics.TimedJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -33,7 +40,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag", sql_profiler.HEADER],
 )
+app.add_middleware(compression.CompressionMiddleware)
+if sql_profiler.ENABLED:
+    app.add_middleware(sql_profiler.SQLProfilerMiddleware)
+# Added last so it is outermost: timings include CORS handling and every response gets Server-Timing.
+app.add_middleware(metrics.MetricsMiddleware)
 
 app.include_router(auth.router)
 app.include_router(profiles.router)
@@ -46,8 +59,27 @@ app.include_router(coach.router)
 app.include_router(foods.router)
 app.include_router(diets.router)
 app.include_router(meals.router)
+app.include_router(nutrition.router)
+app.include_router(exercises.router)
+app.include_router(changes.router)
+app.include_router(sync.router)
+app.include_router(today.router)
+app.include_router(training.router)
 
 
 @app.get("/")
 def root():
     return {"service": "Life One API", "docs": "/docs"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus text format: per-route latency/size histograms, status counts, in-flight requests."""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/ready", include_in_schema=False)
+def ready():
+    """Readiness probe: 503 until startup warm-ups are done. Body has per-phase startup timings (ms)."""
+    status = startup.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
@@ -0,0 +1,205 @@
+"""
+Request metrics: per-route latency histograms, status counts, in-flight requests and response sizes,
+rendered in Prometheus text format for GET /metrics. Code running inside a request reports time spent
+in named phases (db, llm, serialize, compress); MetricsMiddleware sums them per route and returns them to
+the client in a Server-Timing header.
+"""
+import contextvars
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+import password_hashing
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Phase name -> seconds for the request being handled. Threadpool workers run sync handlers in a
+# copy of the request's context, so they see (and add to) the same dict.
+_phases: contextvars.ContextVar[dict | None] = contextvars.ContextVar("request_phases", default=None)
+
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # per bucket, last is +Inf; cumulated when rendered
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+# Updated by the middleware on the event loop thread only.
+_latency: dict[tuple[str, str], _Histogram] = {}
+_sizes: dict[tuple[str, str], _Histogram] = {}
+_statuses: dict[tuple[str, str, int], int] = {}
+_phase_totals: dict[tuple[str, str, str], float] = {}
+_in_flight = 0
+
+
+def add_phase(name: str, seconds: float) -> None:
+    """Add seconds to a phase of the current request (no-op outside a request)."""
+    phases = _phases.get()
+    if phases is not None:
+        phases[name] = phases.get(name, 0.0) + seconds
+
+
+@contextmanager
+def phase(name: str):
+    """Time the block as part of a phase of the current request."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_phase(name, time.perf_counter() - start)
+
+
+class TimedJSONResponse(JSONResponse):
+    """Default response class: renders with orjson and times it as the serialize phase."""
+
+    def render(self, content) -> bytes:
+        with phase("serialize"):
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+def json_response(content, response: Response | None = None, status_code: int = 200) -> TimedJSONResponse:
+    """
+    Return already-plain content (dicts/lists of str, numbers, bool, None) as a response, skipping
+    FastAPI's jsonable_encoder walk over large payloads. Headers set on the route's injected Response
+    (e.g. ETag) are carried over.
+    """
+    out = TimedJSONResponse(content, status_code=status_code)
+    if response is not None:
+        out.raw_headers += [(k, v) for k, v in response.raw_headers if k != b"content-length"]
+    return out
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    # Templates (/api/profiles/{profile_name}/...), not raw paths, to keep label cardinality bounded.
+    return getattr(route, "path", None) or "unmatched"
+
+
+def _server_timing(phases: dict, total: float) -> str:
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in phases.items()]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+def _observe(scope, status: int, elapsed: float, size: int, phases: dict) -> None:
+    key = (scope.get("method", ""), _route_label(scope))
+    _latency.setdefault(key, _Histogram(LATENCY_BUCKETS)).observe(elapsed)
+    _sizes.setdefault(key, _Histogram(SIZE_BUCKETS)).observe(size)
+    status_key = key + (status,)
+    _statuses[status_key] = _statuses.get(status_key, 0) + 1
+    for name, seconds in phases.items():
+        phase_key = key + (name,)
+        _phase_totals[phase_key] = _phase_totals.get(phase_key, 0.0) + seconds
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (no extra task per request, unlike BaseHTTPMiddleware)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        global _in_flight
+        phases: dict[str, float] = {}
+        token = _phases.set(phases)
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_with_timing(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(phases, time.perf_counter() - start).encode("latin-1")))
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        _in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _in_flight -= 1
+            _phases.reset(token)
+            _observe(scope, status, time.perf_counter() - start, size, phases)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _render_histograms(lines: list[str], name: str, help_text: str, histograms: dict) -> None:
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for (method, route), h in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(h.bounds + (float("inf"),), h.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{name}_bucket{_labels(method=method, route=route, le=le)} {cumulative}")
+        lines.append(f"{name}_sum{_labels(method=method, route=route)} {h.sum}")
+        lines.append(f"{name}_count{_labels(method=method, route=route)} {h.count}")
+
+
+def render() -> str:
+    """All metrics in Prometheus text exposition format."""
+    lines: list[str] = []
+    _render_histograms(lines, "life_one_http_request_duration_seconds", "Request latency by route.", _latency)
+    _render_histograms(lines, "life_one_http_response_size_bytes", "Response body size by route.", _sizes)
+
+    lines.append("# HELP life_one_http_responses_total Responses by route and status code.")
+    lines.append("# TYPE life_one_http_responses_total counter")
+    for (method, route, status), count in sorted(_statuses.items()):
+        lines.append(f"life_one_http_responses_total{_labels(method=method, route=route, status=status)} {count}")
+
+    lines.append("# HELP life_one_http_request_phase_seconds_total Time spent in db, llm, serialize and compress phases by route.")
+    lines.append("# TYPE life_one_http_request_phase_seconds_total counter")
+    for (method, route, name), seconds in sorted(_phase_totals.items()):
+        lines.append(f"life_one_http_request_phase_seconds_total{_labels(method=method, route=route, phase=name)} {seconds}")
+
+    lines.append("# HELP life_one_http_requests_in_flight Requests currently being handled.")
+    lines.append("# TYPE life_one_http_requests_in_flight gauge")
+    lines.append(f"life_one_http_requests_in_flight {_in_flight}")
+
+    hashing = password_hashing.stats()
+    lines.append("# HELP life_one_password_hash_queue_depth Password hash jobs waiting for a worker.")
+    lines.append("# TYPE life_one_password_hash_queue_depth gauge")
+    lines.append(f"life_one_password_hash_queue_depth {hashing['waiting']}")
+    lines.append("# HELP life_one_password_hash_running Password hash jobs running.")
+    lines.append("# TYPE life_one_password_hash_running gauge")
+    lines.append(f"life_one_password_hash_running {hashing['running']}")
+    for name, key, help_text in (
+        ("completed_total", "completed", "Password hash jobs completed."),
+        ("rejected_total", "rejected", "Password hash jobs rejected because the queue was full."),
+        ("rehashed_total", "rehashed", "Stored password hashes replaced after a cost change."),
+        ("wait_seconds_total", "wait_seconds_total", "Time password hash jobs spent queued."),
+        ("seconds_total", "hash_seconds_total", "Time spent hashing passwords."),
+    ):
+        lines.append(f"# HELP life_one_password_hash_{name} {help_text}")
+        lines.append(f"# TYPE life_one_password_hash_{name} counter")
+        lines.append(f"life_one_password_hash_{name} {hashing[key]}")
+    return "\n".join(lines) + "\n"
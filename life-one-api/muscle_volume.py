@@ -0,0 +1,146 @@
+"""
+Weekly training volume per muscle. Logged exercise names are free text; each distinct name is resolved
+once to a catalog exercise (exercise_catalog: exact name, else the best name_index match) and the result
+is cached until the catalog is reloaded. Aggregation is array arithmetic: sets/reps/kg are summed per
+(ISO week, exercise) with bincount, then (weeks × exercises) @ (exercises × muscles) gives per-muscle totals.
+"""
+from __future__ import annotations
+
+import threading
+from datetime import date as date_cls, timedelta
+
+import numpy as np
+
+import exercise_catalog as catalog
+import name_index
+
+# Fuzzy matches below this score are left unresolved rather than credited to the wrong muscles.
+RESOLVE_MIN_SCORE = 0.75
+
+_lock = threading.Lock()
+_resolved: dict[str, int | None] = {}
+_resolved_catalog: dict | None = None  # the catalog _resolved was built against
+
+
+def _resolve_one(cat: dict, name: str) -> int | None:
+    i = cat["by_name"].get(name.strip().lower())
+    if i is not None:
+        return i
+    matches = name_index.search(cat["names"], name, 1, RESOLVE_MIN_SCORE)
+    return cat["by_name"].get(matches[0][0].lower()) if matches else None
+
+
+def resolve(names) -> tuple[dict, dict[str, int | None]]:
+    """(catalog, {logged name: catalog record id or None}). Only names not seen before are searched."""
+    global _resolved, _resolved_catalog
+    cat = catalog.get_catalog()
+    with _lock:
+        if _resolved_catalog is not cat:
+            _resolved, _resolved_catalog = {}, cat
+        cache = _resolved
+        missing = [n for n in names if n not in cache]
+    found = {n: _resolve_one(cat, n) for n in missing}
+    with _lock:
+        if _resolved_catalog is cat:
+            _resolved.update(found)
+    return cat, {n: cache[n] if n in cache else found[n] for n in names}
+
+
+def _week_start(day: str) -> date_cls | None:
+    """Monday of day's week, or None if day is not a valid YYYY-MM-DD date."""
+    try:
+        d = date_cls.fromisoformat(day)
+    except ValueError:
+        return None
+    return d - timedelta(days=d.weekday())
+
+
+def weekly_volume(conn, profile_id: str, date_from: str, date_to: str) -> dict:
+    """
+    Per ISO week and muscle: sets, reps and volume (reps × kg) from exercises that work it as a primary
+    muscle, plus sets and volume where it is a secondary muscle. Sets without a weight add reps, not volume.
+    Returns weeks (oldest first, only weeks with sets), muscles (all that appear) and the name resolution;
+    entries whose stored date is not a valid YYYY-MM-DD are skipped and listed in invalidDates.
+    """
+    rows = conn.execute(
+        """SELECT h.exercise_name, h.date, s.reps, s.weight_kg
+         FROM exercise_history h
+         JOIN workout_sets s ON s.exercise_history_id = h.id
+         WHERE h.profile_id = ? AND h.date >= ? AND h.date <= ?""",
+        (profile_id, date_from, date_to),
+    ).fetchall()
+    starts = {d: _week_start(d) for d in {r["date"] for r in rows}}
+    invalid_dates = sorted(d for d, start in starts.items() if start is None)
+    if invalid_dates:
+        rows = [r for r in rows if starts[r["date"]] is not None]
+    if not rows:
+        return {"weeks": [], "muscles": [], "exercises": [], "invalidDates": invalid_dates}
+    names_col, dates_col, reps_col, weights_col = zip(*rows)
+    names, name_idx = np.unique(np.asarray(names_col, dtype=str), return_inverse=True)
+    days, day_idx = np.unique(np.asarray(dates_col, dtype=str), return_inverse=True)
+    weeks, week_of_day = np.unique(
+        np.asarray([starts[str(d)].toordinal() for d in days]), return_inverse=True
+    )
+    week_idx = week_of_day[day_idx]
+    reps = np.fromiter((r or 0 for r in reps_col), dtype=np.float64, count=len(rows))
+    kg = np.fromiter((w or 0.0 for w in weights_col), dtype=np.float64, count=len(rows))
+
+    n_weeks, n_names = len(weeks), len(names)
+    key = week_idx * n_names + name_idx
+    size = n_weeks * n_names
+    sets = np.bincount(key, minlength=size).reshape(n_weeks, n_names).astype(np.float64)
+    reps_sum = np.bincount(key, weights=reps, minlength=size).reshape(n_weeks, n_names)
+    volume = np.bincount(key, weights=reps * kg, minlength=size).reshape(n_weeks, n_names)
+
+    cat, resolved = resolve([str(n) for n in names])
+    records = cat["records"]
+    muscles = sorted({
+        m for i in resolved.values() if i is not None
+        for m in records[i].primary_muscles + records[i].secondary_muscles
+    })
+    col = {m: j for j, m in enumerate(muscles)}
+    primary = np.zeros((n_names, len(muscles)))
+    secondary = np.zeros((n_names, len(muscles)))
+    for k, name in enumerate(names):
+        i = resolved[str(name)]
+        if i is None:
+            continue
+        for m in records[i].primary_muscles:
+            primary[k, col[m]] = 1.0
+        for m in records[i].secondary_muscles:
+            secondary[k, col[m]] = 1.0
+
+    p_sets, p_reps, p_volume = sets @ primary, reps_sum @ primary, volume @ primary
+    s_sets, s_volume = sets @ secondary, volume @ secondary
+    out_weeks = []
+    for w, ordinal in enumerate(weeks):
+        start = date_cls.fromordinal(int(ordinal))
+        iso_year, iso_week, _ = start.isocalendar()
+        per_muscle = {}
+        for j in np.flatnonzero(p_sets[w] + s_sets[w]):
+            per_muscle[muscles[j]] = {
+                "sets": int(p_sets[w, j]),
+                "reps": int(p_reps[w, j]),
+                "volumeKg": round(float(p_volume[w, j]), 1),
+                "secondarySets": int(s_sets[w, j]),
+                "secondaryVolumeKg": round(float(s_volume[w, j]), 1),
+            }
+        out_weeks.append({
+            "week": f"{iso_year}-W{iso_week:02d}",
+            "start": start.isoformat(),
+            "end": (start + timedelta(days=6)).isoformat(),
+            "totalSets": int(sets[w].sum()),
+            "muscles": per_muscle,
+        })
+    return {
+        "weeks": out_weeks,
+        "muscles": muscles,
+        "exercises": [
+            {
+                "exerciseName": str(name),
+                "catalogName": records[resolved[str(name)]].name if resolved[str(name)] is not None else None,
+            }
+            for name in names
+        ],
+        "invalidDates": invalid_dates,
+    }
@@ -0,0 +1,98 @@
+"""
+Typo-tolerant name matching for free-text exercise names.
+Names are normalized to tokens (order-insensitive); each token contributes padded trigrams.
+Candidates come from trigram posting lists, then are rescored with trigram Dice plus
+token-set overlap (the last query token may be a prefix, for autocomplete).
+"""
+from __future__ import annotations
+
+import re
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+MIN_SCORE = 0.3
+_CANDIDATES = 60
+
+
+def tokens(name: str) -> list[str]:
+    """Lowercase alphanumeric tokens; trailing plural 's' dropped so 'curls' == 'curl'."""
+    out = []
+    for t in _NON_ALNUM.split(name.lower()):
+        if not t:
+            continue
+        if len(t) > 3 and t.endswith("s") and not t.endswith("ss"):
+            t = t[:-1]
+        out.append(t)
+    return out
+
+
+def normalized_key(name: str) -> str:
+    """Order-insensitive key: 'bench press barbell' and 'Barbell Bench Press' share one key."""
+    return " ".join(sorted(set(tokens(name))))
+
+
+def _trigrams(toks) -> set[str]:
+    grams = set()
+    for t in toks:
+        padded = f"${t}$"
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return grams
+
+
+def build(names) -> dict:
+    """Index an iterable of names. Duplicate normalized keys keep the first name seen."""
+    entries: list[dict] = []
+    by_key: dict[str, int] = {}
+    postings: dict[str, list[int]] = {}
+    for name in names:
+        if not isinstance(name, str) or not name.strip():
+            continue
+        key = normalized_key(name)
+        if not key or key in by_key:
+            continue
+        i = len(entries)
+        toks = frozenset(key.split(" "))
+        grams = _trigrams(toks)
+        entries.append({"name": name.strip(), "tokens": toks})
+        by_key[key] = i
+        for g in grams:
+            postings.setdefault(g, []).append(i)
+    return {"entries": entries, "by_key": by_key, "postings": postings}
+
+
+def _score(q_tokens: list[str], q_grams: set[str], entry: dict) -> float:
+    grams = _trigrams(entry["tokens"])  # recomputed for the few candidates; keeps the index small
+    dice = 2.0 * len(q_grams & grams) / (len(q_grams) + len(grams)) if grams else 0.0
+    name_tokens = entry["tokens"]
+    q_set = set(q_tokens)
+    matched = len(q_set & name_tokens)
+    last = q_tokens[-1]
+    if last not in name_tokens and len(last) >= 2 and any(t.startswith(last) for t in name_tokens):
+        matched += 1  # autocomplete: partially typed last word
+    token_score = matched / len(q_set | name_tokens)
+    return 0.6 * dice + 0.4 * token_score
+
+
+def search(index: dict, query: str, limit: int = 10, min_score: float = MIN_SCORE) -> list[tuple[str, float]]:
+    """Best matches as (name, score), highest first. An order-insensitive exact match scores 1.0."""
+    q_tokens = tokens(query)
+    if not q_tokens:
+        return []
+    entries = index["entries"]
+    exact = index["by_key"].get(normalized_key(query))
+    q_grams = _trigrams(q_tokens)
+    hits: dict[int, int] = {}
+    postings = index["postings"]
+    for g in q_grams:
+        for i in postings.get(g, ()):
+            hits[i] = hits.get(i, 0) + 1
+    candidates = sorted(hits, key=hits.__getitem__, reverse=True)[:_CANDIDATES]
+    scored = []
+    for i in candidates:
+        s = 1.0 if i == exact else _score(q_tokens, q_grams, entries[i])
+        if s >= min_score:
+            scored.append((entries[i]["name"], round(s, 3)))
+    if exact is not None and exact not in candidates:
+        scored.append((entries[exact]["name"], 1.0))
+    scored.sort(key=lambda x: (-x[1], x[0]))
+    return scored[:limit]
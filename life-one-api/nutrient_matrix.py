@@ -0,0 +1,148 @@
+"""
+Foods × nutrients matrix (µg per 100 g) built once from the foods and nutrients tables.
+Daily micronutrient intake over a date range is a single matrix product:
+(days × foods grams/100) @ (foods × nutrients).
+"""
+from __future__ import annotations
+
+import json
+import threading
+
+import numpy as np
+
+_lock = threading.Lock()
+_cached: dict | None = None
+
+
+def _food_nutrient_amounts(raw: str | None) -> dict[str, float]:
+    """Parse foods.nutrients JSON: {"Vitamin C": 53.2, ...} or [{"name": ..., "amount": ...}, ...]."""
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return {}
+    items = []
+    if isinstance(data, dict):
+        items = data.items()
+    elif isinstance(data, list):
+        items = [
+            (d.get("name"), d.get("amount", d.get("value")))
+            for d in data
+            if isinstance(d, dict)
+        ]
+    out = {}
+    for name, value in items:
+        if not isinstance(name, str):
+            continue
+        try:
+            out[name.strip().lower()] = float(value)
+        except (TypeError, ValueError):
+            continue
+    return out
+
+
+def _signature(conn) -> tuple:
+    """Cheap change detector for foods/nutrients (reseeds replace rows and bump ids/updated_at)."""
+    f = conn.execute("SELECT COUNT(*), MAX(id), MAX(updated_at) FROM foods").fetchone()
+    n = conn.execute("SELECT COUNT(*), MAX(id), MAX(updated_at) FROM nutrients").fetchone()
+    return tuple(f) + tuple(n)
+
+
+def _build(conn, signature: tuple) -> dict:
+    nutrient_rows = conn.execute(
+        "SELECT name, type, rda_ug, tui_ug FROM nutrients ORDER BY type, name"
+    ).fetchall()
+    nutrients = [
+        {"name": r["name"], "type": r["type"], "rda_ug": r["rda_ug"], "tui_ug": r["tui_ug"]}
+        for r in nutrient_rows
+    ]
+    col_by_name = {n["name"].lower(): j for j, n in enumerate(nutrients)}
+
+    food_rows = conn.execute("SELECT id, name, nutrients FROM foods ORDER BY id").fetchall()
+    matrix = np.zeros((len(food_rows), len(nutrients)), dtype=np.float64)
+    row_by_id: dict[int, int] = {}
+    row_by_name: dict[str, int] = {}
+    for i, r in enumerate(food_rows):
+        row_by_id[r["id"]] = i
+        row_by_name.setdefault(r["name"], i)
+        for name, amount in _food_nutrient_amounts(r["nutrients"]).items():
+            j = col_by_name.get(name)
+            if j is not None:
+                matrix[i, j] = amount
+
+    rda = np.array([n["rda_ug"] for n in nutrients], dtype=np.float64)
+    tui = np.array(
+        [n["tui_ug"] if n["tui_ug"] is not None else np.nan for n in nutrients],
+        dtype=np.float64,
+    )
+    return {
+        "signature": signature,
+        "nutrients": nutrients,
+        "matrix": matrix,
+        "rda": rda,
+        "tui": tui,
+        "row_by_id": row_by_id,
+        "row_by_name": row_by_name,
+    }
+
+
+def get_matrix(conn) -> dict:
+    """Return the cached matrix, rebuilding only when the foods or nutrients tables changed."""
+    global _cached
+    sig = _signature(conn)
+    cached = _cached
+    if cached is not None and cached["signature"] == sig:
+        return cached
+    with _lock:
+        if _cached is None or _cached["signature"] != sig:
+            _cached = _build(conn, sig)
+        return _cached
+
+
+def daily_intake(conn, profile_id: str, date_from: str, date_to: str) -> dict:
+    """
+    Compute per-day micronutrient intake for logged days in [date_from, date_to].
+    Returns nutrients (metadata), dates, intake (days × nutrients, µg), pct_rda, over_tui (bool),
+    and unmatched (count of entries that map to no food row).
+    """
+    m = get_matrix(conn)
+    rows = conn.execute(
+        """SELECT mh.date, mf.food_id, mf.food_name, mf.amount_grams
+         FROM meal_history mh
+         JOIN meal_foods mf ON mf.meal_history_id = mh.id
+         WHERE mh.profile_id = ? AND mh.date >= ? AND mh.date <= ?
+         ORDER BY mh.date""",
+        (profile_id, date_from, date_to),
+    ).fetchall()
+
+    dates: list[str] = []
+    day_idx, food_idx, scale = [], [], []
+    unmatched = 0
+    row_by_id, row_by_name = m["row_by_id"], m["row_by_name"]
+    for r in rows:
+        if not dates or dates[-1] != r["date"]:
+            dates.append(r["date"])
+        i = row_by_id.get(r["food_id"]) if r["food_id"] is not None else row_by_name.get(r["food_name"])
+        if i is None:
+            unmatched += 1
+            continue
+        day_idx.append(len(dates) - 1)
+        food_idx.append(i)
+        scale.append((r["amount_grams"] or 0) / 100.0)
+
+    amounts = np.zeros((len(dates), m["matrix"].shape[0]), dtype=np.float64)
+    if scale:
+        np.add.at(amounts, (np.asarray(day_idx), np.asarray(food_idx)), np.asarray(scale))
+    intake = amounts @ m["matrix"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct_rda = np.where(m["rda"] > 0, intake / m["rda"] * 100.0, 0.0)
+    over_tui = intake > m["tui"]  # NaN TUI compares False
+    return {
+        "nutrients": m["nutrients"],
+        "dates": dates,
+        "intake": intake,
+        "pct_rda": pct_rda,
+        "over_tui": over_tui,
+        "unmatched": unmatched,
+    }
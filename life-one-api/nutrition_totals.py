@@ -0,0 +1,107 @@
+"""
+Daily nutrition rollups: join meal_foods to foods, scale by amount_grams / 100,
+and materialize per-profile daily totals in nutrition_daily_totals.
+Meal writes call invalidate_day(); reads recompute only the missing days.
+"""
+from __future__ import annotations
+
+from datetime import date as date_cls, timedelta
+
+MACRO_FIELDS = ("calories", "proteins", "fat", "carbohydrates")
+
+# meal_foods rows may carry only food_name (free text); fall back to an exact name match.
+_REFRESH_SQL = """
+INSERT OR REPLACE INTO nutrition_daily_totals
+  (profile_id, date, calories, proteins, fat, carbohydrates, food_count, unmatched_count, computed_at)
+SELECT mh.profile_id, mh.date,
+       COALESCE(SUM(f.calories * mf.amount_grams / 100.0), 0),
+       COALESCE(SUM(f.proteins * mf.amount_grams / 100.0), 0),
+       COALESCE(SUM(f.fat * mf.amount_grams / 100.0), 0),
+       COALESCE(SUM(f.carbohydrates * mf.amount_grams / 100.0), 0),
+       COUNT(mf.id),
+       COUNT(mf.id) - COUNT(f.id),
+       datetime('now')
+FROM meal_history mh
+LEFT JOIN meal_foods mf ON mf.meal_history_id = mh.id
+LEFT JOIN foods f ON f.id = COALESCE(
+  mf.food_id, (SELECT f2.id FROM foods f2 WHERE f2.name = mf.food_name LIMIT 1)
+)
+WHERE mh.profile_id = ? AND mh.date >= ? AND mh.date <= ?
+  AND NOT EXISTS (
+    SELECT 1 FROM nutrition_daily_totals t WHERE t.profile_id = mh.profile_id AND t.date = mh.date
+  )
+GROUP BY mh.profile_id, mh.date
+"""
+
+
+def invalidate_day(conn, profile_id: str, date: str) -> None:
+    """Drop the materialized totals for one day. Call inside the meal write's transaction."""
+    conn.execute(
+        "DELETE FROM nutrition_daily_totals WHERE profile_id = ? AND date = ?",
+        (profile_id, date.strip()),
+    )
+
+
+def invalidate_all(conn) -> None:
+    """Drop every materialized day (e.g. after the foods table is reseeded)."""
+    conn.execute("DELETE FROM nutrition_daily_totals")
+
+
+def daily_totals(conn, profile_id: str, date_from: str, date_to: str) -> list[dict]:
+    """Return totals for each logged day in [date_from, date_to], oldest first. Recomputes stale days."""
+    cur = conn.execute(_REFRESH_SQL, (profile_id, date_from, date_to))
+    if cur.rowcount:
+        conn.commit()
+    rows = conn.execute(
+        """SELECT date, calories, proteins, fat, carbohydrates, food_count, unmatched_count
+         FROM nutrition_daily_totals
+         WHERE profile_id = ? AND date >= ? AND date <= ? ORDER BY date""",
+        (profile_id, date_from, date_to),
+    ).fetchall()
+    return [
+        {
+            "date": r["date"],
+            "calories": round(r["calories"], 1),
+            "proteins": round(r["proteins"], 1),
+            "fat": round(r["fat"], 1),
+            "carbohydrates": round(r["carbohydrates"], 1),
+            "foodCount": r["food_count"],
+            "unmatchedCount": r["unmatched_count"],
+        }
+        for r in rows
+    ]
+
+
+def weekly_totals(days: list[dict]) -> list[dict]:
+    """
+    Group daily totals by ISO week (Monday start). Averages are per logged day. Days whose stored date is
+    not a valid YYYY-MM-DD belong to no week and are left out (they still appear in the daily totals).
+    """
+    weeks: dict[str, dict] = {}
+    for d in days:
+        try:
+            day = date_cls.fromisoformat(d["date"])
+        except ValueError:
+            continue
+        iso_year, iso_week, iso_weekday = day.isocalendar()
+        key = f"{iso_year}-W{iso_week:02d}"
+        w = weeks.get(key)
+        if w is None:
+            start = day - timedelta(days=iso_weekday - 1)
+            w = weeks[key] = {
+                "week": key,
+                "start": start.isoformat(),
+                "end": (start + timedelta(days=6)).isoformat(),
+                "daysLogged": 0,
+                **{f: 0.0 for f in MACRO_FIELDS},
+            }
+        w["daysLogged"] += 1
+        for f in MACRO_FIELDS:
+            w[f] += d[f]
+    out = []
+    for w in weeks.values():
+        for f in MACRO_FIELDS:
+            w[f] = round(w[f], 1)
+        w["average"] = {f: round(w[f] / w["daysLogged"], 1) for f in MACRO_FIELDS}
+        out.append(w)
+    return out
@@ -0,0 +1,151 @@
+"""
+Password hashing: bcrypt runs in a small dedicated thread pool so a burst of logins cannot starve
+the threadpool shared by every other endpoint. The cost factor is tuned at startup to a target
+latency; hashes made with another cost are replaced on the next successful login.
+"""
+import asyncio
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from passlib.context import CryptContext
+    from passlib.hash import bcrypt as bcrypt_hash
+except ImportError:
+    CryptContext = None
+    bcrypt_hash = None
+
+HASH_WORKERS = int(os.environ.get("LIFE_ONE_HASH_WORKERS", "2"))
+# Hash jobs waiting or running beyond this are rejected (503) instead of queueing without bound.
+HASH_QUEUE_LIMIT = int(os.environ.get("LIFE_ONE_HASH_QUEUE_LIMIT", "32"))
+TARGET_MS = float(os.environ.get("LIFE_ONE_BCRYPT_TARGET_MS", "250"))
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+_PROBE_ROUNDS = 8
+
+_executor = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="password-hash")
+_lock = threading.Lock()
+_ctx = None
+_rounds: int | None = None
+_stats = {
+    "pending": 0,
+    "running": 0,
+    "completed": 0,
+    "rejected": 0,
+    "rehashed": 0,
+    "wait_seconds_total": 0.0,
+    "hash_seconds_total": 0.0,
+}
+
+
+class HashQueueFull(RuntimeError):
+    """Too many password hash jobs are already waiting."""
+
+
+def _tuned_rounds() -> int:
+    """Cost whose hash takes about TARGET_MS here: each extra round doubles the work, so time one cheap probe and extrapolate."""
+    elapsed = min(_time_probe() for _ in range(3))
+    rounds = _PROBE_ROUNDS + round(math.log2(max(TARGET_MS / 1000, 1e-6) / max(elapsed, 1e-6)))
+    return max(MIN_ROUNDS, min(MAX_ROUNDS, rounds))
+
+
+def _time_probe() -> float:
+    start = time.perf_counter()
+    bcrypt_hash.using(rounds=_PROBE_ROUNDS).hash("probe")
+    return time.perf_counter() - start
+
+
+def configure(rounds: int | None = None) -> int | None:
+    """Build the hashing context: explicit rounds, else LIFE_ONE_BCRYPT_ROUNDS, else tuned. Returns the cost in use."""
+    global _ctx, _rounds
+    if CryptContext is None:
+        return None
+    if rounds is None and os.environ.get("LIFE_ONE_BCRYPT_ROUNDS"):
+        rounds = int(os.environ["LIFE_ONE_BCRYPT_ROUNDS"])
+    if rounds is None:
+        rounds = _tuned_rounds()
+    # min == max == default: hashes with any other cost report needs_update and are rehashed on login.
+    _ctx = CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+    _rounds = rounds
+    return rounds
+
+
+def _context():
+    if _ctx is None:
+        configure()
+    return _ctx
+
+
+def _truncate(password: str) -> str:
+    # bcrypt truncates at 72 bytes; passlib/newer bcrypt can raise. Truncate to 72 bytes.
+    pwd_bytes = password.encode("utf-8")
+    if len(pwd_bytes) > 72:
+        return pwd_bytes[:72].decode("utf-8", errors="ignore")
+    return password
+
+
+async def _submit(fn, *args):
+    with _lock:
+        if _stats["pending"] >= HASH_QUEUE_LIMIT:
+            _stats["rejected"] += 1
+            raise HashQueueFull("Too many password checks in progress")
+        _stats["pending"] += 1
+    submitted_at = time.perf_counter()
+
+    def job():
+        with _lock:
+            _stats["wait_seconds_total"] += time.perf_counter() - submitted_at
+            _stats["running"] += 1
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            with _lock:
+                _stats["running"] -= 1
+                _stats["completed"] += 1
+                _stats["hash_seconds_total"] += time.perf_counter() - start
+
+    try:
+        return await asyncio.wrap_future(_executor.submit(job))
+    finally:
+        with _lock:
+            _stats["pending"] -= 1
+
+
+async def hash_password(password: str) -> str:
+    ctx = _context()
+    if ctx is None:
+        raise RuntimeError("passlib not installed; pip install passlib[bcrypt]")
+    return await _submit(ctx.hash, _truncate(password))
+
+
+async def verify_and_update(password: str, hashed: str) -> tuple[bool, str | None]:
+    """Check password; on success also return a replacement hash when hashed used a different cost (else None)."""
+    ctx = _context()
+    if ctx is None:
+        return False, None
+    ok, new_hash = await _submit(ctx.verify_and_update, _truncate(password), hashed)
+    if ok and new_hash:
+        with _lock:
+            _stats["rehashed"] += 1
+    return ok, new_hash
+
+
+def stats() -> dict:
+    """Queue depth and timing counters for the hashing pool."""
+    with _lock:
+        return {
+            "workers": HASH_WORKERS,
+            "queue_limit": HASH_QUEUE_LIMIT,
+            "rounds": _rounds,
+            "waiting": _stats["pending"] - _stats["running"],
+            **_stats,
+        }
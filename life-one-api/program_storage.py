@@ -9,6 +9,8 @@ import os
 import uuid
 from pathlib import Path
 
+import etags
+
 API_ROOT = Path(__file__).resolve().parent
 PROGRAMS_DIR = Path(os.environ.get("LIFE_ONE_PROGRAMS_DIR", str(API_ROOT / "data" / "programs")))
 
@@ -62,6 +64,7 @@ def save_program(profile_id: str, blueprint: dict) -> None:
     path = base / f"{pid}.json"
     raw = json.dumps(blueprint, indent=2, ensure_ascii=False)
     path.write_text(raw, encoding="utf-8")
+    etags.bump("programs", profile_id)
 
 
 def delete_program(profile_id: str, program_id: str) -> bool:
@@ -70,6 +73,7 @@ def delete_program(profile_id: str, program_id: str) -> bool:
     if not path.exists():
         return False
     path.unlink()
+    etags.bump("programs", profile_id)
     return True
 
 
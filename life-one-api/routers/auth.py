@@ -2,13 +2,18 @@
 Auth: register (name + password), login, me. JWT-based; get_current_profile for protected routes.
 """
 import os
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 
 import jwt
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+import password_hashing
 from database import get_connection
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
@@ -18,30 +23,45 @@ JWT_SECRET = os.environ.get("LIFE_ONE_JWT_SECRET", "dev-secret-change-in-product
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRY_DAYS = 7
 
-try:
-    from passlib.context import CryptContext
-    pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
-except ImportError:
-    pwd_ctx = None
+# Profile ids seen in the profiles table within the TTL skip the existence check in
+# require_profile_match. 0 disables the cache (every request queries the table).
+PROFILE_CACHE_TTL_SECONDS = float(os.environ.get("LIFE_ONE_PROFILE_CACHE_TTL", "300"))
+PROFILE_CACHE_MAX_ENTRIES = 10_000
+_verified_profiles: OrderedDict[str, float] = OrderedDict()  # profile_id -> monotonic time verified
+_verified_profiles_lock = threading.Lock()
 
 
-def _hash_password(password: str) -> str:
-    if not pwd_ctx:
-        raise RuntimeError("passlib not installed; pip install passlib[bcrypt]")
-    # bcrypt truncates at 72 bytes; passlib/newer bcrypt can raise. Truncate to 72 bytes.
-    pwd_bytes = password.encode("utf-8")
-    if len(pwd_bytes) > 72:
-        password = pwd_bytes[:72].decode("utf-8", errors="ignore")
-    return pwd_ctx.hash(password)
-
-
-def _verify_password(plain: str, hashed: str) -> bool:
-    if not pwd_ctx:
+def _profile_recently_verified(profile_id: str) -> bool:
+    if PROFILE_CACHE_TTL_SECONDS <= 0:
         return False
-    pwd_bytes = plain.encode("utf-8")
-    if len(pwd_bytes) > 72:
-        plain = pwd_bytes[:72].decode("utf-8", errors="ignore")
-    return pwd_ctx.verify(plain, hashed)
+    with _verified_profiles_lock:
+        verified_at = _verified_profiles.get(profile_id)
+        if verified_at is None:
+            return False
+        if time.monotonic() - verified_at > PROFILE_CACHE_TTL_SECONDS:
+            del _verified_profiles[profile_id]
+            return False
+        _verified_profiles.move_to_end(profile_id)
+        return True
+
+
+def _remember_verified_profile(profile_id: str) -> None:
+    if PROFILE_CACHE_TTL_SECONDS <= 0:
+        return
+    with _verified_profiles_lock:
+        _verified_profiles[profile_id] = time.monotonic()
+        _verified_profiles.move_to_end(profile_id)
+        while len(_verified_profiles) > PROFILE_CACHE_MAX_ENTRIES:
+            _verified_profiles.popitem(last=False)
+
+
+def invalidate_profile(profile_id: str | None = None) -> None:
+    """Forget a verified profile id (all of them when None). Call after deleting or renaming a profile."""
+    with _verified_profiles_lock:
+        if profile_id is None:
+            _verified_profiles.clear()
+        else:
+            _verified_profiles.pop(profile_id, None)
 
 
 def _create_token(profile_id: str, name: str) -> str:
@@ -78,38 +98,85 @@ def get_current_profile(
     return _decode_token(credentials.credentials)
 
 
-@router.post("/register")
-def register(body: dict):
-    """Create profile with name + password; return token and profile."""
-    name = (body.get("name") or "").strip()
-    password = body.get("password") or ""
-    if not name:
-        raise HTTPException(status_code=400, detail="name is required")
-    if not password:
-        raise HTTPException(status_code=400, detail="password is required")
-    if len(name) > 200:
-        raise HTTPException(status_code=400, detail="name too long")
+async def _hash_password(password: str) -> str:
+    try:
+        return await password_hashing.hash_password(password)
+    except password_hashing.HashQueueFull:
+        raise HTTPException(status_code=503, detail="Server busy, try again in a moment")
+
+
+async def _verify_password(plain: str, hashed: str) -> tuple[bool, str | None]:
+    try:
+        return await password_hashing.verify_and_update(plain, hashed)
+    except password_hashing.HashQueueFull:
+        raise HTTPException(status_code=503, detail="Server busy, try again in a moment")
+
 
+def _insert_profile(name: str, password_hash: str) -> str:
     conn = get_connection()
     try:
         existing = conn.execute("SELECT id FROM profiles WHERE name = ?", (name,)).fetchone()
         if existing:
             raise HTTPException(status_code=409, detail="Profile with this name already exists")
         profile_id = str(uuid.uuid4())
-        password_hash = _hash_password(password)
         conn.execute(
             "INSERT INTO profiles (id, name, password_hash) VALUES (?, ?, ?)",
             (profile_id, name, password_hash),
         )
         conn.commit()
-        token = _create_token(profile_id, name)
-        return {"token": token, "profile": {"id": profile_id, "name": name}}
+        return profile_id
+    finally:
+        conn.close()
+
+
+def _find_credentials(name: str):
+    conn = get_connection()
+    try:
+        return conn.execute(
+            "SELECT id, name, password_hash FROM profiles WHERE name = ?",
+            (name,),
+        ).fetchone()
+    finally:
+        conn.close()
+
+
+def _update_password_hash(profile_id: str, old_hash: str, new_hash: str) -> None:
+    conn = get_connection()
+    try:
+        # Only replace the hash that was verified, in case the password changed meanwhile.
+        conn.execute(
+            "UPDATE profiles SET password_hash = ? WHERE id = ? AND password_hash = ?",
+            (new_hash, profile_id, old_hash),
+        )
+        conn.commit()
     finally:
         conn.close()
 
 
+# register/login are async so bcrypt waits on the dedicated hashing pool (password_hashing)
+# instead of holding a worker of the threadpool shared by every sync endpoint.
+@router.post("/register")
+async def register(body: dict):
+    """Create profile with name + password; return token and profile."""
+    name = (body.get("name") or "").strip()
+    password = body.get("password") or ""
+    if not name:
+        raise HTTPException(status_code=400, detail="name is required")
+    if not password:
+        raise HTTPException(status_code=400, detail="password is required")
+    if len(name) > 200:
+        raise HTTPException(status_code=400, detail="name too long")
+
+    if await run_in_threadpool(_find_credentials, name):
+        raise HTTPException(status_code=409, detail="Profile with this name already exists")
+    password_hash = await _hash_password(password)
+    profile_id = await run_in_threadpool(_insert_profile, name, password_hash)
+    token = _create_token(profile_id, name)
+    return {"token": token, "profile": {"id": profile_id, "name": name}}
+
+
 @router.post("/login")
-def login(body: dict):
+async def login(body: dict):
     """Verify name + password; return token and profile."""
     name = (body.get("name") or "").strip()
     password = body.get("password") or ""
@@ -118,28 +185,24 @@ def login(body: dict):
     if not password:
         raise HTTPException(status_code=400, detail="password is required")
 
-    conn = get_connection()
-    try:
-        row = conn.execute(
-            "SELECT id, name, password_hash FROM profiles WHERE name = ?",
-            (name,),
-        ).fetchone()
-        if not row:
-            raise HTTPException(
-                status_code=401,
-                detail="Invalid name or password. If you registered on this site before, the server database may have been reset (common on free hosting). Try Register to create a new account.",
-            )
-        password_hash = row["password_hash"]
-        if not password_hash:
-            raise HTTPException(status_code=401, detail="Profile has no password set")
-        if not _verify_password(password, password_hash):
-            raise HTTPException(status_code=401, detail="Invalid name or password")
-        profile_id = row["id"]
-        profile_name = row["name"]
-        token = _create_token(profile_id, profile_name)
-        return {"token": token, "profile": {"id": profile_id, "name": profile_name}}
-    finally:
-        conn.close()
+    row = await run_in_threadpool(_find_credentials, name)
+    if not row:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid name or password. If you registered on this site before, the server database may have been reset (common on free hosting). Try Register to create a new account.",
+        )
+    password_hash = row["password_hash"]
+    if not password_hash:
+        raise HTTPException(status_code=401, detail="Profile has no password set")
+    ok, new_hash = await _verify_password(password, password_hash)
+    if not ok:
+        raise HTTPException(status_code=401, detail="Invalid name or password")
+    profile_id = row["id"]
+    profile_name = row["name"]
+    if new_hash:
+        await run_in_threadpool(_update_password_hash, profile_id, password_hash, new_hash)
+    token = _create_token(profile_id, profile_name)
+    return {"token": token, "profile": {"id": profile_id, "name": profile_name}}
 
 
 @router.get("/me")
@@ -155,7 +218,8 @@ def require_profile_match(
 ) -> str:
     """Dependency: require current user; return profile_id. Authorize by JWT profile_id only; URL profile_name is ignored (no 403 on name mismatch)."""
     profile_id, _name = current
-    print(f"[auth] require_profile_match: profile_id={profile_id[:8]}... path_profile_name={profile_name[:20] if profile_name else ''}...")
+    if _profile_recently_verified(profile_id):
+        return profile_id
     conn = get_connection()
     try:
         row = conn.execute(
@@ -166,6 +230,7 @@ def require_profile_match(
                 status_code=404,
                 detail="Profile not found. The server database may have been reset. Log out and log in again, or Register to create a new account.",
             )
+        _remember_verified_profile(row["id"])
         return row["id"]
     finally:
         conn.close()
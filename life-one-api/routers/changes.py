@@ -0,0 +1,48 @@
+"""
+Change feed: GET /api/profiles/{profile_name}/changes streams server-sent events, one per committed
+write to the profile's workout logs, meal logs, programs, diets or coach data (see change_feed).
+Each event names the entity, its id, the op (upsert | delete) and the new revision (its change_log seq,
+also the SSE event id); "resync" means refetch everything. After a reconnect, GET .../sync?since=<last
+event id> catches up on what was missed. Comment lines are heartbeats so proxies keep the connection open.
+"""
+import orjson
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+import change_feed
+from routers.auth import require_profile_match
+
+router = APIRouter(tags=["changes"])
+
+HEARTBEAT_SECONDS = 15
+
+
+def _format(event: dict) -> bytes:
+    return b"id: %d\nevent: change\ndata: %s\n\n" % (event["revision"], orjson.dumps(event))
+
+
+@router.get("/api/profiles/{profile_name}/changes")
+async def stream_changes(profile_name: str, profile_id: str = Depends(require_profile_match)):
+    """Server-sent events (text/event-stream). EventSource cannot send Authorization, so read it with fetch()."""
+    if change_feed.subscriber_count(profile_id) >= change_feed.MAX_SUBSCRIBERS_PER_PROFILE:
+        raise HTTPException(status_code=429, detail="Too many open change streams for this profile")
+
+    async def events():
+        # Subscribed inside the generator so the finally below always runs for it.
+        try:
+            sub = change_feed.subscribe(profile_id)
+        except change_feed.TooManySubscribers:
+            return
+        try:
+            yield b"retry: 5000\n: connected\n\n"
+            while True:
+                event = await sub.get(HEARTBEAT_SECONDS)
+                yield b": ping\n\n" if event is None else _format(event)
+        finally:
+            change_feed.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -9,6 +9,7 @@ from pathlib import Path
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query
 
+import metrics
 from database import get_connection
 from routers.auth import require_profile_match
 from routers.context import build_context_dict
@@ -24,6 +25,24 @@ CHAT_HISTORY_LIMIT = 20
 # Set OPENROUTER_ADMIN_API_KEY on the server (e.g. Render env); never commit keys.
 OPENROUTER_ADMIN_API_KEY = (__import__("os").environ.get("OPENROUTER_ADMIN_API_KEY") or "").strip() or None
 
+# One pooled client for OpenRouter calls (created at startup) so chats reuse connections instead of a
+# new TCP + TLS handshake per message. httpx.Client is safe to share across threadpool workers.
+_http_client: httpx.Client | None = None
+
+
+def open_http_client() -> httpx.Client:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(timeout=60.0)
+    return _http_client
+
+
+def close_http_client() -> None:
+    global _http_client
+    client, _http_client = _http_client, None
+    if client is not None:
+        client.close()
+
 
 def _get_ai_settings_with_key(profile_id: str) -> dict:
     conn = get_connection()
@@ -197,7 +216,7 @@ def get_chat_history(
             {"id": r["id"], "role": r["role"], "content": r["content"], "created_at": r["created_at"]}
             for r in reversed(rows)
         ]
-        return {"messages": messages}
+        return metrics.json_response({"messages": messages})
     finally:
         conn.close()
 
@@ -241,8 +260,8 @@ def post_chat_message(profile_name: str, body: dict, profile_id: str = Depends(r
             "X-Title": "Life One",
         }
 
-        with httpx.Client(timeout=60.0) as client:
-            resp = client.post(OPENROUTER_URL, headers=headers, json=payload)
+        with metrics.phase("llm"):
+            resp = open_http_client().post(OPENROUTER_URL, headers=headers, json=payload)
 
         if resp.status_code != 200:
             try:
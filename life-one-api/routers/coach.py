@@ -2,8 +2,11 @@
 Coach personality: presets, settings, personas, and context files.
 """
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request, Response
 
+import change_feed
+import change_log
+import etags
 from database import get_connection
 from routers.auth import require_profile_match
 
@@ -21,26 +24,50 @@ SPORT_OPTIONS = [
 
 
 # --- Presets ---
-@router.get("/api/profiles/{profile_name}/coach/presets")
-def list_presets(profile_name: str, _profile_id: str = Depends(require_profile_match)):
+# Presets are seeded by migrations and read-only at runtime, so they are read once (warmed at startup).
+# Restart the API after adding presets with scripts/seed_coach_presets.py.
+_presets: list[dict] | None = None
+_presets_etag: str | None = None
+# Same for every profile and fixed for the life of the process: let browsers reuse them for a day.
+PRESETS_CACHE_CONTROL = "public, max-age=86400"
+
+
+def load_presets() -> list[dict]:
+    """(Re)read coach_personality_presets into memory."""
+    global _presets, _presets_etag
     conn = get_connection()
     try:
         rows = conn.execute(
             "SELECT id, name, description, system_instruction FROM coach_personality_presets ORDER BY name"
         ).fetchall()
-        return {
-            "presets": [
-                {
-                    "id": r["id"],
-                    "name": r["name"],
-                    "description": r["description"] or "",
-                    "system_instruction": r["system_instruction"] or "",
-                }
-                for r in rows
-            ]
-        }
     finally:
         conn.close()
+    presets = [
+        {
+            "id": r["id"],
+            "name": r["name"],
+            "description": r["description"] or "",
+            "system_instruction": r["system_instruction"] or "",
+        }
+        for r in rows
+    ]
+    _presets_etag = etags.content_tag(presets)  # set first: get_presets() callers read both
+    _presets = presets
+    return presets
+
+
+def get_presets() -> list[dict]:
+    presets = _presets
+    return presets if presets is not None else load_presets()
+
+
+@router.get("/api/profiles/{profile_name}/coach/presets")
+def list_presets(profile_name: str, request: Request, response: Response, _profile_id: str = Depends(require_profile_match)):
+    presets = get_presets()
+    not_modified = etags.check(request, response, _presets_etag, PRESETS_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
+    return {"presets": presets}
 
 
 # --- Settings ---
@@ -92,8 +119,10 @@ def put_coach_settings(profile_name: str, body: dict, profile_id: str = Depends(
                  updated_at = datetime('now')""",
             (profile_id, personality_preset_id, coach_persona_id, sport),
         )
+        event = change_log.record(conn, profile_id, "coach_settings", profile_id)
         conn.commit()
-        return get_coach_settings(profile_name)
+        change_feed.publish(profile_id, event)
+        return get_coach_settings(profile_name, profile_id)
     finally:
         conn.close()
 
@@ -138,7 +167,9 @@ def create_persona(profile_name: str, body: dict, profile_id: str = Depends(requ
             "INSERT INTO coach_personas (id, profile_id, name, personality_summary, methods_notes) VALUES (?, ?, ?, ?, ?)",
             (persona_id, profile_id, name, personality_summary, methods_notes),
         )
+        event = change_log.record(conn, profile_id, "coach_persona", persona_id)
         conn.commit()
+        change_feed.publish(profile_id, event)
         row = conn.execute(
             "SELECT id, name, personality_summary, methods_notes, created_at, updated_at FROM coach_personas WHERE id = ?",
             (persona_id,),
@@ -175,7 +206,9 @@ def update_persona(profile_name: str, persona_id: str, body: dict, profile_id: s
         )
         if cur.rowcount == 0:
             raise HTTPException(status_code=404, detail="Persona not found")
+        event = change_log.record(conn, profile_id, "coach_persona", persona_id)
         conn.commit()
+        change_feed.publish(profile_id, event)
         row = conn.execute(
             "SELECT id, name, personality_summary, methods_notes, created_at, updated_at FROM coach_personas WHERE id = ?",
             (persona_id,),
@@ -203,7 +236,9 @@ def delete_persona(profile_name: str, persona_id: str, profile_id: str = Depends
             "UPDATE coach_settings SET coach_persona_id = NULL, updated_at = datetime('now') WHERE profile_id = ? AND coach_persona_id = ?",
             (profile_id, persona_id),
         )
+        event = change_log.record(conn, profile_id, "coach_persona", persona_id, op="delete")
         conn.commit()
+        change_feed.publish(profile_id, event)
         return {"ok": True}
     finally:
         conn.close()
@@ -276,7 +311,9 @@ async def create_context_file(
             "INSERT INTO coach_context_files (id, profile_id, name, content, source_type) VALUES (?, ?, ?, ?, ?)",
             (file_id, profile_id, name, content, source_type),
         )
+        event = change_log.record(conn, profile_id, "coach_file", file_id)
         conn.commit()
+        change_feed.publish(profile_id, event)
         row = conn.execute(
             "SELECT id, name, source_type, created_at FROM coach_context_files WHERE id = ?", (file_id,)
         ).fetchone()
@@ -297,7 +334,9 @@ def delete_context_file(profile_name: str, file_id: str, profile_id: str = Depen
         cur = conn.execute("DELETE FROM coach_context_files WHERE id = ? AND profile_id = ?", (file_id, profile_id))
         if cur.rowcount == 0:
             raise HTTPException(status_code=404, detail="File not found")
+        event = change_log.record(conn, profile_id, "coach_file", file_id, op="delete")
         conn.commit()
+        change_feed.publish(profile_id, event)
         return {"ok": True}
     finally:
         conn.close()
@@ -365,7 +404,9 @@ async def upsert_profile_sheet(
                ON CONFLICT(profile_id) DO UPDATE SET content = excluded.content, updated_at = datetime('now')""",
             (profile_id, text),
         )
+        event = change_log.record(conn, profile_id, "profile_sheet", profile_id)
         conn.commit()
+        change_feed.publish(profile_id, event)
         row = conn.execute(
             "SELECT content, updated_at FROM profile_handoff_sheet WHERE profile_id = ?",
             (profile_id,),
@@ -6,6 +6,7 @@ Programs are loaded from JSON blueprint files (program_storage).
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from database import get_connection
+import metrics
 import program_storage as storage
 from routers.auth import require_profile_match
 
@@ -109,4 +110,4 @@ def get_profile_context(
             lines.append(f"  {e['date']} {e['exercise_name']}: {sets_str}")
         return "\n".join(lines)
 
-    return context
+    return metrics.json_response(context)
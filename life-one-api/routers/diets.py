@@ -6,9 +6,15 @@ API shape: id, name, sections: [{ id, name, description, days, foodNames }].
 from __future__ import annotations
 
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
+import change_feed
+import change_log
+import diet_adherence
+import etags
+import metrics
 from database import get_connection
+from date_ranges import parse_range
 import diet_storage as storage
 from routers.auth import require_profile_match
 
@@ -57,19 +63,45 @@ def _to_response(b: dict) -> dict:
 
 
 @router.get("/api/profiles/{profile_name}/diets")
-def list_diets(profile_name: str, profile_id: str = Depends(require_profile_match)):
+def list_diets(profile_name: str, request: Request, response: Response, profile_id: str = Depends(require_profile_match)):
+    not_modified = etags.check(request, response, etags.version_tag("diets", profile_id))
+    if not_modified:
+        return not_modified
     blueprints = storage.list_diets(profile_id)
     return [_to_response(b) for b in blueprints]
 
 
 @router.get("/api/profiles/{profile_name}/diets/{diet_id}")
-def get_diet(profile_name: str, diet_id: str, profile_id: str = Depends(require_profile_match)):
+def get_diet(profile_name: str, diet_id: str, request: Request, response: Response, profile_id: str = Depends(require_profile_match)):
+    not_modified = etags.check(request, response, etags.version_tag("diets", profile_id))
+    if not_modified:
+        return not_modified
     b = storage.get_diet(profile_id, diet_id)
     if not b:
         raise HTTPException(status_code=404, detail="Diet not found")
     return _to_response(_normalize_blueprint(b))
 
 
+@router.get("/api/profiles/{profile_name}/diets/{diet_id}/adherence")
+def get_diet_adherence(
+    profile_name: str,
+    diet_id: str,
+    date_from: str | None = Query(None, alias="dateFrom"),
+    date_to: str | None = Query(None, alias="dateTo"),
+    profile_id: str = Depends(require_profile_match),
+):
+    """Logged meals vs this diet for each logged day in range (default the last 30 days) and per weekday."""
+    start, end = parse_range(date_from, date_to)
+    conn = get_connection()
+    try:
+        r = diet_adherence.adherence(conn, profile_id, diet_id, start, end)
+    finally:
+        conn.close()
+    if r is None:
+        raise HTTPException(status_code=404, detail="Diet not found")
+    return metrics.json_response({"dietId": diet_id, "dateFrom": start, "dateTo": end, **r})
+
+
 @router.post("/api/profiles/{profile_name}/diets")
 def create_diet(profile_name: str, body: dict, profile_id: str = Depends(require_profile_match)):
     name = (body.get("name") or "").strip()
@@ -77,6 +109,7 @@ def create_diet(profile_name: str, body: dict, profile_id: str = Depends(require
         raise HTTPException(status_code=400, detail="name is required")
     blueprint = storage.create_empty_blueprint(name)
     storage.save_diet(profile_id, blueprint)
+    change_feed.publish(profile_id, change_log.record_now(profile_id, "diet", blueprint["id"]))
     return _to_response(blueprint)
 
 
@@ -90,6 +123,7 @@ def update_diet(profile_name: str, diet_id: str, body: dict, profile_id: str = D
     if name:
         b["name"] = name
     storage.save_diet(profile_id, b)
+    change_feed.publish(profile_id, change_log.record_now(profile_id, "diet", b["id"]))
     return _to_response(b)
 
 
@@ -97,6 +131,7 @@ def update_diet(profile_name: str, diet_id: str, body: dict, profile_id: str = D
 def delete_diet(profile_name: str, diet_id: str, profile_id: str = Depends(require_profile_match)):
     if not storage.delete_diet(profile_id, diet_id):
         raise HTTPException(status_code=404, detail="Diet not found")
+    change_feed.publish(profile_id, change_log.record_now(profile_id, "diet", diet_id, op="delete"))
     return {"ok": True}
 
 
@@ -107,6 +142,7 @@ def _load_mutate_save(profile_id: str, diet_id: str, mutate):
     b = _normalize_blueprint(b)
     mutate(b)
     storage.save_diet(profile_id, b)
+    change_feed.publish(profile_id, change_log.record_now(profile_id, "diet", b["id"]))
     return _to_response(b)
 
 
@@ -3,13 +3,20 @@ Exercise history / workout logs: CRUD scoped by profile name.
 Shape: WorkoutLogEntry { exerciseName, date, sets: [{ reps, weight?, note? }] }
 """
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
+import activity
+import change_feed
+import change_log
+import etags
+import metrics
 from database import get_connection
 from routers.auth import require_profile_match
 
 router = APIRouter(tags=["exercise_history"])
 
+MAX_LAST_SESSION_NAMES = 200
+
 
 def _entry_to_dict(row, sets_list: list) -> dict:
     return {
@@ -22,9 +29,14 @@ def _entry_to_dict(row, sets_list: list) -> dict:
 @router.get("/api/profiles/{profile_name}/workout-logs")
 def list_workout_logs(
     profile_name: str,
+    request: Request,
+    response: Response,
     exercise_name: str | None = Query(None, alias="exerciseName"),
     profile_id: str = Depends(require_profile_match),
 ):
+    not_modified = etags.check(request, response, etags.version_tag("workout_logs", profile_id))
+    if not_modified:
+        return not_modified
     conn = get_connection()
     try:
         if exercise_name:
@@ -54,7 +66,7 @@ def list_workout_logs(
                 for s in sets_rows
             ]
             result.append(_entry_to_dict(r, sets_list))
-        return result
+        return metrics.json_response(result, response)
     finally:
         conn.close()
 
@@ -80,6 +92,72 @@ def get_last_date(
         conn.close()
 
 
+@router.get("/api/profiles/{profile_name}/workout-logs/last-sessions")
+def get_last_sessions(
+    profile_name: str,
+    exercise_names: list[str] = Query(..., alias="exerciseName"),
+    before: str | None = None,
+    profile_id: str = Depends(require_profile_match),
+):
+    """Last date and last session's sets for each ?exerciseName= (repeat it), optionally only before a date."""
+    if len(exercise_names) > MAX_LAST_SESSION_NAMES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_LAST_SESSION_NAMES} exercise names")
+    conn = get_connection()
+    try:
+        return last_performed(conn, profile_id, exercise_names, (before or "").strip() or None)
+    finally:
+        conn.close()
+
+
+def last_sessions(conn, profile_id: str, exercise_names: list[str], before: str | None = None) -> dict[str, dict]:
+    """
+    Most recent entry per exercise (only dates before `before`, if given) with its sets, for all names in one
+    grouped query: { exerciseName: { "date", "sets" } }. Names never logged are left out.
+    """
+    names = list(dict.fromkeys(n.strip() for n in exercise_names if n and n.strip()))
+    if not names:
+        return {}
+    # Both steps are seeks on the UNIQUE(profile_id, exercise_name, date) index: the grouped MAX(date) per
+    # name, then (CROSS JOIN keeps that order) the entry for each (name, date). No per-name round-trips.
+    placeholders = ",".join("?" * len(names))
+    date_filter = " AND date < ?" if before else ""
+    rows = conn.execute(
+        f"""SELECT h.exercise_name, h.date, s.reps, s.weight_kg, s.note
+         FROM (SELECT exercise_name, MAX(date) AS date FROM exercise_history
+               WHERE profile_id = ? AND exercise_name IN ({placeholders}){date_filter}
+               GROUP BY exercise_name) last
+         CROSS JOIN exercise_history h
+           ON h.profile_id = ? AND h.exercise_name = last.exercise_name AND h.date = last.date
+         LEFT JOIN workout_sets s ON s.exercise_history_id = h.id
+         ORDER BY h.exercise_name, s.set_index""",
+        [profile_id, *names, *([before] if before else []), profile_id],
+    ).fetchall()
+    out = {}
+    for r in rows:
+        entry = out.setdefault(r["exercise_name"], {"date": r["date"], "sets": []})
+        if r["reps"] is not None:
+            entry["sets"].append({
+                "reps": r["reps"],
+                "weight": r["weight_kg"] if r["weight_kg"] is not None else None,
+                "note": r["note"] or None,
+            })
+    return out
+
+
+def last_performed(conn, profile_id: str, exercise_names: list[str], before: str | None = None) -> list[dict]:
+    """last_sessions() as [{ exerciseName, lastDate, lastSets }] in the order given (lastDate None if never logged)."""
+    names = list(dict.fromkeys(n.strip() for n in exercise_names if n and n.strip()))
+    last = last_sessions(conn, profile_id, names, before)
+    return [
+        {
+            "exerciseName": name,
+            "lastDate": last[name]["date"] if name in last else None,
+            "lastSets": last[name]["sets"] if name in last else [],
+        }
+        for name in names
+    ]
+
+
 def _get_or_create_history_id(conn, profile_id: str, exercise_name: str, date: str) -> str:
     row = conn.execute(
         "SELECT id FROM exercise_history WHERE profile_id = ? AND exercise_name = ? AND date = ?",
@@ -124,45 +202,55 @@ def get_log_for_date(
         conn.close()
 
 
-@router.post("/api/profiles/{profile_name}/workout-logs")
-def get_or_create_log(profile_name: str, body: dict, profile_id: str = Depends(require_profile_match)):
-    """Get or create a log entry for exerciseName + date. Returns entry with sets."""
-    exercise_name = (body.get("exerciseName") or body.get("exercise_name") or "").strip()
-    date = (body.get("date") or "").strip()
-    if not exercise_name or not date:
-        raise HTTPException(status_code=400, detail="exerciseName and date are required")
-    conn = get_connection()
-    try:
-        history_id = _get_or_create_history_id(conn, profile_id, exercise_name, date)
-        conn.commit()
-        row = conn.execute(
-            "SELECT exercise_name, date FROM exercise_history WHERE id = ?",
-            (history_id,),
-        ).fetchone()
-        sets_rows = conn.execute(
+def _read_entry(conn, history_id: str) -> dict:
+    row = conn.execute(
+        "SELECT exercise_name, date FROM exercise_history WHERE id = ?",
+        (history_id,),
+    ).fetchone()
+    sets_list = [
+        {"reps": s["reps"], "weight": s["weight_kg"] if s["weight_kg"] is not None else None, "note": s["note"] or None}
+        for s in conn.execute(
             "SELECT reps, weight_kg, note FROM workout_sets WHERE exercise_history_id = ? ORDER BY set_index",
             (history_id,),
         ).fetchall()
-        sets_list = [
-            {
-                "reps": s["reps"],
-                "weight": s["weight_kg"] if s["weight_kg"] is not None else None,
-                "note": s["note"] or None,
-            }
-            for s in sets_rows
-        ]
-        return _entry_to_dict(row, sets_list)
-    finally:
-        conn.close()
+    ]
+    return _entry_to_dict(row, sets_list)
 
 
-@router.post("/api/profiles/{profile_name}/workout-logs/sets")
-def add_set(profile_name: str, body: dict, profile_id: str = Depends(require_profile_match)):
+def _name_and_date(body: dict) -> tuple[str, str]:
     exercise_name = (body.get("exerciseName") or body.get("exercise_name") or "").strip()
     date = (body.get("date") or "").strip()
-    set_data = body.get("set") or body
     if not exercise_name or not date:
         raise HTTPException(status_code=400, detail="exerciseName and date are required")
+    return exercise_name, date
+
+
+def _set_data(body: dict) -> dict:
+    """The set's fields: body["set"] when given, else the body itself."""
+    set_data = body.get("set") or body
+    if not isinstance(set_data, dict):
+        raise HTTPException(status_code=400, detail="set must be an object")
+    return set_data
+
+
+# Write helpers: run in the caller's transaction (caller commits, bumps the ETag and publishes the returned
+# event). Shared by the routes below and the batched op replay in routers/sync.py.
+
+
+def apply_create_log(conn, profile_id: str, body: dict) -> tuple[str, dict | None]:
+    """Get or create the entry for exerciseName + date. Returns (history_id, event or None if it existed)."""
+    exercise_name, date = _name_and_date(body)
+    before = conn.total_changes
+    history_id = _get_or_create_history_id(conn, profile_id, exercise_name, date)
+    if conn.total_changes == before:  # only a newly created entry is a change
+        return history_id, None
+    return history_id, change_log.record(conn, profile_id, "workout_log", history_id, exerciseName=exercise_name, date=date)
+
+
+def apply_add_set(conn, profile_id: str, body: dict) -> dict:
+    """Append a set to the entry for exerciseName + date (created if needed). Returns the event."""
+    exercise_name, date = _name_and_date(body)
+    set_data = _set_data(body)
     reps = set_data.get("reps")
     if reps is None:
         raise HTTPException(status_code=400, detail="set.reps is required")
@@ -171,108 +259,101 @@ def add_set(profile_name: str, body: dict, profile_id: str = Depends(require_pro
     if weight is not None:
         weight = float(weight)
     note = (set_data.get("note") or "").strip() or None
+    history_id = _get_or_create_history_id(conn, profile_id, exercise_name, date)
+    max_idx = conn.execute(
+        "SELECT COALESCE(MAX(set_index), -1) AS m FROM workout_sets WHERE exercise_history_id = ?",
+        (history_id,),
+    ).fetchone()["m"]
+    conn.execute(
+        "INSERT INTO workout_sets (id, exercise_history_id, set_index, reps, weight_kg, note) VALUES (?, ?, ?, ?, ?, ?)",
+        (str(uuid.uuid4()), history_id, max_idx + 1, reps, weight, note),
+    )
+    return change_log.record(conn, profile_id, "workout_log", history_id, exerciseName=exercise_name, date=date)
+
+
+def apply_update_set(conn, profile_id: str, body: dict) -> tuple[str, dict | None]:
+    """Update the set at setIndex. Returns (history_id, event or None if nothing was sent to change)."""
+    exercise_name = (body.get("exerciseName") or body.get("exercise_name") or "").strip()
+    date = (body.get("date") or "").strip()
+    set_index = body.get("setIndex", body.get("set_index"))
+    if set_index is None:
+        raise HTTPException(status_code=400, detail="setIndex is required")
+    set_index = int(set_index)
+    set_data = _set_data(body)
+    row = conn.execute(
+        "SELECT id FROM exercise_history WHERE profile_id = ? AND exercise_name = ? AND date = ?",
+        (profile_id, exercise_name, date),
+    ).fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail="Log entry not found")
+    history_id = row["id"]
+    sets_rows = conn.execute(
+        "SELECT id FROM workout_sets WHERE exercise_history_id = ? ORDER BY set_index",
+        (history_id,),
+    ).fetchall()
+    if set_index < 0 or set_index >= len(sets_rows):
+        raise HTTPException(status_code=404, detail="Set index out of range")
+    updates = []
+    params = []
+    if "reps" in set_data:
+        updates.append("reps = ?")
+        params.append(int(set_data["reps"]))
+    if "weight" in set_data:
+        updates.append("weight_kg = ?")
+        params.append(float(set_data["weight"]) if set_data["weight"] is not None else None)
+    if "note" in set_data:
+        updates.append("note = ?")
+        params.append((set_data["note"] or "").strip() or None)
+    if not updates:
+        return history_id, None
+    params.append(sets_rows[set_index]["id"])
+    conn.execute(
+        "UPDATE workout_sets SET " + ", ".join(updates) + " WHERE id = ?",
+        params,
+    )
+    return history_id, change_log.record(conn, profile_id, "workout_log", history_id, exerciseName=exercise_name, date=date)
+
+
+@router.post("/api/profiles/{profile_name}/workout-logs")
+def get_or_create_log(profile_name: str, body: dict, profile_id: str = Depends(require_profile_match)):
+    """Get or create a log entry for exerciseName + date. Returns entry with sets."""
     conn = get_connection()
     try:
-        history_id = _get_or_create_history_id(conn, profile_id, exercise_name, date)
-        max_idx = conn.execute(
-            "SELECT COALESCE(MAX(set_index), -1) AS m FROM workout_sets WHERE exercise_history_id = ?",
-            (history_id,),
-        ).fetchone()["m"]
-        set_index = max_idx + 1
-        set_id = str(uuid.uuid4())
-        conn.execute(
-            "INSERT INTO workout_sets (id, exercise_history_id, set_index, reps, weight_kg, note) VALUES (?, ?, ?, ?, ?, ?)",
-            (set_id, history_id, set_index, reps, weight, note),
-        )
+        history_id, event = apply_create_log(conn, profile_id, body)
+        if event:
+            conn.commit()
+            etags.bump("workout_logs", profile_id)
+            activity.invalidate(profile_id, event["date"])
+            change_feed.publish(profile_id, event)
+        return _read_entry(conn, history_id)
+    finally:
+        conn.close()
+
+
+@router.post("/api/profiles/{profile_name}/workout-logs/sets")
+def add_set(profile_name: str, body: dict, profile_id: str = Depends(require_profile_match)):
+    conn = get_connection()
+    try:
+        event = apply_add_set(conn, profile_id, body)
         conn.commit()
-        row = conn.execute(
-            "SELECT exercise_name, date FROM exercise_history WHERE id = ?",
-            (history_id,),
-        ).fetchone()
-        sets_rows = conn.execute(
-            "SELECT reps, weight_kg, note FROM workout_sets WHERE exercise_history_id = ? ORDER BY set_index",
-            (history_id,),
-        ).fetchall()
-        sets_list = [
-            {
-                "reps": s["reps"],
-                "weight": s["weight_kg"] if s["weight_kg"] is not None else None,
-                "note": s["note"] or None,
-            }
-            for s in sets_rows
-        ]
-        return _entry_to_dict(row, sets_list)
+        etags.bump("workout_logs", profile_id)
+        activity.invalidate(profile_id, event["date"])
+        change_feed.publish(profile_id, event)
+        return _read_entry(conn, event["id"])
     finally:
         conn.close()
 
 
 @router.put("/api/profiles/{profile_name}/workout-logs/sets")
 def update_set(profile_name: str, body: dict, profile_id: str = Depends(require_profile_match)):
-    exercise_name = (body.get("exerciseName") or body.get("exercise_name") or "").strip()
-    date = (body.get("date") or "").strip()
-    set_index = body.get("setIndex") or body.get("set_index")
-    if set_index is None:
-        raise HTTPException(status_code=400, detail="setIndex is required")
-    set_index = int(set_index)
-    set_data = body.get("set") or body
     conn = get_connection()
     try:
-        row = conn.execute(
-            "SELECT id FROM exercise_history WHERE profile_id = ? AND exercise_name = ? AND date = ?",
-            (profile_id, exercise_name, date),
-        ).fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail="Log entry not found")
-        history_id = row["id"]
-        sets_rows = conn.execute(
-            "SELECT id, set_index, reps, weight_kg, note FROM workout_sets WHERE exercise_history_id = ? ORDER BY set_index",
-            (history_id,),
-        ).fetchall()
-        if set_index < 0 or set_index >= len(sets_rows):
-            raise HTTPException(status_code=404, detail="Set index out of range")
-        set_row = sets_rows[set_index]
-        set_id = set_row["id"]
-        updates = []
-        params = []
-        if "reps" in set_data:
-            updates.append("reps = ?")
-            params.append(int(set_data["reps"]))
-        if "weight" in set_data:
-            updates.append("weight_kg = ?")
-            params.append(float(set_data["weight"]) if set_data["weight"] is not None else None)
-        if "note" in set_data:
-            updates.append("note = ?")
-            params.append((set_data["note"] or "").strip() or None)
-        if not updates:
-            row = conn.execute(
-                "SELECT exercise_name, date FROM exercise_history WHERE id = ?",
-                (history_id,),
-            ).fetchone()
-            sets_list = [
-                {"reps": s["reps"], "weight": s["weight_kg"], "note": s["note"]}
-                for s in conn.execute(
-                    "SELECT reps, weight_kg, note FROM workout_sets WHERE exercise_history_id = ? ORDER BY set_index",
-                    (history_id,),
-                ).fetchall()
-            ]
-            return _entry_to_dict(row, sets_list)
-        params.append(set_id)
-        conn.execute(
-            "UPDATE workout_sets SET " + ", ".join(updates) + " WHERE id = ?",
-            params,
-        )
-        conn.commit()
-        row = conn.execute(
-            "SELECT exercise_name, date FROM exercise_history WHERE id = ?",
-            (history_id,),
-        ).fetchone()
-        sets_list = [
-            {"reps": s["reps"], "weight": s["weight_kg"] if s["weight_kg"] is not None else None, "note": s["note"] or None}
-            for s in conn.execute(
-                "SELECT reps, weight_kg, note FROM workout_sets WHERE exercise_history_id = ? ORDER BY set_index",
-                (history_id,),
-            ).fetchall()
-        ]
-        return _entry_to_dict(row, sets_list)
+        history_id, event = apply_update_set(conn, profile_id, body)
+        if event:
+            conn.commit()
+            etags.bump("workout_logs", profile_id)
+            activity.invalidate(profile_id, event["date"])
+            change_feed.publish(profile_id, event)
+        return _read_entry(conn, history_id)
     finally:
         conn.close()
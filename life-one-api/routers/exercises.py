@@ -0,0 +1,129 @@
+"""
+Exercise catalog API: faceted search over exercises-main/exercises.json, loaded once at startup,
+and fuzzy name resolution (name_index) against the catalog and a profile's own exercise names.
+Catalog routes are not profile-scoped (same as foods).
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from database import get_connection
+import exercise_catalog as catalog
+import metrics
+import name_index
+import program_storage
+from routers.auth import require_profile_match
+
+router = APIRouter(tags=["exercises"])
+
+
+@router.get("/api/exercises")
+def list_exercises(
+    q: str | None = Query(None, description="Substring match on name"),
+    category: list[str] | None = Query(None),
+    equipment: list[str] | None = Query(None),
+    primary_muscle: list[str] | None = Query(None, alias="primaryMuscle"),
+    secondary_muscle: list[str] | None = Query(None, alias="secondaryMuscle"),
+    muscle: list[str] | None = Query(None, description="Primary or secondary"),
+    muscle_group: list[str] | None = Query(None, alias="muscleGroup"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    facets: bool = Query(True, description="Include facet counts"),
+):
+    """
+    Filter the catalog. Repeat a parameter to OR values within a facet (equipment=barbell&equipment=dumbbell);
+    different facets are ANDed. Facet counts for each facet ignore that facet's own selection.
+    """
+    cat = catalog.get_catalog()
+    filters = {
+        "category": category or [],
+        "equipment": equipment or [],
+        "primaryMuscle": primary_muscle or [],
+        "secondaryMuscle": secondary_muscle or [],
+        "muscle": muscle or [],
+        "muscleGroup": muscle_group or [],
+    }
+    base = cat["all"]
+    if q and q.strip():
+        needle = q.strip().lower()
+        base = 0
+        for name, i in cat["by_name"].items():
+            if needle in name:
+                base |= 1 << i
+    mask = catalog.filter_mask(cat, filters) & base
+    total = mask.bit_count()
+    ids = catalog.ids_of(mask)[offset:offset + limit]
+    out = {
+        "exercises": [catalog.to_summary(cat["records"][i]) for i in ids],
+        "count": len(ids),
+        "total": total,
+    }
+    if facets:
+        out["facets"] = catalog.facet_counts(cat, filters, base)
+    return metrics.json_response(out)
+
+
+@router.get("/api/exercises/resolve")
+def resolve_exercise_name(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """Typo- and word-order-tolerant catalog lookup ("bench press barbell" -> "Barbell Bench Press")."""
+    cat = catalog.get_catalog()
+    return {
+        "query": q,
+        "matches": [
+            {"name": name, "score": score, "source": "catalog"}
+            for name, score in name_index.search(cat["names"], q, limit)
+        ],
+    }
+
+
+@router.get("/api/profiles/{profile_name}/exercises/resolve")
+def resolve_profile_exercise_name(
+    profile_name: str,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    profile_id: str = Depends(require_profile_match),
+):
+    """
+    Resolve against the profile's logged and programmed names first, then the catalog.
+    A logged name wins over a catalog name with the same normalized key, so existing history stays linked.
+    """
+    conn = get_connection()
+    try:
+        logged = [
+            r["exercise_name"]
+            for r in conn.execute(
+                "SELECT DISTINCT exercise_name FROM exercise_history WHERE profile_id = ?",
+                (profile_id,),
+            ).fetchall()
+        ]
+    finally:
+        conn.close()
+    programmed = [
+        n
+        for b in program_storage.list_programs(profile_id)
+        for s in (b.get("sections") or [])
+        if isinstance(s, dict)
+        for n in (s.get("exerciseNames") or [])
+    ]
+    own = name_index.build(logged + programmed)
+    logged_keys = {name_index.normalized_key(n) for n in logged}
+    seen: dict[str, dict] = {}
+    for name, score in name_index.search(own, q, limit):
+        key = name_index.normalized_key(name)
+        seen[key] = {"name": name, "score": score, "source": "history" if key in logged_keys else "program"}
+    for name, score in name_index.search(catalog.get_catalog()["names"], q, limit):
+        key = name_index.normalized_key(name)
+        if key not in seen:
+            seen[key] = {"name": name, "score": score, "source": "catalog"}
+    matches = sorted(seen.values(), key=lambda m: (-m["score"], m["source"] == "catalog", m["name"]))
+    return {"query": q, "matches": matches[:limit]}
+
+
+@router.get("/api/exercises/{exercise_name:path}")
+def get_exercise(exercise_name: str):
+    """One exercise with instructions, description, tips, etc. (case-insensitive exact name)."""
+    ex = catalog.get_exercise(exercise_name)
+    if not ex:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+    return ex
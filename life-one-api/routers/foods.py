@@ -2,20 +2,50 @@
 Foods API: list/search foods and get by id. Used by coach chat context and app.
 """
 import json
-from fastapi import APIRouter, Query
+import time
+from fastapi import APIRouter, Query, Request, Response
 
+import etags
+import metrics
 from database import get_connection
 
 router = APIRouter(tags=["foods"])
 
+# Foods only change when the seed scripts run, so the table signature is re-read at most this often;
+# a matching If-None-Match within that window is answered without touching the DB.
+FOODS_VERSION_TTL_SECONDS = 60
+FOODS_CACHE_CONTROL = "public, no-cache"
+_foods_version: tuple[float, str] | None = None
+
+
+def _foods_etag() -> str:
+    global _foods_version
+    now = time.monotonic()
+    cached = _foods_version
+    if cached and now - cached[0] < FOODS_VERSION_TTL_SECONDS:
+        return cached[1]
+    conn = get_connection()
+    try:
+        row = conn.execute("SELECT COUNT(*), MAX(id), MAX(updated_at) FROM foods").fetchone()
+    finally:
+        conn.close()
+    tag = etags.content_tag("foods", tuple(row))
+    _foods_version = (now, tag)
+    return tag
+
 
 @router.get("/api/foods")
 def list_foods(
+    request: Request,
+    response: Response,
     q: str | None = Query(None, description="Search by name"),
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
 ):
     """List foods, optionally filtered by name search."""
+    not_modified = etags.check(request, response, _foods_etag(), FOODS_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
     conn = get_connection()
     try:
         if q and q.strip():
@@ -59,14 +89,17 @@ def list_foods(
                 "serving": r["serving"],
                 "nutrients": nutrients,
             })
-        return {"foods": items, "count": len(items)}
+        return metrics.json_response({"foods": items, "count": len(items)}, response)
     finally:
         conn.close()
 
 
 @router.get("/api/foods/{food_id}")
-def get_food(food_id: str):
+def get_food(food_id: str, request: Request, response: Response):
     """Get one food by id (integer) or by name (exact match)."""
+    not_modified = etags.check(request, response, _foods_etag(), FOODS_CACHE_CONTROL)
+    if not_modified:
+        return not_modified
     conn = get_connection()
     try:
         if food_id.isdigit():
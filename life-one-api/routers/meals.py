@@ -2,10 +2,15 @@
 Meal logs: CRUD scoped by profile name.
 Shape: MealLogEntry { date, foods: [{ foodId?, foodName?, amountGrams, note? }] }
 """
+import sqlite3
 import uuid
 from fastapi import APIRouter, Depends, HTTPException
 
 from database import get_connection
+import change_feed
+import change_log
+import metrics
+import nutrition_totals
 from routers.auth import require_profile_match
 
 router = APIRouter(tags=["meals"])
@@ -81,7 +86,7 @@ def list_meal_logs(
             ).fetchall()
             foods_list = [_row_to_food_entry(f) for f in food_rows]
             result.append(_meal_log_to_dict(r, foods_list))
-        return result
+        return metrics.json_response(result)
     finally:
         conn.close()
 
@@ -122,33 +127,48 @@ def _get_or_create_meal_history_id(conn, profile_id: str, date: str) -> str:
     return history_id
 
 
-@router.post("/api/profiles/{profile_name}/meal-logs")
-def create_meal_log(profile_name: str, body: dict, profile_id: str = Depends(require_profile_match)):
-    """Get or create a meal log for date. Returns log with foods."""
+def _read_meal_log(conn, history_id: str) -> dict:
+    row = conn.execute(
+        "SELECT id, date FROM meal_history WHERE id = ?",
+        (history_id,),
+    ).fetchone()
+    food_rows = conn.execute(
+        """SELECT id, food_id, food_name, amount_grams, note, display_order
+         FROM meal_foods WHERE meal_history_id = ? ORDER BY display_order, created_at""",
+        (history_id,),
+    ).fetchall()
+    return _meal_log_to_dict(row, [_row_to_food_entry(f) for f in food_rows])
+
+
+def _owned_food_entry(conn, profile_id: str, food_entry_id: str):
+    row = conn.execute(
+        "SELECT mf.id, mf.meal_history_id, mh.date FROM meal_foods mf "
+        "JOIN meal_history mh ON mf.meal_history_id = mh.id WHERE mf.id = ? AND mh.profile_id = ?",
+        (food_entry_id, profile_id),
+    ).fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail="Food entry not found")
+    return row
+
+
+# Write helpers: run in the caller's transaction (caller commits and publishes the returned event).
+# Shared by the routes below and the batched op replay in routers/sync.py.
+
+
+def apply_create_meal_log(conn, profile_id: str, body: dict) -> tuple[str, dict | None]:
+    """Get or create the meal log for date. Returns (history_id, event or None if it existed)."""
     date = (body.get("date") or "").strip()
     if not date:
         raise HTTPException(status_code=400, detail="date is required")
-    conn = get_connection()
-    try:
-        history_id = _get_or_create_meal_history_id(conn, profile_id, date)
-        conn.commit()
-        row = conn.execute(
-            "SELECT id, date FROM meal_history WHERE id = ?",
-            (history_id,),
-        ).fetchone()
-        food_rows = conn.execute(
-            """SELECT id, food_id, food_name, amount_grams, note, display_order
-             FROM meal_foods WHERE meal_history_id = ? ORDER BY display_order, created_at""",
-            (history_id,),
-        ).fetchall()
-        foods_list = [_row_to_food_entry(f) for f in food_rows]
-        return _meal_log_to_dict(row, foods_list)
-    finally:
-        conn.close()
+    before = conn.total_changes
+    history_id = _get_or_create_meal_history_id(conn, profile_id, date)
+    if conn.total_changes == before:  # only a newly created log is a change
+        return history_id, None
+    return history_id, change_log.record(conn, profile_id, "meal_log", history_id, date=date)
 
 
-@router.post("/api/profiles/{profile_name}/meal-logs/foods")
-def add_food_to_meal_log(profile_name: str, body: dict, profile_id: str = Depends(require_profile_match)):
+def apply_add_food(conn, profile_id: str, body: dict) -> dict:
+    """Append a food to the meal log for date (created if needed). An optional id names the new entry."""
     date = (body.get("date") or "").strip()
     food_id = body.get("foodId") or body.get("food_id")
     food_name = (body.get("foodName") or body.get("food_name") or "").strip()
@@ -161,32 +181,78 @@ def add_food_to_meal_log(profile_name: str, body: dict, profile_id: str = Depend
         raise HTTPException(status_code=400, detail="date is required")
     if food_id is None and not food_name:
         raise HTTPException(status_code=400, detail="foodId or foodName is required")
-    conn = get_connection()
+    history_id = _get_or_create_meal_history_id(conn, profile_id, date)
+    max_order = conn.execute(
+        "SELECT COALESCE(MAX(display_order), -1) AS m FROM meal_foods WHERE meal_history_id = ?",
+        (history_id,),
+    ).fetchone()["m"]
+    food_entry_id = str(body.get("id") or uuid.uuid4())
     try:
-        history_id = _get_or_create_meal_history_id(conn, profile_id, date)
-        max_order = conn.execute(
-            "SELECT COALESCE(MAX(display_order), -1) AS m FROM meal_foods WHERE meal_history_id = ?",
-            (history_id,),
-        ).fetchone()["m"]
-        display_order = max_order + 1
-        food_entry_id = str(uuid.uuid4())
         conn.execute(
             """INSERT INTO meal_foods (id, meal_history_id, food_id, food_name, amount_grams, note, display_order)
              VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (food_entry_id, history_id, food_id, food_name if food_name else None, amount_grams, note, display_order),
+            (food_entry_id, history_id, food_id, food_name if food_name else None, amount_grams, note, max_order + 1),
         )
+    except sqlite3.IntegrityError:
+        raise HTTPException(status_code=409, detail="Food entry id already exists")
+    nutrition_totals.invalidate_day(conn, profile_id, date)
+    return change_log.record(conn, profile_id, "meal_log", history_id, date=date)
+
+
+def apply_update_food(conn, profile_id: str, food_entry_id: str, body: dict) -> tuple[str, dict | None]:
+    """Change amountGrams / note of a food entry. Returns (history_id, event or None if nothing to change)."""
+    row = _owned_food_entry(conn, profile_id, food_entry_id)
+    updates = []
+    params = []
+    if "amountGrams" in body or "amount_grams" in body:
+        val = body.get("amountGrams") or body.get("amount_grams")
+        if val is not None:
+            updates.append("amount_grams = ?")
+            params.append(float(val))
+    if "note" in body:
+        updates.append("note = ?")
+        params.append((body.get("note") or "").strip() or None)
+    if not updates:
+        return row["meal_history_id"], None
+    params.append(food_entry_id)
+    conn.execute(
+        "UPDATE meal_foods SET " + ", ".join(updates) + " WHERE id = ?",
+        params,
+    )
+    nutrition_totals.invalidate_day(conn, profile_id, row["date"])
+    return row["meal_history_id"], change_log.record(conn, profile_id, "meal_log", row["meal_history_id"], date=row["date"])
+
+
+def apply_delete_food(conn, profile_id: str, food_entry_id: str) -> dict:
+    """Remove a food entry from its meal log. Returns the event."""
+    row = _owned_food_entry(conn, profile_id, food_entry_id)
+    conn.execute("DELETE FROM meal_foods WHERE id = ?", (food_entry_id,))
+    nutrition_totals.invalidate_day(conn, profile_id, row["date"])
+    return change_log.record(conn, profile_id, "meal_log", row["meal_history_id"], date=row["date"])
+
+
+@router.post("/api/profiles/{profile_name}/meal-logs")
+def create_meal_log(profile_name: str, body: dict, profile_id: str = Depends(require_profile_match)):
+    """Get or create a meal log for date. Returns log with foods."""
+    conn = get_connection()
+    try:
+        history_id, event = apply_create_meal_log(conn, profile_id, body)
+        if event:
+            conn.commit()
+            change_feed.publish(profile_id, event)
+        return _read_meal_log(conn, history_id)
+    finally:
+        conn.close()
+
+
+@router.post("/api/profiles/{profile_name}/meal-logs/foods")
+def add_food_to_meal_log(profile_name: str, body: dict, profile_id: str = Depends(require_profile_match)):
+    conn = get_connection()
+    try:
+        event = apply_add_food(conn, profile_id, body)
         conn.commit()
-        row = conn.execute(
-            "SELECT id, date FROM meal_history WHERE id = ?",
-            (history_id,),
-        ).fetchone()
-        food_rows = conn.execute(
-            """SELECT id, food_id, food_name, amount_grams, note, display_order
-             FROM meal_foods WHERE meal_history_id = ? ORDER BY display_order, created_at""",
-            (history_id,),
-        ).fetchall()
-        foods_list = [_row_to_food_entry(f) for f in food_rows]
-        return _meal_log_to_dict(row, foods_list)
+        change_feed.publish(profile_id, event)
+        return _read_meal_log(conn, event["id"])
     finally:
         conn.close()
 
@@ -195,51 +261,11 @@ def add_food_to_meal_log(profile_name: str, body: dict, profile_id: str = Depend
 def update_meal_food(profile_name: str, food_entry_id: str, body: dict, profile_id: str = Depends(require_profile_match)):
     conn = get_connection()
     try:
-        row = conn.execute(
-            "SELECT mf.id, mf.meal_history_id FROM meal_foods mf "
-            "JOIN meal_history mh ON mf.meal_history_id = mh.id WHERE mf.id = ? AND mh.profile_id = ?",
-            (food_entry_id, profile_id),
-        ).fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail="Food entry not found")
-        updates = []
-        params = []
-        if "amountGrams" in body or "amount_grams" in body:
-            val = body.get("amountGrams") or body.get("amount_grams")
-            if val is not None:
-                updates.append("amount_grams = ?")
-                params.append(float(val))
-        if "note" in body:
-            updates.append("note = ?")
-            params.append((body.get("note") or "").strip() or None)
-        mh_id = row["meal_history_id"]
-        if not updates:
-            mh_row = conn.execute(
-                "SELECT id, date FROM meal_history WHERE id = ?",
-                (mh_id,),
-            ).fetchone()
-            food_rows = conn.execute(
-                """SELECT id, food_id, food_name, amount_grams, note, display_order
-                 FROM meal_foods WHERE meal_history_id = ? ORDER BY display_order, created_at""",
-                (mh_id,),
-            ).fetchall()
-            return _meal_log_to_dict(mh_row, [_row_to_food_entry(f) for f in food_rows])
-        params.append(food_entry_id)
-        conn.execute(
-            "UPDATE meal_foods SET " + ", ".join(updates) + " WHERE id = ?",
-            params,
-        )
-        conn.commit()
-        mh_row = conn.execute(
-            "SELECT id, date FROM meal_history WHERE id = ?",
-            (mh_id,),
-        ).fetchone()
-        food_rows = conn.execute(
-            """SELECT id, food_id, food_name, amount_grams, note, display_order
-             FROM meal_foods WHERE meal_history_id = ? ORDER BY display_order, created_at""",
-            (mh_id,),
-        ).fetchall()
-        return _meal_log_to_dict(mh_row, [_row_to_food_entry(f) for f in food_rows])
+        history_id, event = apply_update_food(conn, profile_id, food_entry_id, body)
+        if event:
+            conn.commit()
+            change_feed.publish(profile_id, event)
+        return _read_meal_log(conn, history_id)
     finally:
         conn.close()
 
@@ -248,24 +274,9 @@ def update_meal_food(profile_name: str, food_entry_id: str, body: dict, profile_
 def delete_meal_food(profile_name: str, food_entry_id: str, profile_id: str = Depends(require_profile_match)):
     conn = get_connection()
     try:
-        row = conn.execute(
-            "SELECT mf.id, mf.meal_history_id FROM meal_foods mf "
-            "JOIN meal_history mh ON mf.meal_history_id = mh.id WHERE mf.id = ? AND mh.profile_id = ?",
-            (food_entry_id, profile_id),
-        ).fetchone()
-        if not row:
-            raise HTTPException(status_code=404, detail="Food entry not found")
-        conn.execute("DELETE FROM meal_foods WHERE id = ?", (food_entry_id,))
+        event = apply_delete_food(conn, profile_id, food_entry_id)
         conn.commit()
-        mh_row = conn.execute(
-            "SELECT id, date FROM meal_history WHERE id = ?",
-            (row["meal_history_id"],),
-        ).fetchone()
-        food_rows = conn.execute(
-            """SELECT id, food_id, food_name, amount_grams, note, display_order
-             FROM meal_foods WHERE meal_history_id = ? ORDER BY display_order, created_at""",
-            (row["meal_history_id"],),
-        ).fetchall()
-        return _meal_log_to_dict(mh_row, [_row_to_food_entry(f) for f in food_rows])
+        change_feed.publish(profile_id, event)
+        return _read_meal_log(conn, event["id"])
     finally:
         conn.close()
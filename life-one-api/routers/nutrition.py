@@ -0,0 +1,87 @@
+"""
+Nutrition rollups: daily and weekly calories/macros from meal logs, and micronutrient coverage vs RDA.
+Totals are materialized per day in nutrition_daily_totals (see nutrition_totals.py);
+micronutrients use the cached foods × nutrients matrix (see nutrient_matrix.py).
+"""
+from fastapi import APIRouter, Depends, Query
+
+from database import get_connection
+from date_ranges import parse_range
+import nutrient_matrix
+import nutrition_totals
+from routers.auth import require_profile_match
+
+router = APIRouter(tags=["nutrition"])
+
+
+@router.get("/api/profiles/{profile_name}/nutrition/totals")
+def get_nutrition_totals(
+    profile_name: str,
+    date_from: str | None = Query(None, alias="dateFrom"),
+    date_to: str | None = Query(None, alias="dateTo"),
+    profile_id: str = Depends(require_profile_match),
+):
+    """Daily and ISO-weekly calories/macros (foods units, scaled by amountGrams / 100) for logged days in range."""
+    start, end = parse_range(date_from, date_to)
+    conn = get_connection()
+    try:
+        days = nutrition_totals.daily_totals(conn, profile_id, start, end)
+    finally:
+        conn.close()
+    return {
+        "dateFrom": start,
+        "dateTo": end,
+        "days": days,
+        "weeks": nutrition_totals.weekly_totals(days),
+    }
+
+
+@router.get("/api/profiles/{profile_name}/nutrition/micronutrients")
+def get_micronutrient_coverage(
+    profile_name: str,
+    date_from: str | None = Query(None, alias="dateFrom"),
+    date_to: str | None = Query(None, alias="dateTo"),
+    profile_id: str = Depends(require_profile_match),
+):
+    """
+    Daily micronutrient intake vs RDA for logged days in range (nutrients table, µg).
+    Per-day arrays are aligned with the returned nutrients list.
+    """
+    start, end = parse_range(date_from, date_to)
+    conn = get_connection()
+    try:
+        r = nutrient_matrix.daily_intake(conn, profile_id, start, end)
+    finally:
+        conn.close()
+    intake, pct, over = r["intake"], r["pct_rda"], r["over_tui"]
+    n_days = len(r["dates"])
+    avg_intake = intake.mean(axis=0) if n_days else intake.sum(axis=0)
+    avg_pct = pct.mean(axis=0) if n_days else pct.sum(axis=0)
+    days_over = over.sum(axis=0)
+    return {
+        "dateFrom": start,
+        "dateTo": end,
+        "daysLogged": n_days,
+        "unmatchedEntries": r["unmatched"],
+        "nutrients": [
+            {
+                "name": n["name"],
+                "type": n["type"],
+                "rdaUg": n["rda_ug"],
+                "tuiUg": n["tui_ug"],
+                "averageUg": round(float(avg_intake[j]), 2),
+                "averagePctRda": round(float(avg_pct[j]), 1),
+                "daysOverTui": int(days_over[j]),
+            }
+            for j, n in enumerate(r["nutrients"])
+        ],
+        "days": [
+            {
+                "date": d,
+                "intakeUg": [round(float(x), 2) for x in intake[i]],
+                "pctRda": [round(float(x), 1) for x in pct[i]],
+                "overTui": [r["nutrients"][j]["name"] for j in over[i].nonzero()[0]],
+            }
+            for i, d in enumerate(r["dates"])
+        ],
+    }
@@ -6,8 +6,12 @@ import json
 import uuid
 from fastapi import APIRouter, Depends, HTTPException
 
+import activity
+import change_feed
+import change_log
+import etags
 from database import get_connection
-from routers.auth import get_current_profile, require_profile_match
+from routers.auth import get_current_profile, invalidate_profile, require_profile_match
 
 router = APIRouter(prefix="/api/profiles", tags=["profiles"])
 
@@ -85,6 +89,7 @@ def update_profile(
             (new_name, row["id"]),
         )
         conn.commit()
+        invalidate_profile(row["id"])
         row = conn.execute(
             "SELECT id, name, created_at, updated_at FROM profiles WHERE id = ?",
             (row["id"],),
@@ -147,6 +152,7 @@ def import_profile(body: dict, current: tuple[str, str] = Depends(get_current_pr
                 "INSERT INTO exercise_history (id, profile_id, exercise_name, date) VALUES (?, ?, ?, ?)",
                 (history_id, profile_id, ex_name, date),
             )
+            change_log.record(conn, profile_id, "workout_log", history_id)
             for i, s in enumerate(entry.get("sets") or []):
                 reps = s.get("reps")
                 if reps is None:
@@ -161,6 +167,10 @@ def import_profile(body: dict, current: tuple[str, str] = Depends(get_current_pr
                 )
 
         conn.commit()
+        etags.bump("workout_logs", profile_id)
+        activity.invalidate(profile_id)
+        # Bulk import: streams refetch everything; /sync picks up the logged rows.
+        change_feed.publish(profile_id, {"entity": "resync", "id": profile_id, "op": "upsert", "revision": change_log.latest_seq(conn)})
         row = conn.execute(
             "SELECT id, name, created_at, updated_at FROM profiles WHERE id = ?",
             (profile_id,),
@@ -7,8 +7,11 @@ from __future__ import annotations
 
 import json
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 
+import change_feed
+import change_log
+import etags
 from database import get_connection
 import program_storage as storage
 from routers.auth import require_profile_match
@@ -58,13 +61,19 @@ def _to_response(b: dict) -> dict:
 
 
 @router.get("/api/profiles/{profile_name}/programs")
-def list_programs(profile_name: str, profile_id: str = Depends(require_profile_match)):
+def list_programs(profile_name: str, request: Request, response: Response, profile_id: str = Depends(require_profile_match)):
+    not_modified = etags.check(request, response, etags.version_tag("programs", profile_id))
+    if not_modified:
+        return not_modified
     blueprints = storage.list_programs(profile_id)
     return [_to_response(b) for b in blueprints]
 
 
 @router.get("/api/profiles/{profile_name}/programs/{program_id}")
-def get_program(profile_name: str, program_id: str, profile_id: str = Depends(require_profile_match)):
+def get_program(profile_name: str, program_id: str, request: Request, response: Response, profile_id: str = Depends(require_profile_match)):
+    not_modified = etags.check(request, response, etags.version_tag("programs", profile_id))
+    if not_modified:
+        return not_modified
     b = storage.get_program(profile_id, program_id)
     if not b:
         raise HTTPException(status_code=404, detail="Program not found")
@@ -78,6 +87,7 @@ def create_program(profile_name: str, body: dict, profile_id: str = Depends(requ
         raise HTTPException(status_code=400, detail="name is required")
     blueprint = storage.create_empty_blueprint(name)
     storage.save_program(profile_id, blueprint)
+    change_feed.publish(profile_id, change_log.record_now(profile_id, "program", blueprint["id"]))
     return _to_response(blueprint)
 
 
@@ -88,6 +98,7 @@ def import_program(profile_name: str, body: dict, profile_id: str = Depends(requ
     if not blueprint["name"]:
         raise HTTPException(status_code=400, detail="name is required")
     storage.save_program(profile_id, blueprint)
+    change_feed.publish(profile_id, change_log.record_now(profile_id, "program", blueprint["id"]))
     return _to_response(blueprint)
 
 
@@ -101,6 +112,7 @@ def update_program(profile_name: str, program_id: str, body: dict, profile_id: s
     if name:
         b["name"] = name
     storage.save_program(profile_id, b)
+    change_feed.publish(profile_id, change_log.record_now(profile_id, "program", b["id"]))
     return _to_response(b)
 
 
@@ -108,6 +120,7 @@ def update_program(profile_name: str, program_id: str, body: dict, profile_id: s
 def delete_program(profile_name: str, program_id: str, profile_id: str = Depends(require_profile_match)):
     if not storage.delete_program(profile_id, program_id):
         raise HTTPException(status_code=404, detail="Program not found")
+    change_feed.publish(profile_id, change_log.record_now(profile_id, "program", program_id, op="delete"))
     return {"ok": True}
 
 
@@ -118,6 +131,7 @@ def _load_mutate_save(profile_id: str, program_id: str, mutate):
     b = _normalize_blueprint(b)
     mutate(b)
     storage.save_program(profile_id, b)
+    change_feed.publish(profile_id, change_log.record_now(profile_id, "program", b["id"]))
     return _to_response(b)
 
 
@@ -0,0 +1,216 @@
+"""
+Delta sync: GET /api/profiles/{profile_name}/sync?since=<cursor> returns only the workout logs, meal logs,
+programs and diets created, updated or deleted after the cursor, driven by the change log (change_log).
+Shape: { cursor, full, workoutLogs, mealLogs, programs, diets, deleted: [{ entity, id }], refetch: [...] }
+Store the returned cursor and send it as since next time; without since (or with an unknown cursor) the
+response is a full snapshot with full: true. Change-feed event revisions are cursors too.
+
+POST /api/profiles/{profile_name}/sync/ops replays a client's offline queue of workout/meal writes in one
+transaction, skipping op ids it has already applied (sync_ops), and returns one result per op.
+"""
+import json
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+import activity
+import change_feed
+import change_log
+import diet_storage
+import etags
+import metrics
+import program_storage
+from database import get_connection
+from routers import diets, exercise_history, meals, programs
+from routers.auth import require_profile_match
+from routers.meals import _row_to_food_entry
+
+router = APIRouter(tags=["sync"])
+logger = logging.getLogger("life_one.sync")
+
+# Entities served inline; anything else in the log (coach data, profile sheet) is listed under refetch.
+SYNCED_ENTITIES = ("workout_log", "meal_log", "program", "diet")
+
+
+def _changed_rows_filter(entity: str, window: tuple | None) -> tuple[str, list]:
+    """SQL/params restricting h.id to rows of this entity upserted in the (since, until] window."""
+    if window is None:
+        return "", []
+    return (
+        """ AND h.id IN (SELECT entity_id FROM change_log
+             WHERE profile_id = h.profile_id AND entity = ? AND op = 'upsert' AND seq > ? AND seq <= ?)""",
+        [entity, *window],
+    )
+
+
+def _workout_logs(conn, profile_id: str, window: tuple | None) -> list:
+    """Entries with their sets in one query (all of the profile's when window is None)."""
+    sql = """SELECT h.id, h.exercise_name, h.date, s.reps, s.weight_kg, s.note
+             FROM exercise_history h LEFT JOIN workout_sets s ON s.exercise_history_id = h.id
+             WHERE h.profile_id = ?"""
+    where, params = _changed_rows_filter("workout_log", window)
+    entries = {}
+    for r in conn.execute(sql + where + " ORDER BY h.date DESC, h.id, s.set_index", [profile_id, *params]):
+        entry = entries.get(r["id"])
+        if entry is None:
+            entry = entries[r["id"]] = {"id": r["id"], "exerciseName": r["exercise_name"], "date": r["date"], "sets": []}
+        if r["reps"] is not None:
+            entry["sets"].append({"reps": r["reps"], "weight": r["weight_kg"], "note": r["note"] or None})
+    return list(entries.values())
+
+
+def _meal_logs(conn, profile_id: str, window: tuple | None) -> list:
+    """Meal logs with their foods in one query (all of the profile's when window is None)."""
+    sql = """SELECT h.id AS history_id, h.date, f.id, f.food_id, f.food_name, f.amount_grams, f.note
+             FROM meal_history h LEFT JOIN meal_foods f ON f.meal_history_id = h.id
+             WHERE h.profile_id = ?"""
+    where, params = _changed_rows_filter("meal_log", window)
+    logs = {}
+    for r in conn.execute(sql + where + " ORDER BY h.date DESC, h.id, f.display_order", [profile_id, *params]):
+        log = logs.get(r["history_id"])
+        if log is None:
+            log = logs[r["history_id"]] = {"id": r["history_id"], "date": r["date"], "foods": []}
+        if r["id"] is not None:
+            log["foods"].append(_row_to_food_entry(r))
+    return list(logs.values())
+
+
+def _programs(profile_id: str, ids: list | None) -> list:
+    if ids is None:
+        return [programs._to_response(b) for b in program_storage.list_programs(profile_id)]
+    found = (program_storage.get_program(profile_id, i) for i in ids)
+    return [programs._to_response(programs._normalize_blueprint(b)) for b in found if b]
+
+
+def _diets(profile_id: str, ids: list | None) -> list:
+    if ids is None:
+        return [diets._to_response(b) for b in diet_storage.list_diets(profile_id)]
+    found = (diet_storage.get_diet(profile_id, i) for i in ids)
+    return [diets._to_response(diets._normalize_blueprint(b)) for b in found if b]
+
+
+@router.get("/api/profiles/{profile_name}/sync")
+def sync(
+    profile_name: str,
+    since: int = Query(0, ge=0),
+    profile_id: str = Depends(require_profile_match),
+):
+    """Changes since a cursor (or a full snapshot). Each changed row appears once, in its current state."""
+    conn = get_connection()
+    try:
+        # One read transaction: the cursor and the rows come from the same snapshot of the DB.
+        conn.execute("BEGIN")
+        cursor = change_log.latest_seq(conn)
+        full = since == 0 or since > cursor
+        changed = {entity: [] for entity in SYNCED_ENTITIES}
+        deleted, refetch = [], []
+        if not full:
+            for r in change_log.changes_since(conn, profile_id, since, cursor):
+                if r["op"] == "delete":
+                    deleted.append({"entity": r["entity"], "id": r["entity_id"]})
+                elif r["entity"] in changed:
+                    changed[r["entity"]].append(r["entity_id"])
+                else:
+                    refetch.append({"entity": r["entity"], "id": r["entity_id"], "op": r["op"]})
+        window = None if full else (since, cursor)
+        workout_logs = _workout_logs(conn, profile_id, window) if full or changed["workout_log"] else []
+        meal_logs = _meal_logs(conn, profile_id, window) if full or changed["meal_log"] else []
+        conn.rollback()
+    finally:
+        conn.close()
+    return metrics.json_response({
+        "cursor": cursor,
+        "full": full,
+        "workoutLogs": workout_logs,
+        "mealLogs": meal_logs,
+        "programs": _programs(profile_id, None if full else changed["program"]),
+        "diets": _diets(profile_id, None if full else changed["diet"]),
+        "deleted": deleted,
+        "refetch": refetch,
+    })
+
+
+MAX_OPS = 500
+
+# Op type -> write helper(conn, profile_id, data) returning the change event, or None when nothing changed.
+# data is the body the matching route takes; food entry ops name the entry with data.id (meal_food.add
+# accepts a client-generated id so later ops in the queue can refer to it).
+OPS = {
+    "workout_log.create": lambda conn, pid, data: exercise_history.apply_create_log(conn, pid, data)[1],
+    "workout_set.add": exercise_history.apply_add_set,
+    "workout_set.update": lambda conn, pid, data: exercise_history.apply_update_set(conn, pid, data)[1],
+    "meal_log.create": lambda conn, pid, data: meals.apply_create_meal_log(conn, pid, data)[1],
+    "meal_food.add": meals.apply_add_food,
+    "meal_food.update": lambda conn, pid, data: meals.apply_update_food(conn, pid, str(data.get("id") or ""), data)[1],
+    "meal_food.delete": lambda conn, pid, data: meals.apply_delete_food(conn, pid, str(data.get("id") or "")),
+}
+
+
+def _apply_op(conn, profile_id: str, op) -> tuple[dict, dict | None]:
+    """Apply one queued op inside a savepoint. Returns (result, change event or None)."""
+    if not isinstance(op, dict) or not isinstance(op.get("id"), str) or not op["id"]:
+        return {"id": None, "status": "error", "statusCode": 400, "detail": "op id is required"}, None
+    op_id = op["id"]
+    done = conn.execute(
+        "SELECT result FROM sync_ops WHERE profile_id = ? AND op_id = ?",
+        (profile_id, op_id),
+    ).fetchone()
+    if done:
+        return {"id": op_id, "status": "duplicate", **json.loads(done["result"])}, None
+    handler = OPS.get(op.get("type"))
+    if handler is None:
+        return {"id": op_id, "status": "error", "statusCode": 400, "detail": f"Unknown op type: {op.get('type')}"}, None
+    data = op.get("data") if isinstance(op.get("data"), dict) else {}
+    conn.execute("SAVEPOINT op")
+    try:
+        event = handler(conn, profile_id, data)
+        applied = {"change": event}
+        conn.execute(
+            "INSERT INTO sync_ops (profile_id, op_id, result) VALUES (?, ?, ?)",
+            (profile_id, op_id, json.dumps(applied)),
+        )
+    except Exception as e:
+        # Undo only this op; the savepoint is released either way so the batch transaction carries on.
+        conn.execute("ROLLBACK TO op")
+        conn.execute("RELEASE op")
+        if isinstance(e, HTTPException):
+            return {"id": op_id, "status": "error", "statusCode": e.status_code, "detail": e.detail}, None
+        if isinstance(e, (TypeError, ValueError, AttributeError)):  # malformed data, e.g. reps: "abc"
+            return {"id": op_id, "status": "error", "statusCode": 400, "detail": f"Invalid op data: {e}"}, None
+        logger.exception("sync op %s (%s) failed", op_id, op.get("type"))
+        return {"id": op_id, "status": "error", "statusCode": 500, "detail": "Internal error applying op"}, None
+    conn.execute("RELEASE op")
+    return {"id": op_id, "status": "applied", **applied}, event
+
+
+@router.post("/api/profiles/{profile_name}/sync/ops")
+def apply_ops(profile_name: str, body: dict, profile_id: str = Depends(require_profile_match)):
+    """
+    Body: { ops: [{ id, type, data }] } in the order the client made them. Returns { results: [...] } in the
+    same order: status applied (with the change event), duplicate (already applied; same result as the
+    first time) or error (statusCode, detail). A failed op is rolled back alone; the rest still commit.
+    """
+    ops = body.get("ops")
+    if not isinstance(ops, list):
+        raise HTTPException(status_code=400, detail="ops must be a list")
+    if len(ops) > MAX_OPS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_OPS} ops per request")
+    conn = get_connection()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        results, events = [], []
+        for op in ops:
+            result, event = _apply_op(conn, profile_id, op)
+            results.append(result)
+            if event:
+                events.append(event)
+        conn.commit()
+    finally:
+        conn.close()
+    if any(e["entity"] == "workout_log" for e in events):
+        etags.bump("workout_logs", profile_id)
+    for date in {e["date"] for e in events if e["entity"] == "workout_log"}:
+        activity.invalidate(profile_id, date)
+    for event in events:
+        change_feed.publish(profile_id, event)
+    return {"results": results}
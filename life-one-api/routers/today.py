@@ -0,0 +1,78 @@
+"""
+Home screen aggregate: GET /api/profiles/{profile_name}/today returns what the app needs on open in one
+response: the program sections scheduled for today (section days, "Mon".."Sun"), the last session (date and
+sets) of each of their exercises, today's workout logs, today's meal totals and the coach settings.
+"""
+from datetime import date as date_cls
+from urllib.parse import unquote
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+import metrics
+import nutrition_totals
+import program_storage
+from database import get_connection
+from diet_adherence import DAY_ABBREVS
+from routers import coach, exercise_history, programs
+from routers.auth import require_profile_match
+
+router = APIRouter(tags=["today"])
+
+
+def _scheduled_sections(profile_id: str, weekday: str) -> list[dict]:
+    """Sections (with their program's id and name) whose days include weekday."""
+    out = []
+    for b in program_storage.list_programs(profile_id):
+        program = programs._to_response(programs._normalize_blueprint(b))
+        for s in program["sections"]:
+            if weekday in (unquote(str(d)).strip() for d in s["days"]):
+                out.append({"programId": program["id"], "programName": program["name"], **s})
+    return out
+
+
+def _workout_logs_on(conn, profile_id: str, day: str) -> list[dict]:
+    """The day's entries with their sets, in one query."""
+    entries = {}
+    for r in conn.execute(
+        """SELECT h.id, h.exercise_name, h.date, s.reps, s.weight_kg, s.note
+         FROM exercise_history h LEFT JOIN workout_sets s ON s.exercise_history_id = h.id
+         WHERE h.profile_id = ? AND h.date = ? ORDER BY h.created_at, h.id, s.set_index""",
+        (profile_id, day),
+    ):
+        entry = entries.setdefault(r["id"], {"exerciseName": r["exercise_name"], "date": r["date"], "sets": []})
+        if r["reps"] is not None:
+            entry["sets"].append({"reps": r["reps"], "weight": r["weight_kg"], "note": r["note"] or None})
+    return list(entries.values())
+
+
+@router.get("/api/profiles/{profile_name}/today")
+def get_today(
+    profile_name: str,
+    day: str | None = Query(None, alias="date"),
+    profile_id: str = Depends(require_profile_match),
+):
+    """Pass the client's local date as ?date=YYYY-MM-DD (defaults to the server's date)."""
+    try:
+        today = date_cls.fromisoformat(day.strip()) if day else date_cls.today()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="date must be YYYY-MM-DD")
+    today_str = today.isoformat()
+    weekday = DAY_ABBREVS[today.weekday()]
+    sections = _scheduled_sections(profile_id, weekday)
+    exercise_names = [n for s in sections for n in s["exerciseNames"]]
+    conn = get_connection()
+    try:
+        exercises = exercise_history.last_performed(conn, profile_id, exercise_names, before=today_str)
+        workout_logs = _workout_logs_on(conn, profile_id, today_str)
+        meal_totals = nutrition_totals.daily_totals(conn, profile_id, today_str, today_str)
+    finally:
+        conn.close()
+    return metrics.json_response({
+        "date": today_str,
+        "weekday": weekday,
+        "sections": sections,
+        "exercises": exercises,
+        "workoutLogs": workout_logs,
+        "mealTotals": meal_totals[0] if meal_totals else None,
+        "coachSettings": coach.get_coach_settings(profile_name, profile_id),
+    })
@@ -0,0 +1,52 @@
+"""
+Training analytics from workout logs: weekly volume per muscle, with logged exercise names resolved to the
+exercise catalog's primary/secondary muscles (see muscle_volume.py), and a per-day activity calendar for
+heatmaps (see activity.py).
+"""
+from datetime import date as date_cls
+
+from fastapi import APIRouter, Depends, Query
+
+import activity
+from database import get_connection
+from date_ranges import parse_range
+import metrics
+import muscle_volume
+from routers.auth import require_profile_match
+
+router = APIRouter(tags=["training"])
+
+DEFAULT_RANGE_DAYS = 84  # 12 weeks
+
+
+@router.get("/api/profiles/{profile_name}/training/muscle-volume")
+def get_muscle_volume(
+    profile_name: str,
+    date_from: str | None = Query(None, alias="dateFrom"),
+    date_to: str | None = Query(None, alias="dateTo"),
+    profile_id: str = Depends(require_profile_match),
+):
+    """Per ISO week: sets, reps and kg volume per muscle (up to a year; default the last 12 weeks)."""
+    start, end = parse_range(date_from, date_to, DEFAULT_RANGE_DAYS)
+    conn = get_connection()
+    try:
+        r = muscle_volume.weekly_volume(conn, profile_id, start, end)
+    finally:
+        conn.close()
+    return metrics.json_response({"dateFrom": start, "dateTo": end, **r})
+
+
+@router.get("/api/profiles/{profile_name}/training/activity")
+def get_activity(
+    profile_name: str,
+    year: int | None = Query(None, ge=1900, le=9999),
+    profile_id: str = Depends(require_profile_match),
+):
+    """Calendar heatmap: sessions, sets, reps and kg volume per training day of the year (default this year)."""
+    year = year or date_cls.today().year
+    conn = get_connection()
+    try:
+        r = activity.calendar(conn, profile_id, year)
+    finally:
+        conn.close()
+    return metrics.json_response(r)
@@ -0,0 +1,14 @@
+-- Nutrition daily totals: materialized calories/macros per profile per day (meal_foods × foods, scaled by amount_grams / 100).
+-- Rows are deleted by meal writes for that date and recomputed on the next range read (see nutrition_totals.py).
+CREATE TABLE IF NOT EXISTS nutrition_daily_totals (
+  profile_id TEXT NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+  date TEXT NOT NULL,
+  calories REAL NOT NULL DEFAULT 0,
+  proteins REAL NOT NULL DEFAULT 0,
+  fat REAL NOT NULL DEFAULT 0,
+  carbohydrates REAL NOT NULL DEFAULT 0,
+  food_count INTEGER NOT NULL DEFAULT 0,
+  unmatched_count INTEGER NOT NULL DEFAULT 0,
+  computed_at TEXT NOT NULL DEFAULT (datetime('now')),
+  PRIMARY KEY (profile_id, date)
+);
@@ -0,0 +1,16 @@
+-- Change log: latest write per synced entity per profile, for GET /api/profiles/{name}/sync?since=<seq>.
+-- Each write replaces the entity's row, so it gets a new seq (AUTOINCREMENT never reuses one) and a sync
+-- returns every changed entity once. op = 'delete' rows are tombstones and are kept.
+-- Columns: seq (monotonic cursor), profile_id (FK), entity (workout_log, meal_log, program, diet, coach_*...),
+-- entity_id, op (upsert | delete), changed_at.
+CREATE TABLE IF NOT EXISTS change_log (
+  seq INTEGER PRIMARY KEY AUTOINCREMENT,
+  profile_id TEXT NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+  entity TEXT NOT NULL,
+  entity_id TEXT NOT NULL,
+  op TEXT NOT NULL CHECK (op IN ('upsert', 'delete')),
+  changed_at TEXT NOT NULL DEFAULT (datetime('now')),
+  UNIQUE(profile_id, entity, entity_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_change_log_profile_seq ON change_log(profile_id, seq);
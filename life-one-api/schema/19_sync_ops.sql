@@ -0,0 +1,10 @@
+-- Sync ops: client operations already applied by POST /api/profiles/{name}/sync/ops, keyed by the client's
+-- op id, so a queue replayed after a dropped response is not applied twice. result is the op's JSON result
+-- as first returned. Failed ops are not stored (the client may fix and resend them).
+CREATE TABLE IF NOT EXISTS sync_ops (
+  profile_id TEXT NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+  op_id TEXT NOT NULL,
+  result TEXT NOT NULL,
+  applied_at TEXT NOT NULL DEFAULT (datetime('now')),
+  PRIMARY KEY (profile_id, op_id)
+);
@@ -2,6 +2,7 @@
 Optional seed script for coach personality presets.
 Presets are already seeded in schema/09_coach_personality.sql on init_db().
 Run this script manually to ensure presets exist or to add more in the future.
+The API caches presets in memory, so restart it afterwards.
 
 Usage (from life-one-api directory):
   python -m scripts.seed_coach_presets
@@ -8,6 +8,7 @@ Usage (from life-one-api directory):
 """
 import json
 import re
+import sqlite3
 import sys
 from pathlib import Path
 
@@ -16,6 +17,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from database import get_connection, SCHEMA_DIR
+import nutrition_totals
 
 DEFAULT_JSON = ROOT / "data" / "foods.json"
 
@@ -143,6 +145,10 @@ def main() -> None:
         ensure_schema(conn)
         conn.execute("DELETE FROM foods")
         n = seed(conn, foods)
+        try:
+            nutrition_totals.invalidate_all(conn)  # food ids/macros changed; rollups are stale
+        except sqlite3.OperationalError:
+            pass  # table not created yet (init_db not run)
         conn.commit()
         print(f"Seeded {n} foods from {json_path}.")
     finally:
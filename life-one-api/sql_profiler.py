@@ -0,0 +1,125 @@
+"""
+Opt-in SQL profiler: per request (or per `with profile()` block) count statements, their total time and
+how often each statement shape repeats. A shape is the SQL with literals and whitespace normalised, so a
+query issued once per row of an earlier result shows up as one shape with a high count (N+1).
+
+Enable for every request with LIFE_ONE_SQL_PROFILE=1: responses then carry an X-SQL-Profile header and
+requests over the thresholds are logged as warnings.
+"""
+import contextvars
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+ENABLED = os.environ.get("LIFE_ONE_SQL_PROFILE", "").lower() in ("1", "true", "yes")
+# Warn when a request runs more statements than this, or repeats one shape this many times.
+MAX_STATEMENTS = int(os.environ.get("LIFE_ONE_SQL_PROFILE_MAX_STATEMENTS", "50"))
+MAX_REPEATS = int(os.environ.get("LIFE_ONE_SQL_PROFILE_MAX_REPEATS", "10"))
+HEADER = "X-SQL-Profile"
+
+logger = logging.getLogger("life_one.sql")
+
+_report: contextvars.ContextVar[dict | None] = contextvars.ContextVar("sql_profile", default=None)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def statement_shape(sql: str) -> str:
+    """SQL with literals as ?, placeholder lists as (?...) and whitespace collapsed."""
+    shape = _STRING.sub("?", sql)
+    shape = _NUMBER.sub("?", shape)
+    shape = _PLACEHOLDER_LIST.sub("(?...)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+def _new_report() -> dict:
+    return {"statements": 0, "seconds": 0.0, "shapes": {}}
+
+
+def record(sql: str | None, seconds: float) -> None:
+    """Called by the database layer for each statement (sql=None for time spent fetching rows)."""
+    report = _report.get()
+    if report is None:
+        return
+    report["seconds"] += seconds
+    if sql is None:
+        return
+    report["statements"] += 1
+    shape = report["shapes"].setdefault(statement_shape(sql), [0, 0.0])
+    shape[0] += 1
+    shape[1] += seconds
+
+
+@contextmanager
+def profile():
+    """Collect a report for the block: {"statements", "seconds", "shapes": {shape: [count, seconds]}}."""
+    report = _new_report()
+    token = _report.set(report)
+    try:
+        yield report
+    finally:
+        _report.reset(token)
+
+
+def most_repeated(report: dict) -> tuple[str, int, float] | None:
+    if not report["shapes"]:
+        return None
+    shape, (count, seconds) = max(report["shapes"].items(), key=lambda item: item[1][0])
+    return shape, count, seconds
+
+
+def problems(report: dict) -> list[str]:
+    """Threshold breaches in a report, as human-readable strings (empty when fine)."""
+    found = []
+    if report["statements"] > MAX_STATEMENTS:
+        found.append(f"{report['statements']} statements (limit {MAX_STATEMENTS})")
+    for shape, (count, _seconds) in report["shapes"].items():
+        if count >= MAX_REPEATS:
+            found.append(f"possible N+1: {count}x {shape[:200]}")
+    return found
+
+
+def header_value(report: dict) -> str:
+    value = f"statements={report['statements']}; time_ms={report['seconds'] * 1000:.1f}"
+    top = most_repeated(report)
+    if top and top[1] > 1:
+        shape, count, _seconds = top
+        value += f"; max_repeat={count}; shape=\"{shape[:200].replace(chr(34), chr(39))}\""
+    return value.encode("latin-1", errors="replace").decode("latin-1")
+
+
+class SQLProfilerMiddleware:
+    """Profiles every request; installed by main.py only when LIFE_ONE_SQL_PROFILE is set."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_report(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((HEADER.lower().encode("latin-1"), header_value(report).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        start = time.perf_counter()
+        with profile() as report:
+            await self.app(scope, receive, send_with_report)
+        found = problems(report)
+        if found:
+            logger.warning(
+                "%s %s: %d SQL statements in %.1f ms (request %.1f ms); %s",
+                scope.get("method"), scope.get("path"), report["statements"], report["seconds"] * 1000,
+                (time.perf_counter() - start) * 1000, "; ".join(found),
+            )
@@ -0,0 +1,120 @@
+"""
+Startup sequence run by main.lifespan: migrations, password hashing cost, the shared OpenRouter HTTP
+client, then cache warm-ups (exercise catalog, coach presets, foods nutrient matrix). Every phase is
+timed and logged (life_one.startup) and reported by GET /ready.
+
+LIFE_ONE_WARMUP picks how warm-ups run: "blocking" (default, before the app serves requests),
+"background" (in a worker thread while the app already serves; /ready answers 503 until done) or "off"
+(caches fill lazily on first use).
+"""
+import asyncio
+import logging
+import os
+import time
+
+import exercise_catalog
+import nutrient_matrix
+import password_hashing
+from database import get_connection, init_db
+from routers import chat, coach
+
+logger = logging.getLogger("life_one.startup")
+
+WARMUP_MODES = ("blocking", "background", "off")
+WARMUP_MODE = os.environ.get("LIFE_ONE_WARMUP", "blocking").strip().lower()
+if WARMUP_MODE not in WARMUP_MODES:
+    raise RuntimeError(f"LIFE_ONE_WARMUP must be one of {', '.join(WARMUP_MODES)}, got {WARMUP_MODE!r}")
+
+_state = {"ready": False, "phases": {}, "failed": [], "started": None, "ready_after_ms": None}
+_warmup_task: asyncio.Future | None = None
+
+
+def configure_logging() -> None:
+    """Send life_one.* logs (startup timings, migration drift, SQL profiler) to stderr at LIFE_ONE_LOG_LEVEL."""
+    log = logging.getLogger("life_one")
+    if log.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(levelname)s:     %(name)s: %(message)s"))
+    log.addHandler(handler)
+    log.setLevel(os.environ.get("LIFE_ONE_LOG_LEVEL", "INFO").upper())
+    log.propagate = False
+
+
+def _timed(name: str, fn):
+    start = time.perf_counter()
+    try:
+        return fn()
+    except Exception:
+        _state["failed"].append(name)
+        raise
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        _state["phases"][name] = round(elapsed_ms, 1)
+        logger.info("%s: %.1f ms", name, elapsed_ms)
+
+
+def _warm_foods() -> None:
+    conn = get_connection()
+    try:
+        nutrient_matrix.get_matrix(conn)
+    finally:
+        conn.close()
+
+
+def _warm_up() -> None:
+    for name, fn in (
+        ("warmup.catalog", exercise_catalog.load),
+        ("warmup.coach_presets", coach.load_presets),
+        ("warmup.foods", _warm_foods),
+    ):
+        try:
+            _timed(name, fn)
+        except Exception:
+            # A cold cache only costs the first request; don't keep the instance out of rotation for it.
+            logger.exception("%s failed; it will load on first use", name)
+    _mark_ready()
+
+
+def _mark_ready() -> None:
+    _state["ready_after_ms"] = round((time.perf_counter() - _state["started"]) * 1000, 1)
+    _state["ready"] = True
+    logger.info(
+        "ready after %.1f ms (%s)", _state["ready_after_ms"],
+        ", ".join(f"{name}={ms} ms" for name, ms in _state["phases"].items()),
+    )
+
+
+async def start() -> None:
+    """Run the startup phases; warm-ups per WARMUP_MODE."""
+    global _warmup_task
+    _state.update(ready=False, phases={}, failed=[], started=time.perf_counter(), ready_after_ms=None)
+    _timed("migrations", init_db)
+    _timed("password_hashing", password_hashing.configure)
+    _timed("http_client", chat.open_http_client)
+    if WARMUP_MODE == "blocking":
+        _warm_up()
+    elif WARMUP_MODE == "background":
+        _warmup_task = asyncio.get_running_loop().run_in_executor(None, _warm_up)
+    else:
+        _mark_ready()
+
+
+async def stop() -> None:
+    global _warmup_task
+    if _warmup_task is not None:
+        await _warmup_task
+        _warmup_task = None
+    chat.close_http_client()
+    _state["ready"] = False
+
+
+def status() -> dict:
+    """Readiness and per-phase startup timings (ms)."""
+    return {
+        "ready": _state["ready"],
+        "warmup": WARMUP_MODE,
+        "phases": dict(_state["phases"]),
+        "failed": list(_state["failed"]),
+        "ready_after_ms": _state["ready_after_ms"],
+    }
@@ -1,8 +1,54 @@
-import type { ExercisesData } from './types'
+import type { CompiledCatalog, Exercise, ExercisesData } from './types'
 
 const EXERCISES_URL = '/exercises.json'
+/** Compact artifact from exercises-main/compile.py (interned vocabularies, no instructions). */
+const CATALOG_URL = '/exercises.catalog.json'
+/** One JSON object per line with instructions/tips/etc.; fetched only when a detail view needs it. */
+const DETAILS_URL = '/exercises.details.jsonl'
+const CATALOG_VERSION = 1
+
+function expandCatalog(c: CompiledCatalog): ExercisesData {
+  const col = Object.fromEntries(c.columns.map((name, i) => [name, i]))
+  const exercises: Exercise[] = c.exercises.map((row) => {
+    const ex: Exercise = {
+      name: row[col.name] as string,
+      category: c.categories[row[col.category] as number],
+      equipment: (row[col.equipment] as number[]).map((i) => c.equipment[i]),
+      primary_muscles: (row[col.primary_muscles] as number[]).map((i) => c.muscles[i]),
+      secondary_muscles: (row[col.secondary_muscles] as number[]).map((i) => c.muscles[i]),
+      instructions: [],
+      detailsRange: row[col.details] as [number, number],
+    }
+    const description = row[col.description] as string | null
+    const aliases = row[col.aliases] as string[] | null
+    if (description) ex.description = description
+    if (aliases) ex.aliases = aliases
+    return ex
+  })
+  return {
+    categories: c.categories,
+    equipment: c.equipment,
+    muscles: c.muscles,
+    muscle_groups: c.muscle_groups,
+    exercises,
+  }
+}
+
+async function loadCompiledCatalog(): Promise<ExercisesData | null> {
+  try {
+    const res = await fetch(CATALOG_URL)
+    if (!res.ok) return null
+    const c = (await res.json()) as CompiledCatalog
+    if (c.format !== 'exercise-catalog' || c.version !== CATALOG_VERSION) return null
+    return expandCatalog(c)
+  } catch {
+    return null
+  }
+}
 
 export async function loadExercises(): Promise<ExercisesData> {
+  const compiled = await loadCompiledCatalog()
+  if (compiled) return compiled
   const res = await fetch(EXERCISES_URL)
   if (!res.ok) throw new Error(`Failed to load exercises: ${res.status}`)
   const data = (await res.json()) as ExercisesData
@@ -11,3 +57,24 @@ export async function loadExercises(): Promise<ExercisesData> {
   }
   return data
 }
+
+let detailsFile: Promise<ArrayBuffer> | null = null
+const decoder = new TextDecoder()
+
+/** Fill in instructions, tips, video, etc. for an exercise from the compiled catalog (no-op otherwise). */
+export async function loadExerciseDetails(ex: Exercise): Promise<Exercise> {
+  if (!ex.detailsRange) return ex
+  if (!detailsFile) {
+    detailsFile = fetch(DETAILS_URL).then((res) => {
+      if (!res.ok) throw new Error(`Failed to load exercise details: ${res.status}`)
+      return res.arrayBuffer()
+    })
+    detailsFile.catch(() => {
+      detailsFile = null
+    })
+  }
+  const buf = await detailsFile
+  const [start, length] = ex.detailsRange
+  const details = JSON.parse(decoder.decode(new Uint8Array(buf, start, length))) as Partial<Exercise>
+  return { ...ex, ...details, detailsRange: undefined }
+}
@@ -15,6 +15,8 @@ export interface Exercise {
   variations_on?: string[]
   license_author?: string
   license?: { full_name?: string; short_name?: string; url?: string }
+  /** Byte [offset, length] into exercises.details.jsonl; set until details are loaded. */
+  detailsRange?: [number, number]
 }
 
 export interface ExercisesData {
@@ -25,6 +27,18 @@ export interface ExercisesData {
   exercises: Exercise[]
 }
 
+/** exercises.catalog.json: rows are arrays ordered by `columns`; vocab fields are indexes. */
+export interface CompiledCatalog {
+  format: 'exercise-catalog'
+  version: number
+  categories: string[]
+  equipment: string[]
+  muscles: string[]
+  muscle_groups: Record<string, string[]>
+  columns: string[]
+  exercises: (string | number | number[] | string[] | null)[][]
+}
+
 /** One set: reps, optional weight, optional note */
 export interface SetEntry {
   reps: number
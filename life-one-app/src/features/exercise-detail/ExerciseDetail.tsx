@@ -1,6 +1,7 @@
 import React, { useEffect, useRef, useCallback } from 'react'
 import { X } from 'lucide-react'
 import type { Exercise } from '../../data/types'
+import { useExerciseDetails } from '../../hooks/useExerciseDetails'
 
 const FOCUSABLE =
   'button, [href], input, select, textarea, [tabindex]:not([tabindex="-1"])'
@@ -17,7 +18,8 @@ function getVideoEmbedUrl(url: string): string | null {
   return m ? `https://www.youtube.com/embed/${m[1]}` : null
 }
 
-export function ExerciseDetail({ exercise, onClose, open }: ExerciseDetailProps) {
+export function ExerciseDetail({ exercise: summary, onClose, open }: ExerciseDetailProps) {
+  const exercise = useExerciseDetails(summary)
   const drawerRef = useRef<HTMLDivElement>(null)
   const closeButtonRef = useRef<HTMLButtonElement>(null)
 
@@ -1,4 +1,5 @@
 import type { Exercise } from '../../data/types'
+import { useExerciseDetails } from '../../hooks/useExerciseDetails'
 
 function getVideoEmbedUrl(url: string): string | null {
   if (!url) return null
@@ -10,7 +11,8 @@ interface ExerciseDetailContentProps {
   exercise: Exercise
 }
 
-export function ExerciseDetailContent({ exercise }: ExerciseDetailContentProps) {
+export function ExerciseDetailContent({ exercise: summary }: ExerciseDetailContentProps) {
+  const exercise = useExerciseDetails(summary) ?? summary
   const videoEmbed = exercise.video ? getVideoEmbedUrl(exercise.video) : null
   const variationList = exercise.variation_on ?? exercise.variations_on ?? []
 
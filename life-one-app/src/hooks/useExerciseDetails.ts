@@ -0,0 +1,25 @@
+import { useEffect, useState } from 'react'
+import { loadExerciseDetails } from '../data/loadExercises'
+import type { Exercise } from '../data/types'
+
+/** Exercise with lazily loaded instructions/tips/video when it came from the compiled catalog. */
+export function useExerciseDetails(exercise: Exercise | null): Exercise | null {
+  const [full, setFull] = useState<Exercise | null>(null)
+
+  useEffect(() => {
+    if (!exercise || !exercise.detailsRange) return
+    let cancelled = false
+    loadExerciseDetails(exercise)
+      .then((ex) => {
+        if (!cancelled) setFull(ex)
+      })
+      .catch(() => {
+        // keep the summary; detail sections stay hidden
+      })
+    return () => {
+      cancelled = true
+    }
+  }, [exercise])
+
+  return full && exercise && full.name === exercise.name ? full : exercise
+}